@@ -0,0 +1,53 @@
+"""Add foreign key and filter indexes
+
+Revision ID: c4e2a9d17f30
+Revises: b6b1af72b34d
+Create Date: 2026-10-18 10:12:41.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e2a9d17f30'
+down_revision: Union[str, Sequence[str], None] = 'b6b1af72b34d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (nombre, tabla, columnas). Reservation.user_id queda cubierto por el índice
+# compuesto (user_id, service_id) y ActivityLog.pet_id / employee_id por los
+# compuestos con start_time, así que no se crean índices sueltos para ellos.
+INDEXES = [
+    ('ix_Pet_user_id', 'Pet', ['user_id']),
+    ('ix_Reservation_user_id_service_id', 'Reservation', ['user_id', 'service_id']),
+    ('ix_Reservation_service_id', 'Reservation', ['service_id']),
+    ('ix_Reservation_status', 'Reservation', ['status']),
+    ('ix_Payment_invoice_id', 'Payment', ['invoice_id']),
+    ('ix_Invoice_service_id', 'Invoice', ['service_id']),
+    ('ix_ActivityLog_pet_id_start_time', 'ActivityLog', ['pet_id', 'start_time']),
+    ('ix_ActivityLog_employee_id_start_time', 'ActivityLog', ['employee_id', 'start_time']),
+    ('ix_ActivityLog_start_time', 'ActivityLog', ['start_time']),
+    ('ix_Medical_history_pet_id', 'Medical_history', ['pet_id']),
+    ('ix_Assignment_service_id', 'Assignment', ['service_id']),
+    ('ix_Assignment_employee_id', 'Assignment', ['employee_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY no bloquea escrituras en Postgres pero no puede ir dentro
+    # de una transacción
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+    op.execute('ANALYZE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
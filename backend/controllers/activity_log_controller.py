@@ -8,22 +8,20 @@ from backend.models.activity_log_models import ActivityLog
 from backend.models.pet_models import Pet
 from backend.models.employee_models import Employee
 from backend.schema.activity_log_schema import ActivityLogCreate, ActivityLogUpdate
-from backend.utils.pagination import paginate
+from backend.utils.pagination import CountMode, paginate
+from backend.db.statements import get_by_pk, exists_by_pk
+from backend.db.bulk import bulk_insert, bulk_summary
+from backend.websockets.notifications import notification_service
 
 from backend.logger.logger import logger
 
 async def create_activitylog_controller(activity_data: ActivityLogCreate, db: AsyncSession):
     logger.info(f"Creating ActivityLog for pet_id: {activity_data.pet_id}, employee_id: {activity_data.employee_id}")
     
-    pet_result = await db.execute(select(Pet).where(Pet.pet_id == activity_data.pet_id))
-    pet = pet_result.scalar_one_or_none()
-    if not pet:
+    if not await exists_by_pk(db, Pet, activity_data.pet_id):
         raise NotFoundException(f"Pet with id {activity_data.pet_id} not found")
 
-    employee_result = await db.execute(select(Employee).where(Employee.employee_id == activity_data.employee_id))
-    employee = employee_result.scalar_one_or_none()
-
-    if not employee:
+    if not await exists_by_pk(db, Employee, activity_data.employee_id):
         raise NotFoundException(f"Employee with id {activity_data.employee_id} not found")
 
     new_activity = ActivityLog(**activity_data.model_dump())
@@ -33,14 +31,21 @@ async def create_activitylog_controller(activity_data: ActivityLogCreate, db: As
     logger.info(f"ActivityLog created successfully with ID: {new_activity.activity_id}")
     return new_activity
 
+async def create_activitylogs_bulk_controller(activities_data: List[ActivityLogCreate], db: AsyncSession):
+    logger.info(f"Creating {len(activities_data)} ActivityLogs in bulk")
+    activities = await bulk_insert(db, ActivityLog, activities_data, foreign_keys={"pet_id": Pet, "employee_id": Employee})
+    await notification_service.send_activity_log_update("bulk_created", bulk_summary(activities, "activity_id"))
+    return activities
+
 async def get_all_activitylogs_controller(
     db: AsyncSession,
     page: int = 1,
     limit: int = 10,
     pet_id: Optional[int] = None,
-    employee_id: Optional[int] = None
+    employee_id: Optional[int] = None,
+    count: CountMode = "exact"
 ):
-    logger.info(f"Fetching ActivityLogs with filters: pet_id={pet_id}, employee_id={employee_id}, page={page}, limit={limit}")
+    logger.info(f"Fetching ActivityLogs with filters: pet_id={pet_id}, employee_id={employee_id}, page={page}, limit={limit}, count={count}")
     
     query = select(ActivityLog)
     filters = []
@@ -53,20 +58,18 @@ async def get_all_activitylogs_controller(
     if filters:
         query = query.where(and_(*filters))
 
-    return await paginate(query, db, page, limit)
+    return await paginate(query, db, page, limit, count)
 
 async def get_activitylog_by_id_controller(activity_id: int, db: AsyncSession):
     logger.info(f"Fetching ActivityLog with ID {activity_id}")
-    result = await db.execute(select(ActivityLog).where(ActivityLog.activity_id == activity_id))
-    activity = result.scalar_one_or_none()
+    activity = await get_by_pk(db, ActivityLog, activity_id)
     if activity is None:
         raise NotFoundException(f"ActivityLog with ID {activity_id} not found")
     return activity
 
 async def update_activitylog_controller(activity_id: int, activity_data: ActivityLogUpdate, db: AsyncSession):
     logger.info(f"Updating ActivityLog with ID {activity_id}")
-    result = await db.execute(select(ActivityLog).where(ActivityLog.activity_id == activity_id))
-    activity = result.scalar_one_or_none()
+    activity = await get_by_pk(db, ActivityLog, activity_id)
     if not activity:
         raise NotFoundException(f"ActivityLog with ID {activity_id} not found")
      
@@ -80,8 +83,7 @@ async def update_activitylog_controller(activity_id: int, activity_data: Activit
 
 async def delete_activitylog_controller(activity_id: int, db: AsyncSession):
     logger.info(f"Deleting ActivityLog with ID {activity_id}")
-    result = await db.execute(select(ActivityLog).where(ActivityLog.activity_id == activity_id))
-    activity = result.scalar_one_or_none()
+    activity = await get_by_pk(db, ActivityLog, activity_id)
     if not activity:
         logger.warning(f"ActivityLog with ID {activity_id} not found")
         raise NotFoundException(f"ActivityLog with ID {activity_id} not found")
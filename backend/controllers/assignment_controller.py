@@ -1,8 +1,15 @@
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from backend.exceptions.custom_exceptions import NotFoundException, BadRequestException
+from backend.db.statements import get_by_pk
+from backend.db.bulk import bulk_insert, bulk_summary
+from backend.websockets.notifications import notification_service
+from backend.utils.pagination import keyset
 
 from backend.models.assignment_models import Assignment
+from backend.models.service_models import Service
+from backend.models.employee_models import Employee
 from backend.schema.assignment_schema import AssignmentCreate, AssignmentUpdate
 
 from backend.logger.logger import logger
@@ -18,17 +25,24 @@ async def create_assignment_controller(assignment_data: AssignmentCreate, db: As
     return new_assignment
   
 
-async def get_all_assignments_controller(db: AsyncSession):
+async def create_assignments_bulk_controller(assignments_data: List[AssignmentCreate], db: AsyncSession):
+    logger.info(f"Creating {len(assignments_data)} assignments in bulk")
+    assignments = await bulk_insert(
+        db, Assignment, assignments_data, foreign_keys={"service_id": Service, "employee_id": Employee}
+    )
+    await notification_service.send_employee_update("assignments_bulk_created", bulk_summary(assignments, "assignment_id"))
+    return assignments
+
+async def get_all_assignments_controller(db: AsyncSession, limit: Optional[int] = None, after: Optional[int] = None):
     logger.info("Fetching all assignments")
-    result = await db.execute(select(Assignment))
+    result = await db.execute(keyset(select(Assignment), Assignment.assignment_id, limit, after))
     assignments = result.scalars().all()
     logger.info(f"Fetched {len(assignments)} assignments")
     return assignments
 
 async def get_assignment_by_id_controller(assignment_id: int, db: AsyncSession):
     logger.info(f"Fetching assignment with ID: {assignment_id}")
-    result = await db.execute(select(Assignment).where(Assignment.assignment_id == assignment_id))
-    assignment = result.scalar_one_or_none()
+    assignment = await get_by_pk(db, Assignment, assignment_id)
     if assignment is None:
         logger.warning(f"Assignment with ID {assignment_id} not found")
         raise HTTPException(status_code=404, detail="Assignment not found")
@@ -37,8 +51,7 @@ async def get_assignment_by_id_controller(assignment_id: int, db: AsyncSession):
 
 async def update_assignment_controller(assignment_id: int, assignment_data: AssignmentUpdate, db: AsyncSession):
     logger.info(f"Updating assignment with ID: {assignment_id}")
-    result = await db.execute(select(Assignment).where(Assignment.assignment_id == assignment_id))
-    assignment = result.scalar_one_or_none()
+    assignment = await get_by_pk(db, Assignment, assignment_id)
 
     if not assignment:
         logger.warning(f"Assignment with ID {assignment_id} not found for update")
@@ -57,8 +70,7 @@ async def update_assignment_controller(assignment_id: int, assignment_data: Assi
 
 async def delete_assignment_controller(assignment_id: int, db: AsyncSession):
     logger.info(f"Deleting assignment with ID: {assignment_id}")
-    result = await db.execute(select(Assignment).where(Assignment.assignment_id == assignment_id))
-    assignment = result.scalar_one_or_none()
+    assignment = await get_by_pk(db, Assignment, assignment_id)
 
     if not assignment:
         logger.warning(f"Assignment with ID {assignment_id} not found for deletion")
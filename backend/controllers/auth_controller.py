@@ -9,6 +9,8 @@ from backend.utils.auth import hash_password, verify_password
 from backend.utils.auth_jwt import create_access_token
 from backend.utils.authorization import get_user_permissions, get_available_routes
 from backend.logger.logger import logger
+from backend.controllers.user_controllers import user_rows
+from backend.utils import simple_cache
 
 async def login_user(login_data: LoginRequest, db: AsyncSession) -> TokenResponse:
    
@@ -107,6 +109,9 @@ async def register_user(register_data: RegisterRequest, db: AsyncSession) -> Tok
     db.add(new_user)
     await db.commit()
     await db.refresh(new_user)
+    # Mismas invalidaciones que el resto de escrituras de usuarios (users:all)
+    await user_rows.invalidate_lists()
+    await simple_cache.cache.bump_generation("users")
     
     
     token_data = {
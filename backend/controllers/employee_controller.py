@@ -1,14 +1,20 @@
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import join
 from backend.exceptions.custom_exceptions import NotFoundException, BadRequestException
+from backend.db.statements import get_by_pk
+from backend.utils.pagination import keyset
+from backend.utils.row_cache import RowCache
 
 from backend.models.employee_models import Employee
 from backend.models.user_models import User
-from backend.schema.employee_schema import EmployeeCreate, EmployeeUpdate
+from backend.schema.employee_schema import EmployeeCreate, EmployeeUpdate, EmployeeOut
 
 from backend.logger.logger import logger
 
+employee_rows = RowCache(Employee, EmployeeOut)
+
 async def create_employee_controller(employee_data: EmployeeCreate, db: AsyncSession):
     logger.info(f"Creating employee with data: {employee_data.dict()}")
     new_employee = Employee(**employee_data.dict())
@@ -16,13 +22,16 @@ async def create_employee_controller(employee_data: EmployeeCreate, db: AsyncSes
     await db.commit()
     await db.refresh(new_employee)
     logger.info(f"Employee created with ID: {new_employee.employee_id}")
+    await employee_rows.store(new_employee)
+    await employee_rows.invalidate_lists()
     return new_employee
 
-async def get_all_employees_controller(db: AsyncSession):
+async def get_all_employees_controller(db: AsyncSession, limit: Optional[int] = None, after: Optional[int] = None):
     logger.info("Fetching all employees")
+    # Fuera del try: un cursor no válido es un 400, no una lista vacía
+    query = keyset(select(Employee.employee_id), Employee.employee_id, limit, after)
     try:
-        result = await db.execute(select(Employee))
-        employees = result.scalars().all()
+        employees = await employee_rows.list(db, query, "all", limit=limit, after=after)
         logger.info(f"Fetched {len(employees)} employees")
         return employees
     except Exception as e:
@@ -32,8 +41,7 @@ async def get_all_employees_controller(db: AsyncSession):
 
 async def get_employee_by_id_controller(employee_id: int, db: AsyncSession):
     logger.info(f"Fetching employee with ID: {employee_id}")
-    result = await db.execute(select(Employee).where(Employee.employee_id == employee_id))
-    employee = result.scalar_one_or_none()
+    employee = await employee_rows.get(db, employee_id)
     if employee is None:
         logger.warning(f"Employee with ID {employee_id} not found")
         raise NotFoundException("Employee not found")
@@ -42,8 +50,7 @@ async def get_employee_by_id_controller(employee_id: int, db: AsyncSession):
 
 async def update_employee_controller(employee_id: int, employee_data: EmployeeUpdate, db: AsyncSession):
     logger.info(f"Updating employee with ID: {employee_id}")
-    result = await db.execute(select(Employee).where(Employee.employee_id == employee_id))
-    employee = result.scalar_one_or_none()
+    employee = await get_by_pk(db, Employee, employee_id)
     if not employee:
         logger.warning(f"Employee with ID {employee_id} not found for update")
         raise NotFoundException("Employee not found")
@@ -54,12 +61,12 @@ async def update_employee_controller(employee_id: int, employee_data: EmployeeUp
     await db.commit()
     await db.refresh(employee)
     logger.info(f"Updated employee with ID: {employee_id}")
+    await employee_rows.store(employee)
     return employee
 
 async def delete_employee_controller(employee_id: int, db: AsyncSession):
     logger.info(f"Deleting employee with ID: {employee_id}")
-    result = await db.execute(select(Employee).where(Employee.employee_id == employee_id))
-    employee = result.scalar_one_or_none()
+    employee = await get_by_pk(db, Employee, employee_id)
     if not employee:
         logger.warning(f"Employee with ID {employee_id} not found for deletion")
         raise NotFoundException("Employee not found")
@@ -67,4 +74,6 @@ async def delete_employee_controller(employee_id: int, db: AsyncSession):
     await db.delete(employee)
     await db.commit()
     logger.info(f"Deleted employee with ID: {employee_id}")
+    await employee_rows.forget(employee_id)
+    await employee_rows.invalidate_lists()
     return {"detail": f"Employee with ID {employee_id} deleted successfully"}
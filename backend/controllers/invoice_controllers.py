@@ -1,8 +1,14 @@
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from backend.exceptions.custom_exceptions import NotFoundException, BadRequestException
+from backend.db.statements import get_by_pk
+from backend.db.bulk import bulk_insert, bulk_summary
+from backend.websockets.notifications import notification_service
+from backend.utils.pagination import keyset
 
 from backend.models.invoice_models import Invoice
+from backend.models.service_models import Service
 from backend.models.reservation_models import Reservation
 from backend.schema.invoice_schema import InvoiceCreate, InvoiceUpdate
 
@@ -17,26 +23,33 @@ async def create_invoice_controller(invoice_data: InvoiceCreate, db: AsyncSessio
     logger.info(f"Invoice created with ID: {new_invoice.invoice_id}")
     return new_invoice
 
-async def get_all_invoices_controller(db: AsyncSession):
+async def create_invoices_bulk_controller(invoices_data: List[InvoiceCreate], db: AsyncSession):
+    logger.info(f"Creating {len(invoices_data)} invoices in bulk")
+    invoices = await bulk_insert(db, Invoice, invoices_data, foreign_keys={"service_id": Service})
+    await notification_service.send_invoice_update("bulk_created", bulk_summary(invoices, "invoice_id"))
+    return invoices
+
+async def get_all_invoices_controller(db: AsyncSession, limit: Optional[int] = None, after: Optional[int] = None):
     logger.info("Fetching all invoices")
-    result = await db.execute(select(Invoice))
+    result = await db.execute(keyset(select(Invoice), Invoice.invoice_id, limit, after))
     invoices = result.scalars().all()
     logger.info(f"Fetched {len(invoices)} invoices")
     return invoices
 
-async def get_invoices_by_user_controller(user_id: int, db: AsyncSession):
+async def get_invoices_by_user_controller(user_id: int, db: AsyncSession, limit: Optional[int] = None, after: Optional[int] = None):
     """
     Obtiene todas las facturas de los servicios que un usuario ha contratado a través de sus reservas
     """
     logger.info(f"Fetching invoices for user ID {user_id}")
     
 
-    result = await db.execute(
+    query = (
         select(Invoice)
         .join(Reservation, Invoice.service_id == Reservation.service_id)
         .where(Reservation.user_id == user_id)
         .distinct()
     )
+    result = await db.execute(keyset(query, Invoice.invoice_id, limit, after))
     invoices = result.scalars().all()
     
     logger.info(f"Fetched {len(invoices)} unique invoices for user ID {user_id}")
@@ -44,8 +57,7 @@ async def get_invoices_by_user_controller(user_id: int, db: AsyncSession):
 
 async def get_invoice_by_id_controller(invoice_id: int, db: AsyncSession):
     logger.info(f"Fetching invoice with ID: {invoice_id}")
-    result = await db.execute(select(Invoice).where(Invoice.invoice_id == invoice_id))
-    invoice = result.scalar_one_or_none()
+    invoice = await get_by_pk(db, Invoice, invoice_id)
     if invoice is None:
         logger.warning(f"Invoice with ID {invoice_id} not found")
         raise NotFoundException("Invoice not found")
@@ -54,8 +66,7 @@ async def get_invoice_by_id_controller(invoice_id: int, db: AsyncSession):
 
 async def update_invoice_controller(invoice_id: int, invoice_data: InvoiceUpdate, db: AsyncSession):
     logger.info(f"Updating invoice with ID: {invoice_id}")
-    result = await db.execute(select(Invoice).where(Invoice.invoice_id == invoice_id))
-    invoice = result.scalar_one_or_none()
+    invoice = await get_by_pk(db, Invoice, invoice_id)
     if not invoice:
         logger.warning(f"Invoice with ID {invoice_id} not found for update")
         raise NotFoundException("Invoice not found")
@@ -70,8 +81,7 @@ async def update_invoice_controller(invoice_id: int, invoice_data: InvoiceUpdate
 
 async def delete_invoice_controller(invoice_id: int, db: AsyncSession):
     logger.info(f"Deleting invoice with ID: {invoice_id}")
-    result = await db.execute(select(Invoice).where(Invoice.invoice_id == invoice_id))
-    invoice = result.scalar_one_or_none()
+    invoice = await get_by_pk(db, Invoice, invoice_id)
     if not invoice:
         logger.warning(f"Invoice with ID {invoice_id} not found for deletion")
         raise NotFoundException("Invoice not found")
@@ -1,4 +1,9 @@
 from backend.exceptions.custom_exceptions import NotFoundException, BadRequestException
+from backend.db.statements import get_by_pk
+from backend.db.bulk import bulk_insert, bulk_summary
+from backend.websockets.notifications import notification_service
+from backend.utils.pagination import keyset
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from backend.models.medical_history_models import MedicalHistory
@@ -20,14 +25,20 @@ async def create_medical_history(db: AsyncSession, medical_history: MedicalHisto
     logger.info(f"Created medical history with ID {db_medical_history.id}")
     return db_medical_history
 
-async def get_all_medical_histories(db: AsyncSession):
+async def create_medical_histories_bulk(db: AsyncSession, medical_histories: List[MedicalHistoryCreate]):
+    logger.info(f"Creating {len(medical_histories)} medical histories in bulk")
+    histories = await bulk_insert(db, MedicalHistory, medical_histories, foreign_keys={"pet_id": Pet})
+    await notification_service.send_medical_history_update("bulk_created", bulk_summary(histories, "id"))
+    return histories
+
+async def get_all_medical_histories(db: AsyncSession, limit: Optional[int] = None, after: Optional[int] = None):
     logger.info("Fetching all medical histories")
-    result = await db.execute(select(MedicalHistory))
+    result = await db.execute(keyset(select(MedicalHistory), MedicalHistory.id, limit, after))
     histories = result.scalars().all()
     logger.info(f"Fetched {len(histories)} medical histories")
     return histories
 
-async def get_medical_histories_by_user(db: AsyncSession, user_id: int):
+async def get_medical_histories_by_user(db: AsyncSession, user_id: int, limit: Optional[int] = None, after: Optional[int] = None):
     """
     Obtiene todos los historiales médicos de las mascotas que pertenecen al usuario
     """
@@ -43,9 +54,8 @@ async def get_medical_histories_by_user(db: AsyncSession, user_id: int):
         logger.info(f"No pets found for user ID {user_id}")
         return []
  
-    result = await db.execute(
-        select(MedicalHistory).where(MedicalHistory.pet_id.in_(user_pet_ids))
-    )
+    query = select(MedicalHistory).where(MedicalHistory.pet_id.in_(user_pet_ids))
+    result = await db.execute(keyset(query, MedicalHistory.id, limit, after))
     histories = result.scalars().all()
     
     logger.info(f"Fetched {len(histories)} medical histories for user ID {user_id}")
@@ -53,8 +63,7 @@ async def get_medical_histories_by_user(db: AsyncSession, user_id: int):
 
 async def get_medical_history_by_id(db: AsyncSession, medical_history_id: int):
     logger.info(f"Fetching medical history with ID {medical_history_id}")
-    result = await db.execute(select(MedicalHistory).filter(MedicalHistory.id == medical_history_id))
-    medical_history = result.scalar_one_or_none()
+    medical_history = await get_by_pk(db, MedicalHistory, medical_history_id)
     if not medical_history:
         logger.warning(f"Medical history with ID {medical_history_id} not found")
         raise NotFoundException("Medical history not found")
@@ -1,6 +1,11 @@
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from backend.exceptions.custom_exceptions import NotFoundException, BadRequestException
+from backend.db.statements import get_by_pk, exists_by_pk
+from backend.db.bulk import bulk_insert, bulk_summary
+from backend.websockets.notifications import notification_service
+from backend.utils.pagination import keyset
 
 
 from backend.models.payment_models import Payment
@@ -13,13 +18,11 @@ from backend.logger.logger import logger
 async def create_payment_controller(payment_data: PaymentCreate, db: AsyncSession):
     logger.debug(f"Creating payment with data: {payment_data}")
   
-    result = await db.execute(select(Invoice).where(Invoice.invoice_id == payment_data.invoice_id))
-    invoice = result.scalar_one_or_none()
-    if not invoice:
+    if not await exists_by_pk(db, Invoice, payment_data.invoice_id):
         logger.error(f"Invoice with ID {payment_data.invoice_id} not found")
         raise BadRequestException(f"Invoice with ID {payment_data.invoice_id} not found")
     
-    logger.debug(f"Found invoice: {invoice.invoice_id}")
+    logger.debug(f"Found invoice: {payment_data.invoice_id}")
     
     try:
         new_payment = Payment(**payment_data.dict())
@@ -34,17 +37,22 @@ async def create_payment_controller(payment_data: PaymentCreate, db: AsyncSessio
         await db.rollback()
         raise BadRequestException(f"Error creating payment: {str(e)}")
 
-async def get_all_payments_controller(db: AsyncSession):
+async def create_payments_bulk_controller(payments_data: List[PaymentCreate], db: AsyncSession):
+    logger.debug(f"Creating {len(payments_data)} payments in bulk")
+    payments = await bulk_insert(db, Payment, payments_data, foreign_keys={"invoice_id": Invoice})
+    await notification_service.send_payment_update("bulk_created", bulk_summary(payments, "payment_id"))
+    return payments
+
+async def get_all_payments_controller(db: AsyncSession, limit: Optional[int] = None, after: Optional[int] = None):
     logger.debug("Fetching all payments")
-    result = await db.execute(select(Payment))
+    result = await db.execute(keyset(select(Payment), Payment.payment_id, limit, after))
     payments = result.scalars().all()
     logger.info(f"Fetched {len(payments)} payments")
     return payments
 
 async def get_payment_by_id_controller(payment_id: int, db: AsyncSession):
     logger.debug(f"Fetching payment with ID: {payment_id}")
-    result = await db.execute(select(Payment).where(Payment.payment_id == payment_id))
-    payment = result.scalar_one_or_none()
+    payment = await get_by_pk(db, Payment, payment_id)
     if payment is None:
         logger.warning(f"Payment with ID {payment_id} not found")
         raise NotFoundException("Payment not found")
@@ -53,8 +61,7 @@ async def get_payment_by_id_controller(payment_id: int, db: AsyncSession):
 
 async def update_payment_controller(payment_id: int, payment_data: PaymentUpdate, db: AsyncSession):
     logger.debug(f"Updating payment with ID: {payment_id} using data: {payment_data}")
-    result = await db.execute(select(Payment).where(Payment.payment_id == payment_id))
-    payment = result.scalar_one_or_none()
+    payment = await get_by_pk(db, Payment, payment_id)
     if not payment:
         logger.warning(f"Payment with ID {payment_id} not found for update")
         raise NotFoundException("Payment not found")
@@ -69,8 +76,7 @@ async def update_payment_controller(payment_id: int, payment_data: PaymentUpdate
 
 async def delete_payment_controller(payment_id: int, db: AsyncSession):
     logger.debug(f"Deleting payment with ID: {payment_id}")
-    result = await db.execute(select(Payment).where(Payment.payment_id == payment_id))
-    payment = result.scalar_one_or_none()
+    payment = await get_by_pk(db, Payment, payment_id)
     if not payment:
         logger.warning(f"Payment with ID {payment_id} not found for deletion")
         raise NotFoundException("Payment not found")
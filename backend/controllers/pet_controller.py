@@ -1,8 +1,13 @@
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from backend.exceptions.custom_exceptions import NotFoundException
 from backend.utils.cache_decorators import cache_response, invalidate_cache
 from backend.websockets.notifications import notification_service
+from backend.db.statements import get_by_pk, exists_by_pk
+from backend.db.bulk import bulk_insert, bulk_summary
+from backend.utils.pagination import keyset
+from backend.utils.row_cache import RowCache
 
 from backend.models.pet_models import Pet
 from backend.models.user_models import User
@@ -10,12 +15,12 @@ from backend.schema.pet_schema import PetCreate, PetUpdate, PetOut
 
 from backend.logger.logger import logger
 
+pet_rows = RowCache(Pet, PetOut)
+
 @invalidate_cache("pets")
 async def create_pet_controller(pet_data: PetCreate, db: AsyncSession):
     logger.debug(f"Attempting to create pet for user ID {pet_data.user_id}")
-    user_result = await db.execute(select(User).where(User.user_id == pet_data.user_id))
-    user = user_result.scalar_one_or_none()
-    if not user:
+    if not await exists_by_pk(db, User, pet_data.user_id):
         logger.warning(f"User with ID {pet_data.user_id} not found")
         raise NotFoundException("User not found")
     
@@ -25,6 +30,8 @@ async def create_pet_controller(pet_data: PetCreate, db: AsyncSession):
         await db.commit()
         await db.refresh(new_pet)
         logger.info(f"Pet created with ID {new_pet.pet_id}")
+        await pet_rows.store(new_pet)
+        await pet_rows.invalidate_lists()
         
        
         pet_dict = {
@@ -51,38 +58,44 @@ async def create_pet_controller(pet_data: PetCreate, db: AsyncSession):
         await db.rollback()
         raise e
 
-@cache_response("pets:all", ttl=600)  
-async def get_all_pets_controller(db: AsyncSession):
+@invalidate_cache("pets")
+async def create_pets_bulk_controller(pets_data: List[PetCreate], db: AsyncSession):
+    logger.debug(f"Attempting to create {len(pets_data)} pets in bulk")
+    pets = await bulk_insert(db, Pet, pets_data, foreign_keys={"user_id": User})
+    await pet_rows.store(*pets)
+    await pet_rows.invalidate_lists()
+    await notification_service.send_pet_update("bulk_created", bulk_summary(pets, "pet_id"))
+    return pets
+
+@cache_response("pets:all", ttl=600, schema=PetOut, stale_ttl=120)  
+async def get_all_pets_controller(db: AsyncSession, limit: Optional[int] = None, after: Optional[int] = None):
     logger.debug("Fetching all pets from the database")
-    result = await db.execute(select(Pet))
-    pets = result.scalars().all()
+    query = keyset(select(Pet.pet_id), Pet.pet_id, limit, after)
+    pets = await pet_rows.list(db, query, "all", limit=limit, after=after)
     logger.info(f"Fetched {len(pets)} pets")
     return pets
 
-@cache_response("pets:by_id", ttl=900) 
 async def get_pet_by_id_controller(pet_id: int, db: AsyncSession):
     logger.debug(f"Fetching pet with ID {pet_id}")
-    result = await db.execute(select(Pet).where(Pet.pet_id == pet_id))
-    pet = result.scalar_one_or_none()
+    pet = await pet_rows.get(db, pet_id)
     if pet is None:
         logger.warning(f"Pet with ID {pet_id} not found")
         raise NotFoundException("User not found")
     logger.info(f"Pet found: ID {pet_id}")    
     return pet
 
-@cache_response("pets:by_user", ttl=600)  
-async def get_pets_by_user_controller(user_id: int, db: AsyncSession):
+@cache_response("pets:by_user", ttl=600, schema=PetOut)  
+async def get_pets_by_user_controller(user_id: int, db: AsyncSession, limit: Optional[int] = None, after: Optional[int] = None):
     logger.debug(f"Fetching pets for user ID {user_id}")
-    result = await db.execute(select(Pet).where(Pet.user_id == user_id))
-    pets = result.scalars().all()
+    query = keyset(select(Pet.pet_id).where(Pet.user_id == user_id), Pet.pet_id, limit, after)
+    pets = await pet_rows.list(db, query, "by_user", user_id=user_id, limit=limit, after=after)
     logger.info(f"Found {len(pets)} pets for user ID {user_id}")
     return pets
 
 @invalidate_cache("pets")
 async def update_pet_controller(pet_id: int, pet_data: PetUpdate, db: AsyncSession):
     logger.debug(f"Attempting to update pet with ID {pet_id}")
-    result = await db.execute(select(Pet).where(Pet.pet_id == pet_id))
-    pet = result.scalar_one_or_none()
+    pet = await get_by_pk(db, Pet, pet_id)
     if not pet:
         logger.warning(f"Pet with ID {pet_id} not found")
         raise NotFoundException("User not found")
@@ -90,9 +103,7 @@ async def update_pet_controller(pet_id: int, pet_data: PetUpdate, db: AsyncSessi
    
     if pet_data.user_id is not None:
         logger.debug(f"Validating user ID {pet_data.user_id} for pet update")
-        user_result = await db.execute(select(User).where(User.user_id == pet_data.user_id))
-        user = user_result.scalar_one_or_none()
-        if not user:
+        if not await exists_by_pk(db, User, pet_data.user_id):
             logger.warning(f"User with ID {pet_data.user_id} not found")
             raise NotFoundException("User not found")
     
@@ -103,6 +114,9 @@ async def update_pet_controller(pet_id: int, pet_data: PetUpdate, db: AsyncSessi
     await db.commit()
     await db.refresh(pet)
     logger.info(f"Pet with ID {pet_id} updated successfully")
+    await pet_rows.store(pet)
+    if pet_data.user_id is not None:
+        await pet_rows.invalidate_lists()
     
  
     pet_dict = {
@@ -128,8 +142,7 @@ async def update_pet_controller(pet_id: int, pet_data: PetUpdate, db: AsyncSessi
 @invalidate_cache("pets")
 async def delete_pet_controller(pet_id: int, db: AsyncSession):
     logger.debug(f"Attempting to delete pet with ID {pet_id}")
-    result = await db.execute(select(Pet).where(Pet.pet_id == pet_id))
-    pet = result.scalar_one_or_none()
+    pet = await get_by_pk(db, Pet, pet_id)
     if not pet:
         logger.warning(f"Pet with ID {pet_id} not found")
         raise NotFoundException("User not found")
@@ -144,6 +157,8 @@ async def delete_pet_controller(pet_id: int, db: AsyncSession):
     await db.delete(pet)
     await db.commit()
     logger.info(f"Pet with ID {pet_id} deleted successfully")
+    await pet_rows.forget(pet_id)
+    await pet_rows.invalidate_lists()
     
 
     await notification_service.send_pet_update("deleted", pet_info)
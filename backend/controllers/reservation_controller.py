@@ -1,8 +1,13 @@
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from backend.exceptions.custom_exceptions import NotFoundException,BadRequestException
 from backend.websockets.notifications import notification_service
+from backend.db.statements import get_by_pk, exists_by_pk, list_by
+from backend.utils.pagination import keyset
+from backend.utils.cache_decorators import invalidate_namespace
+from backend.controllers.service_controller import service_rows
 
 from backend.models.reservation_models import Reservation
 from backend.models.user_models import User
@@ -13,13 +18,16 @@ from backend.schema.reservation_schema import ReservationCreate, ReservationUpda
 
 from backend.logger.logger import logger
 
+async def _invalidate_services_by_user():
+    """Las reservas deciden qué servicios lista services:by_user: listas de ids y respuestas"""
+    await service_rows.invalidate_lists()
+    await invalidate_namespace("services")
+
 async def create_reservation_controller(reservation_data: ReservationCreate, db: AsyncSession):
     logger.debug(f"Creating reservation for user ID {reservation_data.user_id}")
     
 
-    user_result = await db.execute(select(User).where(User.user_id == reservation_data.user_id))
-    user = user_result.scalar_one_or_none()
-    if not user:
+    if not await exists_by_pk(db, User, reservation_data.user_id):
         logger.warning(f"User with ID {reservation_data.user_id} not found")
         raise NotFoundException("User not found")
     
@@ -48,6 +56,7 @@ async def create_reservation_controller(reservation_data: ReservationCreate, db:
     db.add(new_reservation)
     await db.commit()
     await db.refresh(new_reservation)
+    await _invalidate_services_by_user()
 
     logger.info(f"Reservation {new_reservation.reservation_id} created successfully for user_id={reservation_data.user_id}")
     
@@ -69,13 +78,14 @@ async def create_reservation_controller(reservation_data: ReservationCreate, db:
     
     return new_reservation
 
-async def get_all_reservations_controller(db: AsyncSession):
+async def get_all_reservations_controller(db: AsyncSession, limit: Optional[int] = None, after: Optional[int] = None):
     logger.debug("Fetching all reservations with employee assignments")
     
    
     query = select(Reservation).options(
         selectinload(Reservation.service).selectinload(Service.assignments).selectinload(Assignment.employee)
     )
+    query = keyset(query, Reservation.reservation_id, limit, after)
     
     result = await db.execute(query)
     reservations = result.scalars().all()
@@ -114,25 +124,22 @@ async def get_all_reservations_controller(db: AsyncSession):
 
 async def get_reservation_by_id_controller(reservation_id: int, db: AsyncSession):
     logger.debug(f"Fetching reservation by ID: {reservation_id}")
-    result = await db.execute(select(Reservation).where(Reservation.reservation_id == reservation_id))
-    reservation = result.scalar_one_or_none()
+    reservation = await get_by_pk(db, Reservation, reservation_id)
     if reservation is None:
         logger.warning(f"Reservation with ID {reservation_id} not found")
         raise NotFoundException("Reservation not found")
     logger.info(f"Reservation with ID {reservation_id} found")
     return reservation
 
-async def get_reservations_by_user_controller(user_id: int, db: AsyncSession):
+async def get_reservations_by_user_controller(user_id: int, db: AsyncSession, limit: Optional[int] = None, after: Optional[int] = None):
     logger.debug(f"Fetching reservations for user ID: {user_id}")
-    result = await db.execute(select(Reservation).where(Reservation.user_id == user_id))
-    reservations = result.scalars().all()
+    reservations = await list_by(db, Reservation, "user_id", user_id, limit=limit, after=after, schema=ReservationOut)
     logger.info(f"Found {len(reservations)} reservations for user ID {user_id}")
     return reservations
 
-async def get_reservations_by_service_controller(service_id: int, db: AsyncSession):
+async def get_reservations_by_service_controller(service_id: int, db: AsyncSession, limit: Optional[int] = None, after: Optional[int] = None):
     logger.debug(f"Fetching reservations for service ID: {service_id}")
-    result = await db.execute(select(Reservation).where(Reservation.service_id == service_id))
-    reservations = result.scalars().all()
+    reservations = await list_by(db, Reservation, "service_id", service_id, limit=limit, after=after, schema=ReservationOut)
     logger.info(f"Found {len(reservations)} reservations for service ID {service_id}")
     return reservations
 
@@ -140,8 +147,7 @@ async def update_reservation_controller(reservation_id: int, reservation_data: R
     logger.debug(f"Updating reservation ID: {reservation_id} with data: {reservation_data}")
     
     try:
-        result = await db.execute(select(Reservation).where(Reservation.reservation_id == reservation_id))
-        reservation = result.scalar_one_or_none()
+        reservation = await get_by_pk(db, Reservation, reservation_id)
         if not reservation:
             logger.warning(f"Reservation with ID {reservation_id} not found")
             raise NotFoundException("Reservation not found")
@@ -152,17 +158,13 @@ async def update_reservation_controller(reservation_id: int, reservation_data: R
         
  
         if 'user_id' in update_data and update_data['user_id'] is not None:
-            user_result = await db.execute(select(User).where(User.user_id == update_data['user_id']))
-            user = user_result.scalar_one_or_none()
-            if not user:
+            if not await exists_by_pk(db, User, update_data['user_id']):
                 logger.warning(f"User with ID {update_data['user_id']} not found")
                 raise NotFoundException("User not found")
         
       
         if 'service_id' in update_data and update_data['service_id'] is not None:
-            service_result = await db.execute(select(Service).where(Service.service_id == update_data['service_id']))
-            service = service_result.scalar_one_or_none()
-            if not service:
+            if not await exists_by_pk(db, Service, update_data['service_id']):
                 logger.warning(f"Service with ID {update_data['service_id']} not found")
                 raise NotFoundException("Service not found")
         
@@ -181,6 +183,8 @@ async def update_reservation_controller(reservation_id: int, reservation_data: R
         await db.commit()
         await db.refresh(reservation)
         logger.info(f"Reservation with ID {reservation_id} updated successfully")
+        if {"user_id", "service_id"} & update_data.keys():
+            await _invalidate_services_by_user()
         
       
         reservation_dict = {
@@ -207,8 +211,7 @@ async def update_reservation_controller(reservation_id: int, reservation_data: R
 
 async def delete_reservation_controller(reservation_id: int, db: AsyncSession):
     logger.debug(f"Deleting reservation with ID: {reservation_id}")
-    result = await db.execute(select(Reservation).where(Reservation.reservation_id == reservation_id))
-    reservation = result.scalar_one_or_none()
+    reservation = await get_by_pk(db, Reservation, reservation_id)
     if not reservation:
         logger.warning(f"Reservation with ID {reservation_id} not found")
         raise NotFoundException("Reservation not found")
@@ -223,6 +226,7 @@ async def delete_reservation_controller(reservation_id: int, db: AsyncSession):
     await db.delete(reservation)
     await db.commit()
     logger.info(f"Reservation with ID {reservation_id} deleted successfully")
+    await _invalidate_services_by_user()
     
    
     await notification_service.send_reservation_update("deleted", reservation_info)
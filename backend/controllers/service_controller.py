@@ -1,7 +1,11 @@
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from backend.exceptions.custom_exceptions import NotFoundException
 from backend.utils.cache_decorators import cache_response, invalidate_cache
+from backend.db.statements import get_by_pk
+from backend.utils.pagination import keyset
+from backend.utils.row_cache import RowCache
 
 from backend.models.service_models import Service
 from backend.models.reservation_models import Reservation
@@ -9,6 +13,8 @@ from backend.schema.service_schemas import ServiceCreate, ServiceUpdate, Service
 
 from backend.logger.logger import logger
 
+service_rows = RowCache(Service, ServiceOut)
+
 @invalidate_cache("services")
 async def create_service_controller(service_data: ServiceCreate, db: AsyncSession):
     logger.debug(f"Creating service with data: {service_data}")
@@ -17,38 +23,41 @@ async def create_service_controller(service_data: ServiceCreate, db: AsyncSessio
     await db.commit()
     await db.refresh(new_service)
     logger.info(f"Service created successfully with ID: {new_service.service_id}")
+    await service_rows.store(new_service)
+    await service_rows.invalidate_lists()
     return new_service
 
-@cache_response("services:all", ttl=600)  
-async def get_all_services_controller(db: AsyncSession):
+@cache_response("services:all", ttl=600, schema=ServiceOut, local_ttl=60, stale_ttl=120)  
+async def get_all_services_controller(db: AsyncSession, limit: Optional[int] = None, after: Optional[int] = None):
     logger.debug("Fetching all services")
-    result = await db.execute(select(Service))
-    services = result.scalars().all()
+    query = keyset(select(Service.service_id), Service.service_id, limit, after)
+    services = await service_rows.list(db, query, "all", limit=limit, after=after)
     logger.info(f"Fetched {len(services)} services")
     return services
 
-@cache_response("services:by_user", ttl=600)  
-async def get_services_by_user_controller(user_id: int, db: AsyncSession):
+@cache_response("services:by_user", ttl=600, schema=ServiceOut, local_ttl=60)  
+async def get_services_by_user_controller(user_id: int, db: AsyncSession, limit: Optional[int] = None, after: Optional[int] = None):
    
     logger.info(f"Fetching services for user ID {user_id}")
     
     
-    result = await db.execute(
-        select(Service)
+    query = (
+        select(Service.service_id)
         .join(Reservation, Service.service_id == Reservation.service_id)
         .where(Reservation.user_id == user_id)
         .distinct()
     )
-    services = result.scalars().all()
+    services = await service_rows.list(
+        db, keyset(query, Service.service_id, limit, after), "by_user", user_id=user_id, limit=limit, after=after
+    )
     
     logger.info(f"Fetched {len(services)} unique services for user ID {user_id}")
     return services
 
-@cache_response("services:by_id", ttl=900)  
+@cache_response("services:by_id", ttl=900, schema=ServiceOut, local_ttl=60)  
 async def get_service_by_id_controller(service_id: int, db: AsyncSession):
     logger.debug(f"Fetching service with ID {service_id}")
-    result = await db.execute(select(Service).where(Service.service_id == service_id))
-    service = result.scalar_one_or_none()
+    service = await service_rows.get(db, service_id)
     if service is None:
         logger.warning(f"Service with ID {service_id} not found")
         raise NotFoundException("Service not found")
@@ -58,8 +67,7 @@ async def get_service_by_id_controller(service_id: int, db: AsyncSession):
 @invalidate_cache("services")
 async def update_service_controller(service_id: int, service_data: ServiceUpdate, db: AsyncSession):
     logger.debug(f"Updating service with ID {service_id}")
-    result = await db.execute(select(Service).where(Service.service_id == service_id))
-    service = result.scalar_one_or_none()
+    service = await get_by_pk(db, Service, service_id)
     if not service:
         logger.warning(f"Service with ID {service_id} not found")
         raise NotFoundException("Service not found")
@@ -70,13 +78,13 @@ async def update_service_controller(service_id: int, service_data: ServiceUpdate
     await db.commit()
     await db.refresh(service)
     logger.info(f"Service with ID {service_id} updated successfully")
+    await service_rows.store(service)
     return service
 
 @invalidate_cache("services")
 async def delete_service_controller(service_id: int, db: AsyncSession):
     logger.debug(f"Deleting service with ID {service_id}")
-    result = await db.execute(select(Service).where(Service.service_id == service_id))
-    service = result.scalar_one_or_none()
+    service = await get_by_pk(db, Service, service_id)
     if not service:
         logger.warning(f"Service with ID {service_id} not found")
         raise NotFoundException("Service not found")
@@ -84,5 +92,7 @@ async def delete_service_controller(service_id: int, db: AsyncSession):
     await db.delete(service)
     await db.commit()
     logger.info(f"Service with ID {service_id} deleted successfully")
+    await service_rows.forget(service_id)
+    await service_rows.invalidate_lists()
     return {"detail": "Service deleted successfully"}
 
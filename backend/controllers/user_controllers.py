@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.sql import func
@@ -9,6 +10,11 @@ from backend.schema.user_schema import UserCreate, UserUpdate, UserOut
 from backend.utils.simple_cache import cache_response, invalidate_cache
 from backend.logger.logger import logger  
 from backend.utils.auth import hash_password
+from backend.db.statements import get_by_pk
+from backend.utils.pagination import keyset
+from backend.utils.row_cache import RowCache
+
+user_rows = RowCache(User, UserOut)
 
 
 @invalidate_cache("users")
@@ -31,21 +37,21 @@ async def create_user_controller(user_data: UserCreate, db: AsyncSession):
     await db.refresh(new_user)
 
     logger.info(f"User created successfully with ID: {new_user.user_id}")
+    await user_rows.store(new_user)
+    await user_rows.invalidate_lists()
     return new_user
 
 @cache_response("users:all", ttl=600)  
-async def get_all_users_controller(db: AsyncSession):
+async def get_all_users_controller(db: AsyncSession, limit: Optional[int] = None, after: Optional[int] = None):
     logger.debug("Fetching all users")
-    result = await db.execute(select(User))
-    users = result.scalars().all()
+    query = keyset(select(User.user_id), User.user_id, limit, after)
+    users = await user_rows.list(db, query, "all", limit=limit, after=after)
     logger.info(f"Fetched {len(users)} users")
     return users
 
-@cache_response("users:by_id", ttl=900)  
 async def get_user_by_id_controller(user_id: int, db: AsyncSession):
     logger.debug(f"Fetching user by ID: {user_id}")
-    result = await db.execute(select(User).where(User.user_id == user_id))
-    user = result.scalar_one_or_none()
+    user = await user_rows.get(db, user_id)
     
     if user:
         logger.info(f"User found with ID: {user_id}")
@@ -58,8 +64,7 @@ async def get_user_by_id_controller(user_id: int, db: AsyncSession):
 async def update_user_controller(user_id: int, user_data: UserUpdate, db: AsyncSession):
     logger.debug(f"Updating user ID {user_id} with data: {user_data}")
 
-    result = await db.execute(select(User).where(User.user_id== user_id))
-    user = result.scalar_one_or_none()
+    user = await get_by_pk(db, User, user_id)
     if not user:
         logger.warning(f"User not found for update with ID: {user_id}") 
         return None
@@ -78,17 +83,19 @@ async def update_user_controller(user_id: int, user_data: UserUpdate, db: AsyncS
     await db.commit()
     await db.refresh(user)
     logger.info(f"User updated successfully with ID: {user_id}") 
+    await user_rows.store(user)
     return user
 
 @invalidate_cache("users")
 async def delete_user_controller(user_id: int, db: AsyncSession):
     logger.debug(f"Deleting user with ID: {user_id}")
-    result = await db.execute(select(User).where(User.user_id == user_id))
-    user = result.scalar_one_or_none()
+    user = await get_by_pk(db, User, user_id)
     if not user:
         logger.warning(f"User not found for deletion with ID: {user_id}")
         return False
     await db.delete(user)
     await db.commit()
     logger.info(f"User deleted successfully with ID: {user_id}")
+    await user_rows.forget(user_id)
+    await user_rows.invalidate_lists()
     return True
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""
+Altas por lotes: valida el lote, comprueba todas las claves foráneas en una
+sola consulta e inserta las filas con un único INSERT multi-fila con RETURNING.
+"""
+import os
+from collections import defaultdict
+from typing import Dict, List, Sequence
+
+from pydantic import BaseModel
+from sqlalchemy import insert, literal, select, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.statements import primary_key_name
+from backend.exceptions.custom_exceptions import BadRequestException, NotFoundException
+from backend.logger.logger import logger
+
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", 500))
+
+
+def check_batch_size(items: Sequence) -> None:
+    if not items:
+        raise BadRequestException("Empty batch")
+    if len(items) > BULK_MAX_ITEMS:
+        raise BadRequestException(f"Batch too large: {len(items)} items (max {BULK_MAX_ITEMS})")
+
+
+async def missing_references(db: AsyncSession, rows: List[dict], foreign_keys: Dict[str, type]) -> Dict[str, list]:
+    """Devuelve {campo: ids inexistentes} consultando todas las tablas referenciadas a la vez"""
+    wanted = {field: {row[field] for row in rows} for field in foreign_keys}
+    selects = []
+    for field, model in foreign_keys.items():
+        pk = getattr(model, primary_key_name(model))
+        selects.append(select(literal(field).label("field"), pk.label("id")).where(pk.in_(wanted[field])))
+
+    query = selects[0] if len(selects) == 1 else union_all(*selects)
+    found = defaultdict(set)
+    for field, value in (await db.execute(query)).all():
+        found[field].add(value)
+
+    return {field: sorted(ids - found[field]) for field, ids in wanted.items() if ids - found[field]}
+
+
+async def bulk_insert(
+    db: AsyncSession,
+    model,
+    items: Sequence[BaseModel],
+    foreign_keys: Dict[str, type] = None,
+) -> list:
+    check_batch_size(items)
+    rows = [item.model_dump() for item in items]
+
+    if foreign_keys:
+        missing = await missing_references(db, rows, foreign_keys)
+        if missing:
+            detail = "; ".join(f"{field} not found: {ids}" for field, ids in missing.items())
+            logger.warning(f"Bulk insert into {model.__tablename__} rejected: {detail}")
+            raise NotFoundException(detail)
+
+    try:
+        # Sin sort_by_parameter_order: en SQLite obligaría a insertar fila a fila.
+        # Las claves se asignan en orden dentro del mismo INSERT, así que se
+        # recupera el orden del lote ordenando por clave primaria.
+        result = await db.execute(insert(model).returning(model), rows)
+        pk = primary_key_name(model)
+        created = sorted(result.scalars().all(), key=lambda obj: getattr(obj, pk))
+        await db.commit()
+    except IntegrityError as e:
+        # El mensaje del driver (SQL, valores) se queda en el log, no en la respuesta
+        logger.warning(f"Bulk insert into {model.__tablename__} rejected by a constraint: {e}")
+        await db.rollback()
+        raise BadRequestException(f"Invalid {model.__tablename__} batch: it violates a database constraint")
+    except Exception as e:
+        logger.error(f"Error in bulk insert into {model.__tablename__}: {e}")
+        await db.rollback()
+        raise
+
+    logger.info(f"Bulk inserted {len(created)} rows into {model.__tablename__}")
+    return created
+
+
+def bulk_summary(created: list, key: str) -> dict:
+    """Carga de la notificación agregada de un alta por lotes"""
+    return {"count": len(created), "ids": [getattr(obj, key) for obj in created]}
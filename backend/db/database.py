@@ -1,13 +1,75 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
+from fastapi import Request
+from contextlib import asynccontextmanager
+from typing import Optional
+import asyncio
 import os
 
+from backend.db.pool_stats import InstrumentedAsyncQueuePool, describe_pool
+from backend.db.replica import ReplicaLagMonitor
+from backend.db.query_stats import install_query_listeners
+from backend.logger.logger import logger
+
 load_dotenv()
 
+
+def _parse_bool(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return _parse_bool(os.getenv(name, str(default)))
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
 DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+ENVIRONMENT = os.getenv("ENVIRONMENT", "development").lower()
+
+# Valores por worker de uvicorn: con N workers el máximo de conexiones
+# abiertas es N * (DB_POOL_SIZE + DB_MAX_OVERFLOW).
+DB_ECHO = _env_bool("DB_ECHO", False) and ENVIRONMENT != "production"
+DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 5)
+DB_POOL_TIMEOUT = _env_int("DB_POOL_TIMEOUT", 10)
+DB_POOL_RECYCLE = _env_int("DB_POOL_RECYCLE", 1800)
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+DB_POOL_LOG_INTERVAL = _env_int("DB_POOL_LOG_INTERVAL", 0)
+DB_QUERY_CACHE_SIZE = _env_int("DB_QUERY_CACHE_SIZE", 500)
+DB_PREPARED_STATEMENT_CACHE_SIZE = _env_int("DB_PREPARED_STATEMENT_CACHE_SIZE", 256)
+DB_REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", 5))
+DB_REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_LAG_CHECK_INTERVAL", 5))
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+# Cabecera con la que un cliente pide leer del primario justo después de escribir
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+
+
+def engine_options(url: str) -> dict:
+    options = {"echo": DB_ECHO, "query_cache_size": DB_QUERY_CACHE_SIZE}
+    if url and url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {"prepared_statement_cache_size": DB_PREPARED_STATEMENT_CACHE_SIZE}
+    if url and url.startswith("sqlite"):
+        # SQLite no usa un pool de red; se deja el pool por defecto del dialecto
+        return options
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    return options
+
+
+install_query_listeners()
+
+engine = create_async_engine(DATABASE_URL, **engine_options(DATABASE_URL))
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
@@ -15,9 +77,81 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+read_engine = (
+    create_async_engine(DATABASE_READ_URL, **engine_options(DATABASE_READ_URL))
+    if DATABASE_READ_URL else None
+)
+
+AsyncReadSessionLocal = sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+) if read_engine is not None else None
+
+replica_monitor = (
+    ReplicaLagMonitor(read_engine, DB_REPLICA_MAX_LAG, DB_REPLICA_LAG_CHECK_INTERVAL)
+    if read_engine is not None else None
+)
+
+@asynccontextmanager
+async def session_scope(session_factory):
+    """Sesión única por petición.
+
+    Crear la AsyncSession no toca el pool: la conexión se pide con la
+    primera sentencia, así que un acierto de caché no hace checkout.
+    FastAPI cachea la dependencia por petición, de modo que todas las
+    dependencias anidadas que piden get_db reciben la misma sesión.
+    """
+    session = session_factory()
+    try:
+        yield session
+    except Exception:
+        if session.in_transaction():
+            await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
 async def get_db():
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
\ No newline at end of file
+    async with session_scope(AsyncSessionLocal) as session:
+        yield session
+
+
+def wants_primary(request: Optional[Request]) -> bool:
+    if request is None:
+        return False
+    return _parse_bool(request.headers.get(READ_YOUR_WRITES_HEADER, ""))
+
+
+async def get_read_sessionmaker(request: Optional[Request] = None):
+    if AsyncReadSessionLocal is None or wants_primary(request):
+        return AsyncSessionLocal
+    if not await replica_monitor.is_usable():
+        return AsyncSessionLocal
+    return AsyncReadSessionLocal
+
+
+async def get_read_db(request: Request):
+    """Sesión para rutas de solo lectura: réplica si existe y va al día, si no el primario"""
+    session_factory = await get_read_sessionmaker(request)
+    async with session_scope(session_factory) as session:
+        yield session
+
+
+def get_pool_status() -> dict:
+    status = {"primary": describe_pool(engine.pool)}
+    if read_engine is not None:
+        status["replica"] = {**describe_pool(read_engine.pool), **replica_monitor.status()}
+    return status
+
+
+def log_pool_status() -> None:
+    for name, status in get_pool_status().items():
+        logger.info(f"DB pool [{name}]: {status}")
+
+
+async def pool_status_logger(interval: int = DB_POOL_LOG_INTERVAL):
+    while True:
+        await asyncio.sleep(interval)
+        log_pool_status()
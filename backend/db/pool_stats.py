@@ -0,0 +1,97 @@
+import os
+import time
+import threading
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from backend.logger.logger import logger
+
+DB_POOL_SLOW_CHECKOUT_MS = float(os.getenv("DB_POOL_SLOW_CHECKOUT_MS", 100))
+
+
+class PoolStats:
+    """Contadores de uso del pool: checkouts, tiempo de espera y timeouts"""
+
+    def __init__(self, slow_checkout_ms: float = DB_POOL_SLOW_CHECKOUT_MS):
+        self._lock = threading.Lock()
+        self.slow_checkout_ms = slow_checkout_ms
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.slow_checkouts = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+
+    def record_checkout(self, wait: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            slow = wait * 1000 >= self.slow_checkout_ms
+            if slow:
+                self.slow_checkouts += 1
+        if slow:
+            logger.warning(f"Slow DB pool checkout: waited {wait * 1000:.1f} ms for a connection")
+
+    def record_timeout(self, wait: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+        logger.error(f"DB pool checkout timed out after {wait:.1f} s")
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "slow_checkouts": self.slow_checkouts,
+                "avg_wait_ms": round(self.total_wait / attempts * 1000, 3) if attempts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool que mide cuánto espera cada checkout.
+
+    El tiempo incluye abrir una conexión nueva cuando el pool crece
+    hacia el overflow, que es lo que realmente ve la petición.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats(DB_POOL_SLOW_CHECKOUT_MS)
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_timeout(time.perf_counter() - start)
+            raise
+        self.stats.record_checkout(time.perf_counter() - start)
+        return conn
+
+
+def describe_pool(pool) -> Dict[str, Any]:
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            status[name if name != "size" else "pool_size"] = method()
+    max_overflow = getattr(pool, "_max_overflow", None)
+    if max_overflow is not None:
+        status["max_overflow"] = max_overflow
+    timeout = getattr(pool, "_timeout", None)
+    if timeout is not None:
+        status["timeout"] = timeout
+    stats = getattr(pool, "stats", None)
+    if isinstance(stats, PoolStats):
+        status.update(stats.snapshot())
+    return status
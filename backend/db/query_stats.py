@@ -0,0 +1,110 @@
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from backend.logger.logger import logger
+
+DB_QUERY_BUDGET = int(os.getenv("DB_QUERY_BUDGET", 10))
+DB_N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", 5))
+
+
+class QueryStats:
+    """Sentencias SQL y tiempo de base de datos acumulados en una petición"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    @property
+    def duration_ms(self) -> float:
+        return round(self.duration * 1000, 3)
+
+    def repeated(self, threshold: int = DB_N_PLUS_ONE_THRESHOLD) -> dict:
+        return {sql: n for sql, n in self.statements.items() if n >= threshold}
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("db_query_stats", default=None)
+_collectors = []
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    for collector in list(_collectors):
+        collector.record(statement, elapsed)
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def install_query_listeners() -> None:
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def count_queries():
+    """Cuenta todas las sentencias ejecutadas dentro del bloque, en cualquier hilo"""
+    install_query_listeners()
+    stats = QueryStats()
+    _collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        _collectors.remove(stats)
+
+
+def query_budget(max_queries: int):
+    """Fija el presupuesto de sentencias SQL de una ruta concreta"""
+    def decorator(func):
+        func.query_budget = max_queries
+        return func
+    return decorator
+
+
+async def query_stats_middleware(request: Request, call_next):
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _current_stats.reset(token)
+
+    response.headers["X-DB-Queries"] = str(stats.count)
+    response.headers["Server-Timing"] = f'db;dur={stats.duration_ms};desc="{stats.count} queries"'
+
+    route = request.scope.get("route")
+    path = getattr(route, "path", request.url.path)
+    budget = getattr(getattr(route, "endpoint", None), "query_budget", DB_QUERY_BUDGET)
+
+    logger.debug(f"{request.method} {path}: {stats.count} queries in {stats.duration_ms} ms")
+    if stats.count > budget:
+        logger.warning(f"{request.method} {path} issued {stats.count} queries (budget {budget})")
+    for statement, times in stats.repeated().items():
+        logger.warning(f"Possible N+1 in {request.method} {path}: statement ran {times} times: {statement[:200]}")
+    return response
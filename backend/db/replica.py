@@ -0,0 +1,60 @@
+import asyncio
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.logger.logger import logger
+
+# Réplica al día cuando ya aplicó todo el WAL recibido; si no, segundos
+# desde la última transacción reproducida.
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaLagMonitor:
+    """Mide el retraso de la réplica de lectura y lo cachea unos segundos"""
+
+    def __init__(self, engine: AsyncEngine, max_lag: float, check_interval: float):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag: Optional[float] = None
+        self._checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def _measure(self) -> float:
+        if self.engine.dialect.name != "postgresql":
+            return 0.0
+        async with self.engine.connect() as conn:
+            result = await conn.execute(POSTGRES_LAG_QUERY)
+            return float(result.scalar() or 0)
+
+    def _is_fresh(self) -> bool:
+        return self._checked_at is not None and time.monotonic() - self._checked_at < self.check_interval
+
+    async def current_lag(self) -> Optional[float]:
+        if self._is_fresh():
+            return self.lag
+        async with self._lock:
+            if self._is_fresh():
+                return self.lag
+            try:
+                self.lag = await self._measure()
+            except Exception as e:
+                logger.warning(f"Could not measure read replica lag, using primary: {e}")
+                self.lag = None
+            self._checked_at = time.monotonic()
+            if self.lag is not None and self.lag > self.max_lag:
+                logger.warning(f"Read replica lag {self.lag:.1f}s exceeds {self.max_lag}s, using primary")
+            return self.lag
+
+    async def is_usable(self) -> bool:
+        lag = await self.current_lag()
+        return lag is not None and lag <= self.max_lag
+
+    def status(self) -> dict:
+        return {"lag_seconds": self.lag, "max_lag_seconds": self.max_lag}
@@ -0,0 +1,108 @@
+"""
+Sentencias pre-construidas para las búsquedas más frecuentes por clave
+primaria y clave foránea.
+
+Cada SELECT se construye una sola vez con un bindparam, así SQLAlchemy
+reutiliza su cache key memoizada y la forma compilada del query cache del
+engine, y asyncpg reutiliza el prepared statement de la conexión en lugar
+de reconstruir y re-hashear la consulta en cada petición.
+
+Los listados pueden además proyectar solo las columnas que pide su schema
+de respuesta (projection), devolviendo dicts en lugar de objetos ORM.
+"""
+import os
+from functools import lru_cache
+from typing import Any, List, Optional
+
+from sqlalchemy import bindparam, inspect, select
+from sqlalchemy.orm import Bundle
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 256))
+
+
+@lru_cache(maxsize=None)
+def primary_key_name(model) -> str:
+    return inspect(model).primary_key[0].key
+
+
+class RowDict(Bundle):
+    """Bundle que entrega cada fila como dict plano"""
+
+    def create_row_processor(self, query, procs, labels):
+        def proc(row):
+            return dict(zip(labels, (p(row) for p in procs)))
+        return proc
+
+
+@lru_cache(maxsize=None)
+def projection(model, schema) -> RowDict:
+    """Columnas del modelo que aparecen en el schema de respuesta"""
+    fields = schema.model_fields
+    columns = [getattr(model, attr.key) for attr in inspect(model).column_attrs if attr.key in fields]
+    return RowDict(model.__name__, *columns)
+
+
+def _entity(model, schema):
+    return model if schema is None else projection(model, schema)
+
+
+@lru_cache(maxsize=DB_STATEMENT_CACHE_SIZE)
+def select_by(model, column: str, schema=None):
+    return select(_entity(model, schema)).where(getattr(model, column) == bindparam("value"))
+
+
+@lru_cache(maxsize=DB_STATEMENT_CACHE_SIZE)
+def select_pk_by(model, column: str):
+    pk = getattr(model, primary_key_name(model))
+    return select(pk).where(getattr(model, column) == bindparam("value")).limit(1)
+
+
+@lru_cache(maxsize=DB_STATEMENT_CACHE_SIZE)
+def select_page_by(model, column: str, after: bool, limited: bool, schema=None):
+    pk = getattr(model, primary_key_name(model))
+    statement = select_by(model, column, schema)
+    if after:
+        statement = statement.where(pk > bindparam("after"))
+    statement = statement.order_by(pk)
+    if limited:
+        statement = statement.limit(bindparam("limit"))
+    return statement
+
+
+async def get_by_pk(db: AsyncSession, model, value: Any) -> Optional[Any]:
+    result = await db.execute(select_by(model, primary_key_name(model)), {"value": value})
+    return result.scalar_one_or_none()
+
+
+async def exists_by_pk(db: AsyncSession, model, value: Any) -> bool:
+    """Comprueba existencia leyendo solo la clave primaria, sin hidratar la fila"""
+    result = await db.execute(select_pk_by(model, primary_key_name(model)), {"value": value})
+    return result.scalar_one_or_none() is not None
+
+
+async def list_by(
+    db: AsyncSession,
+    model,
+    column: str,
+    value: Any,
+    limit: Optional[int] = None,
+    after: Any = None,
+    schema=None,
+) -> List[Any]:
+    if limit is None and after is None:
+        result = await db.execute(select_by(model, column, schema), {"value": value})
+        return result.scalars().all()
+
+    params = {"value": value, "after": after, "limit": limit}
+    statement = select_page_by(model, column, after is not None, limit is not None, schema)
+    result = await db.execute(statement, {k: v for k, v in params.items() if v is not None})
+    return result.scalars().all()
+
+
+def statement_cache_info() -> dict:
+    return {
+        "select_by": select_by.cache_info()._asdict(),
+        "select_pk_by": select_pk_by.cache_info()._asdict(),
+        "select_page_by": select_page_by.cache_info()._asdict(),
+    }
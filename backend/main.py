@@ -2,6 +2,7 @@ from fastapi import FastAPI, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
 
 from backend.routes.user_routes import router as users_router
 from backend.routes.service_routes import router as service_router 
@@ -15,10 +16,21 @@ from backend.routes.payment_routes import router as payment_router
 from backend.routes.invoice_routes import router as invoice_router
 from backend.routes.export_routes import router as export_router
 from backend.routes.auth_routes import router as auth_router
+from backend.routes.admin_routes import router as admin_router
 from backend.websockets.routes import router as websocket_router
 
-from backend.db.database import AsyncSessionLocal
+from backend.controllers.pet_controller import get_all_pets_controller
+from backend.controllers.service_controller import get_all_services_controller
+from backend.controllers.user_controllers import get_all_users_controller
+from backend.db.database import DB_POOL_LOG_INTERVAL, log_pool_status, pool_status_logger
+from backend.db.query_stats import query_stats_middleware
+from backend.services.export_executor import export_executor
+from backend.services.export_jobs import export_jobs
 from backend.utils.cache import cache_service
+from backend.utils.cache_warmer import cache_warmer
+from backend.utils.memory_cache import memory_cache
+from backend.utils.pagination import first_page_params
+from backend.utils.tiered_cache import listen_for_invalidations, local_cache
 from backend.utils.auth_jwt import get_current_user
 
 from backend.models.user_models import User
@@ -42,18 +54,42 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"], 
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Link", "X-DB-Queries", "Server-Timing"],
 )
+app.middleware("http")(query_stats_middleware)
 register_exception_handlers(app)
 
 @app.on_event("startup")
 async def startup_event():
     """Inicializar servicios al arrancar la aplicación"""
     await cache_service.connect()
+    app.state.cache_listener_task = asyncio.create_task(listen_for_invalidations(cache_service))
+    memory_cache.start_sweeper()
+    local_cache.start_sweeper()
+    export_jobs.start_sweeper()
+    for controller in (get_all_services_controller, get_all_users_controller, get_all_pets_controller):
+        cache_warmer.register(controller, **first_page_params())
+    cache_warmer.start()
+    if DB_POOL_LOG_INTERVAL > 0:
+        app.state.pool_logger_task = asyncio.create_task(pool_status_logger(DB_POOL_LOG_INTERVAL))
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cerrar conexiones al apagar la aplicación"""
+    cache_listener_task = getattr(app.state, "cache_listener_task", None)
+    if cache_listener_task:
+        cache_listener_task.cancel()
+    cache_warmer.stop()
+    memory_cache.stop_sweeper()
+    local_cache.stop_sweeper()
+    export_jobs.stop_sweeper()
+    export_jobs.stop()
+    export_executor.shutdown()
     await cache_service.disconnect()
+    pool_logger_task = getattr(app.state, "pool_logger_task", None)
+    if pool_logger_task:
+        pool_logger_task.cancel()
+    log_pool_status()
 
 @app.get("/")
 def read_root():
@@ -67,13 +103,6 @@ def health_check():
 async def test_auth(current_user: dict = Depends(get_current_user)):
     return {"message": "Autenticación funcionando", "user": current_user}
 
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
-
 
 app.include_router(users_router, prefix="/users", tags=["Users"])
 app.include_router(service_router, prefix="/services", tags=["Services"])
@@ -87,5 +116,6 @@ app.include_router(payment_router, prefix="/payment", tags=["Payment"])
 app.include_router(invoice_router, prefix="/invoice", tags=["Invoice"])
 app.include_router(export_router, prefix="/export", tags=["Export"])
 app.include_router(auth_router, prefix="/auth", tags=["Auth"])
+app.include_router(admin_router, prefix="/admin", tags=["Admin"])
 app.include_router(websocket_router, tags=["WebSockets"])
 
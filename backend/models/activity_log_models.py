@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .base_models import Base
@@ -6,13 +6,17 @@ from .enums import ActivityTypeEnum
 
 class ActivityLog(Base):
     __tablename__ = "ActivityLog"
+    __table_args__ = (
+        Index("ix_ActivityLog_pet_id_start_time", "pet_id", "start_time"),
+        Index("ix_ActivityLog_employee_id_start_time", "employee_id", "start_time"),
+    )
     
     activity_id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("Employees.employee_id"), nullable=False)
     pet_id = Column(Integer, ForeignKey("Pet.pet_id"), nullable=False)
     activity_type = Column(Enum(ActivityTypeEnum), nullable=False)
     description = Column(Text, nullable=False)
-    start_time = Column(DateTime(timezone=True), nullable=False)
+    start_time = Column(DateTime(timezone=True), nullable=False, index=True)
     end_time = Column(DateTime(timezone=True), nullable=True)
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
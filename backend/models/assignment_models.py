@@ -8,8 +8,8 @@ class Assignment(Base):
     __tablename__ = "Assignment"
 
     assignment_id = Column(Integer, primary_key=True, index=True)
-    service_id = Column(BigInteger, ForeignKey("Service.service_id"), nullable=False)
-    employee_id = Column(Integer, ForeignKey("Employees.employee_id"), nullable=False)
+    service_id = Column(BigInteger, ForeignKey("Service.service_id"), nullable=False, index=True)
+    employee_id = Column(Integer, ForeignKey("Employees.employee_id"), nullable=False, index=True)
     assignment_date = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
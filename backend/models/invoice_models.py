@@ -9,7 +9,7 @@ class Invoice(Base):
     __tablename__ = "Invoice"
 
     invoice_id = Column(Integer, primary_key=True, index=True)
-    service_id = Column(Integer, ForeignKey("Service.service_id"), nullable=False)
+    service_id = Column(Integer, ForeignKey("Service.service_id"), nullable=False, index=True)
     fiscal_number = Column(String(50), nullable=False)
     discounts = Column(Boolean, default=False)
     additional_price = Column(Numeric(10, 2), nullable=True)
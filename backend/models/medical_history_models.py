@@ -7,7 +7,7 @@ class MedicalHistory(Base):
     __tablename__ = "Medical_history"
 
     id = Column(Integer, primary_key=True, index=True)
-    pet_id = Column(Integer, ForeignKey("Pet.pet_id"), nullable=False)
+    pet_id = Column(Integer, ForeignKey("Pet.pet_id"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     type = Column(String(100), nullable=False)
     description = Column(Text, nullable=False)
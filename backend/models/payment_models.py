@@ -9,7 +9,7 @@ class Payment(Base):
     __tablename__ = "Payment"
 
     payment_id = Column(Integer, primary_key=True, index=True)
-    invoice_id = Column(Integer, ForeignKey("Invoice.invoice_id"), nullable=False)
+    invoice_id = Column(Integer, ForeignKey("Invoice.invoice_id"), nullable=False, index=True)
     amount = Column(Numeric(10, 2), nullable=False)
     payment_method = Column(Enum(PaymentMethodEnum), nullable=False)
     payment_date = Column(DateTime(timezone=True), nullable=False)
@@ -16,7 +16,7 @@ class Pet(Base):
     special_needs = Column(String(100), nullable=True)
     img_url = Column(String(100), nullable=True)
 
-    user_id = Column(Integer, ForeignKey('User.user_id'), nullable=False)
+    user_id = Column(Integer, ForeignKey('User.user_id'), nullable=False, index=True)
 
   
     user = relationship("User", back_populates="pet") 
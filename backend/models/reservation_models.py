@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, TIMESTAMP, DateTime, func
+from sqlalchemy import Column, String, Integer, ForeignKey, TIMESTAMP, DateTime, Index, func
 from sqlalchemy.orm import relationship
 
 from .base_models import Base
@@ -6,14 +6,18 @@ from .enums import SqlReservationStatusEnum
 
 class Reservation(Base):
     __tablename__ = 'Reservation'
+    __table_args__ = (
+        # Cubre los filtros por usuario y el join usuario -> servicio de las facturas
+        Index('ix_Reservation_user_id_service_id', 'user_id', 'service_id'),
+    )
 
     reservation_id = Column(Integer, primary_key=True, nullable=False)
     user_id = Column(Integer, ForeignKey('User.user_id'), nullable=False)
-    service_id = Column(Integer, ForeignKey('Service.service_id'), nullable=False)
+    service_id = Column(Integer, ForeignKey('Service.service_id'), nullable=False, index=True)
     created_at = Column(TIMESTAMP(timezone=False), nullable=False, server_default=func.now())
     checkin_date = Column(DateTime(timezone=False), nullable=False)
     checkout_date = Column(DateTime(timezone=False), nullable=False)
-    status = Column(SqlReservationStatusEnum, nullable=False, default="pending")
+    status = Column(SqlReservationStatusEnum, nullable=False, default="pending", index=True)
     internal_notes = Column(String(500), nullable=True)
 
   
@@ -6,12 +6,14 @@ from backend.schema.activity_log_schema import ActivityLogCreate, ActivityLogOut
 
 from backend.controllers.activity_log_controller import (
     create_activitylog_controller,
+    create_activitylogs_bulk_controller,
     get_all_activitylogs_controller,
     get_activitylog_by_id_controller,
     update_activitylog_controller,
     delete_activitylog_controller,
 )
-from backend.db.database import get_db
+from backend.db.database import get_db, get_read_db
+from backend.utils.pagination import CountMode
 
 router = APIRouter()
 
@@ -19,28 +21,34 @@ router = APIRouter()
 async def create_activitylog(activity_data: ActivityLogCreate, db: AsyncSession = Depends(get_db)):
     return await create_activitylog_controller(activity_data, db)
 
+@router.post("/bulk", response_model=List[ActivityLogOut])
+async def create_activitylogs_bulk(activities_data: List[ActivityLogCreate], db: AsyncSession = Depends(get_db)):
+    return await create_activitylogs_bulk_controller(activities_data, db)
+
 @router.get("/", response_model=List[ActivityLogOut])
-async def get_all_activitylogs(db: AsyncSession = Depends(get_db)):
+async def get_all_activitylogs(db: AsyncSession = Depends(get_read_db)):
     return await get_all_activitylogs_controller(db)
 
 @router.get("/activity_logs", response_model=PaginatedActivityLogResponse)
 async def get_activity_logs(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
     pet_id: Optional[int] = Query(None),
     employee_id: Optional[int] = Query(None),
+    count: CountMode = Query("exact", description="exact, estimate (planner estimate on large tables) or none"),
 ):
     return await get_all_activitylogs_controller(
         db=db,
         page=page,
         limit=limit,
         pet_id=pet_id,
-        employee_id=employee_id
+        employee_id=employee_id,
+        count=count
     )
 
 @router.get("/{activity_id}", response_model=ActivityLogOut)
-async def get_activitylog_by_id(activity_id: int, db: AsyncSession = Depends(get_db)):
+async def get_activitylog_by_id(activity_id: int, db: AsyncSession = Depends(get_read_db)):
     return await get_activitylog_by_id_controller(activity_id, db)
 
 @router.put("/{activity_id}", response_model=ActivityLogOut)
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Query
+
+from backend.db.database import get_pool_status
+from backend.utils.authorization import require_admin
+from backend.utils.cache import cache_service
+from backend.utils.cache_metrics import cache_metrics
+from backend.utils.memory_cache import memory_cache
+from backend.utils.tiered_cache import local_cache
+
+router = APIRouter()
+
+@router.get("/db/pool")
+async def db_pool_status(current_user: dict = Depends(require_admin())):
+    return get_pool_status()
+
+@router.get("/cache/stats")
+async def cache_stats(
+    top: int = Query(0, ge=0, le=500, description="Número de claves más consultadas a incluir"),
+    current_user: dict = Depends(require_admin()),
+):
+    """Contadores de caché de este worker, por backend y prefijo"""
+    stats = cache_metrics.snapshot()
+    stats["redis"] = {
+        "available": cache_service.available,
+        "circuit_open": cache_service.breaker.is_open,
+        "consecutive_failures": cache_service.breaker.failures,
+    }
+    stats["memory"] = memory_cache.stats()
+    stats["l1"] = {**local_cache.stats(), "enabled": local_cache.enabled}
+    stats["hot_keys_tracking"] = cache_metrics.track_hot_keys
+    if top:
+        stats["hot_keys"] = cache_metrics.hot_keys(top)
+    return stats
+
+@router.put("/cache/stats/hot-keys")
+async def set_hot_keys_tracking(enabled: bool, current_user: dict = Depends(require_admin())):
+    cache_metrics.track_hot_keys = enabled
+    return {"hot_keys_tracking": enabled}
+
+@router.delete("/cache/stats")
+async def reset_cache_stats(current_user: dict = Depends(require_admin())):
+    cache_metrics.reset()
+    return {"detail": "Cache stats reset"}
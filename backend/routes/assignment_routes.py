@@ -5,12 +5,14 @@ from typing import List
 from backend.schema.assignment_schema import AssignmentCreate, AssignmentOut, AssignmentUpdate
 from backend.controllers.assignment_controller import (
     create_assignment_controller,
+    create_assignments_bulk_controller,
     get_all_assignments_controller,
     get_assignment_by_id_controller,
     update_assignment_controller,
     delete_assignment_controller,
 )
-from backend.db.database import get_db
+from backend.db.database import get_db, get_read_db
+from backend.utils.pagination import CursorParams
 
 router = APIRouter()
 
@@ -18,12 +20,16 @@ router = APIRouter()
 async def create_assignment(assignment_data: AssignmentCreate, db: AsyncSession = Depends(get_db)):
     return await create_assignment_controller(assignment_data, db)
 
+@router.post("/bulk", response_model=List[AssignmentOut])
+async def create_assignments_bulk(assignments_data: List[AssignmentCreate], db: AsyncSession = Depends(get_db)):
+    return await create_assignments_bulk_controller(assignments_data, db)
+
 @router.get("/", response_model=List[AssignmentOut])
-async def get_all_assignments(db: AsyncSession = Depends(get_db)):
-    return await get_all_assignments_controller(db)
+async def get_all_assignments(db: AsyncSession = Depends(get_read_db), page: CursorParams = Depends()):
+    return page.page(await get_all_assignments_controller(db, limit=page.fetch_limit, after=page.after), "assignment_id")
 
 @router.get("/{assignment_id}", response_model=AssignmentOut)
-async def get_assignment_by_id(assignment_id: int, db: AsyncSession = Depends(get_db)):
+async def get_assignment_by_id(assignment_id: int, db: AsyncSession = Depends(get_read_db)):
     assignment = await get_assignment_by_id_controller(assignment_id, db)
     if assignment is None:
         raise HTTPException(status_code=404, detail="Assignment not found")
@@ -10,7 +10,8 @@ from backend.controllers.employee_controller import (
     update_employee_controller,
     delete_employee_controller,
 )
-from backend.db.database import get_db
+from backend.db.database import get_db, get_read_db
+from backend.utils.pagination import CursorParams
 
 router = APIRouter()
 
@@ -19,11 +20,11 @@ async def create_employee(employee_data: EmployeeCreate, db: AsyncSession = Depe
     return await create_employee_controller(employee_data, db)
 
 @router.get("/", response_model=List[EmployeeOut])
-async def get_all_employees(db: AsyncSession = Depends(get_db)):
-    return await get_all_employees_controller(db)
+async def get_all_employees(db: AsyncSession = Depends(get_read_db), page: CursorParams = Depends()):
+    return page.page(await get_all_employees_controller(db, limit=page.fetch_limit, after=page.after), "employee_id")
 
 @router.get("/{employee_id}", response_model=EmployeeOut)
-async def get_employee_by_id(employee_id: int, db: AsyncSession = Depends(get_db)):
+async def get_employee_by_id(employee_id: int, db: AsyncSession = Depends(get_read_db)):
     employee = await get_employee_by_id_controller(employee_id, db)
     if employee is None:
         raise HTTPException(status_code=404, detail="Employee not found")
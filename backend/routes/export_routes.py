@@ -1,278 +1,227 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
-from sqlalchemy.ext.asyncio import AsyncSession
+from dataclasses import dataclass
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from typing import Optional, Dict, Any
-import io
 
 from backend.services.csv_export_service import CSVExportService
-from backend.db.database import get_db
+from backend.services.export_compression import Compression, is_available, negotiate
+from backend.services.export_definitions import TABLE_EXPORTS, get_definition
+from backend.services.export_formats import FORMATS, ExportFormat
+from backend.services.export_jobs import ExportJobLimitError, JobStatus, export_jobs
+from backend.schema.export_schema import ExportJobCreate, ExportJobOut
+from backend.db.database import get_read_sessionmaker
 from backend.logger.logger import logger
 
 router = APIRouter()
 
+
+def _filters(**values: Any) -> Dict[str, Any]:
+    return {name: value for name, value in values.items() if value is not None}
+
+
+@dataclass
+class ExportOptions:
+    export_format: ExportFormat
+    compress: Optional[Compression]
+
+
+def export_options(
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="Output format: csv, ndjson or parquet"),
+    compress: Optional[Compression] = Query(None, description="Compression: gzip, zstd or none. Defaults to Accept-Encoding"),
+) -> ExportOptions:
+    return ExportOptions(export_format, compress)
+
+
+async def _export_response(
+    request: Request, entity: str, filters: Dict[str, Any], options: ExportOptions
+) -> StreamingResponse:
+    """
+    Las filas se leen por lotes mientras se envían; los errores de entidad o
+    de filtros se detectan antes de empezar, cuando aún se puede responder 400.
+    """
+    spec = FORMATS[options.export_format]
+    if not spec.available:
+        raise HTTPException(status_code=501, detail=f"format={options.export_format.value} requires {spec.requires}")
+    compression = negotiate(
+        request.headers.get("accept-encoding"), options.compress, precompressed=options.export_format is ExportFormat.PARQUET
+    )
+    if not is_available(compression):
+        raise HTTPException(status_code=501, detail=f"compress={compression.value} requires zstandard")
+    try:
+        get_definition(entity).query(filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        session_factory = await get_read_sessionmaker(request)
+    except Exception as e:
+        logger.error(f"Error exporting {entity} {options.export_format.value}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error exporting {entity.replace('_', ' ')}")
+
+    headers = {"Content-Disposition": f"attachment; filename={entity}.{spec.extension}", "Vary": "Accept-Encoding"}
+    if compression is not Compression.NONE:
+        headers["Content-Encoding"] = compression.value
+    return StreamingResponse(
+        CSVExportService.stream_with_session(
+            session_factory, entity, filters, options.export_format.value, compression=compression
+        ),
+        media_type=spec.media_type,
+        headers=headers
+    )
+
 @router.get("/users/csv")
 async def export_users_csv(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
     user_id: Optional[int] = Query(None, description="Filter by user ID"),
-    email: Optional[str] = Query(None, description="Filter by email")
+    email: Optional[str] = Query(None, description="Filter by email"),
+    options: ExportOptions = Depends(export_options)
 ):
-    try:
-        filters = {}
-        if user_id:
-            filters["user_id"] = user_id
-        if email:
-            filters["email"] = email
-            
-        csv_content = await CSVExportService.export_users_to_csv(db, filters)
-        
-        return StreamingResponse(
-            io.BytesIO(csv_content),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=users.csv"}
-        )
-    except Exception as e:
-        logger.error(f"Error exporting users CSV: {str(e)}")
-        raise HTTPException(status_code=500, detail="Error exporting users")
+    return await _export_response(request, "users", _filters(user_id=user_id, email=email), options)
 
 @router.get("/pets/csv")
 async def export_pets_csv(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
     pet_id: Optional[int] = Query(None, description="Filter by pet ID"),
-    user_id: Optional[int] = Query(None, description="Filter by user ID")
+    user_id: Optional[int] = Query(None, description="Filter by user ID"),
+    options: ExportOptions = Depends(export_options)
 ):
-    try:
-        filters = {}
-        if pet_id:
-            filters["pet_id"] = pet_id
-        if user_id:
-            filters["user_id"] = user_id
-            
-        csv_content = await CSVExportService.export_pets_to_csv(db, filters)
-        
-        return StreamingResponse(
-            io.BytesIO(csv_content),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=pets.csv"}
-        )
-    except Exception as e:
-        logger.error(f"Error exporting pets CSV: {str(e)}")
-        raise HTTPException(status_code=500, detail="Error exporting pets")
+    return await _export_response(request, "pets", _filters(pet_id=pet_id, user_id=user_id), options)
 
 @router.get("/reservations/csv")
 async def export_reservations_csv(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
     reservation_id: Optional[int] = Query(None, description="Filter by reservation ID"),
     user_id: Optional[int] = Query(None, description="Filter by user ID"),
-    status: Optional[str] = Query(None, description="Filter by status")
+    status: Optional[str] = Query(None, description="Filter by status"),
+    options: ExportOptions = Depends(export_options)
 ):
-    try:
-        filters = {}
-        if reservation_id:
-            filters["reservation_id"] = reservation_id
-        if user_id:
-            filters["user_id"] = user_id
-        if status:
-            filters["status"] = status
-            
-        csv_content = await CSVExportService.export_reservations_to_csv(db, filters)
-        
-        return StreamingResponse(
-            io.BytesIO(csv_content),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=reservations.csv"}
-        )
-    except Exception as e:
-        logger.error(f"Error exporting reservations CSV: {str(e)}")
-        raise HTTPException(status_code=500, detail="Error exporting reservations")
+    return await _export_response(
+        request, "reservations", _filters(reservation_id=reservation_id, user_id=user_id, status=status), options
+    )
 
 @router.get("/services/csv")
 async def export_services_csv(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
     service_id: Optional[int] = Query(None, description="Filter by service ID"),
-    service_type: Optional[str] = Query(None, description="Filter by service type")
+    service_type: Optional[str] = Query(None, description="Filter by service type"),
+    options: ExportOptions = Depends(export_options)
 ):
-    try:
-        filters = {}
-        if service_id:
-            filters["service_id"] = service_id
-        if service_type:
-            filters["service_type"] = service_type
-            
-        csv_content = await CSVExportService.export_services_to_csv(db, filters)
-        
-        return StreamingResponse(
-            io.BytesIO(csv_content),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=services.csv"}
-        )
-    except Exception as e:
-        logger.error(f"Error exporting services CSV: {str(e)}")
-        raise HTTPException(status_code=500, detail="Error exporting services")
+    return await _export_response(request, "services", _filters(service_id=service_id, service_type=service_type), options)
 
 @router.get("/employees/csv")
 async def export_employees_csv(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
     employee_id: Optional[int] = Query(None, description="Filter by employee ID"),
-    position: Optional[str] = Query(None, description="Filter by position")
+    specialty: Optional[str] = Query(None, description="Filter by specialty"),
+    options: ExportOptions = Depends(export_options)
 ):
-    try:
-        filters = {}
-        if employee_id:
-            filters["employee_id"] = employee_id
-        if position:
-            filters["position"] = position
-            
-        csv_content = await CSVExportService.export_employees_to_csv(db, filters)
-        
-        return StreamingResponse(
-            io.BytesIO(csv_content),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=employees.csv"}
-        )
-    except Exception as e:
-        logger.error(f"Error exporting employees CSV: {str(e)}")
-        raise HTTPException(status_code=500, detail="Error exporting employees")
+    return await _export_response(request, "employees", _filters(employee_id=employee_id, specialty=specialty), options)
 
 @router.get("/invoices/csv")
 async def export_invoices_csv(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
     invoice_id: Optional[int] = Query(None, description="Filter by invoice ID"),
-    user_id: Optional[int] = Query(None, description="Filter by user ID")
+    service_id: Optional[int] = Query(None, description="Filter by service ID"),
+    options: ExportOptions = Depends(export_options)
 ):
-    try:
-        filters = {}
-        if invoice_id:
-            filters["invoice_id"] = invoice_id
-        if user_id:
-            filters["user_id"] = user_id
-            
-        csv_content = await CSVExportService.export_invoices_to_csv(db, filters)
-        
-        return StreamingResponse(
-            io.BytesIO(csv_content),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=invoices.csv"}
-        )
-    except Exception as e:
-        logger.error(f"Error exporting invoices CSV: {str(e)}")
-        raise HTTPException(status_code=500, detail="Error exporting invoices")
+    return await _export_response(request, "invoices", _filters(invoice_id=invoice_id, service_id=service_id), options)
 
 @router.get("/payments/csv")
 async def export_payments_csv(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
     payment_id: Optional[int] = Query(None, description="Filter by payment ID"),
-    invoice_id: Optional[int] = Query(None, description="Filter by invoice ID")
+    invoice_id: Optional[int] = Query(None, description="Filter by invoice ID"),
+    options: ExportOptions = Depends(export_options)
 ):
-    try:
-        filters = {}
-        if payment_id:
-            filters["payment_id"] = payment_id
-        if invoice_id:
-            filters["invoice_id"] = invoice_id
-            
-        csv_content = await CSVExportService.export_payments_to_csv(db, filters)
-        
-        return StreamingResponse(
-            io.BytesIO(csv_content),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=payments.csv"}
-        )
-    except Exception as e:
-        logger.error(f"Error exporting payments CSV: {str(e)}")
-        raise HTTPException(status_code=500, detail="Error exporting payments")
+    return await _export_response(request, "payments", _filters(payment_id=payment_id, invoice_id=invoice_id), options)
 
 @router.get("/users-with-pets/csv")
 async def export_users_with_pets_csv(
-    db: AsyncSession = Depends(get_db),
-    user_id: Optional[int] = Query(None, description="Filter by user ID")
+    request: Request,
+    user_id: Optional[int] = Query(None, description="Filter by user ID"),
+    options: ExportOptions = Depends(export_options)
 ):
-    try:
-        filters = {}
-        if user_id:
-            filters["user_id"] = user_id
-            
-        csv_content = await CSVExportService.export_users_with_pets_csv(db, filters)
-        
-        return StreamingResponse(
-            io.BytesIO(csv_content),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=users_with_pets.csv"}
-        )
-    except Exception as e:
-        logger.error(f"Error exporting users with pets CSV: {str(e)}")
-        raise HTTPException(status_code=500, detail="Error exporting users with pets")
+    return await _export_response(request, "users_with_pets", _filters(user_id=user_id), options)
 
 @router.get("/reservations-with-details/csv")
 async def export_reservations_with_details_csv(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
     reservation_id: Optional[int] = Query(None, description="Filter by reservation ID"),
-    status: Optional[str] = Query(None, description="Filter by status")
+    status: Optional[str] = Query(None, description="Filter by status"),
+    options: ExportOptions = Depends(export_options)
 ):
-    try:
-        filters = {}
-        if reservation_id:
-            filters["reservation_id"] = reservation_id
-        if status:
-            filters["status"] = status
-            
-        csv_content = await CSVExportService.export_reservations_with_details_csv(db, filters)
-        
-        return StreamingResponse(
-            io.BytesIO(csv_content),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=reservations_with_details.csv"}
-        )
-    except Exception as e:
-        logger.error(f"Error exporting reservations with details CSV: {str(e)}")
-        raise HTTPException(status_code=500, detail="Error exporting reservations with details")
+    return await _export_response(
+        request, "reservations_with_details", _filters(reservation_id=reservation_id, status=status), options
+    )
 
 @router.get("/invoices-with-payments/csv")
 async def export_invoices_with_payments_csv(
-    db: AsyncSession = Depends(get_db),
-    invoice_id: Optional[int] = Query(None, description="Filter by invoice ID")
+    request: Request,
+    invoice_id: Optional[int] = Query(None, description="Filter by invoice ID"),
+    options: ExportOptions = Depends(export_options)
 ):
-    try:
-        filters = {}
-        if invoice_id:
-            filters["invoice_id"] = invoice_id
-            
-        csv_content = await CSVExportService.export_invoices_with_payments_csv(db, filters)
-        
-        return StreamingResponse(
-            io.BytesIO(csv_content),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=invoices_with_payments.csv"}
-        )
-    except Exception as e:
-        logger.error(f"Error exporting invoices with payments CSV: {str(e)}")
-        raise HTTPException(status_code=500, detail="Error exporting invoices with payments")
+    return await _export_response(request, "invoices_with_payments", _filters(invoice_id=invoice_id), options)
 
 @router.get("/all/csv")
 async def export_all_data_csv(
-    db: AsyncSession = Depends(get_db),
-    entity: str = Query(..., description="Entity to export: users, pets, reservations, services, employees, invoices, payments")
+    request: Request,
+    entity: str = Query(..., description="Entity to export: users, pets, reservations, services, employees, invoices, payments"),
+    options: ExportOptions = Depends(export_options)
 ):
+    if entity not in TABLE_EXPORTS:
+        raise HTTPException(status_code=400, detail=f"Invalid entity '{entity}'")
+    return await _export_response(request, entity, {}, options)
+
+
+def _job_out(request: Request, job) -> Dict[str, Any]:
+    data = job.as_dict()
+    if job.status is JobStatus.COMPLETED:
+        data["download_url"] = str(request.url_for("download_export_job", job_id=job.job_id))
+    return data
+
+
+def _get_job(job_id: str):
+    job = export_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Export job {job_id} not found")
+    return job
+
+
+@router.post("/jobs", response_model=ExportJobOut, status_code=202)
+async def create_export_job(request: Request, body: ExportJobCreate):
+    """Encola la exportación; el fichero se genera en segundo plano"""
+    spec = FORMATS[body.format]
+    if not spec.available:
+        raise HTTPException(status_code=501, detail=f"format={body.format.value} requires {spec.requires}")
+    if not is_available(body.compress):
+        raise HTTPException(status_code=501, detail=f"compress={body.compress.value} requires zstandard")
     try:
-        export_functions = {
-            "users": CSVExportService.export_users_to_csv,
-            "pets": CSVExportService.export_pets_to_csv,
-            "reservations": CSVExportService.export_reservations_to_csv,
-            "services": CSVExportService.export_services_to_csv,
-            "employees": CSVExportService.export_employees_to_csv,
-            "invoices": CSVExportService.export_invoices_to_csv,
-            "payments": CSVExportService.export_payments_to_csv
-        }
-        
-        if entity not in export_functions:
-            raise HTTPException(status_code=400, detail=f"Invalid entity '{entity}'")
-            
-        csv_content = await export_functions[entity](db)
-        
-        return StreamingResponse(
-            io.BytesIO(csv_content),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={entity}.csv"}
-        )
-    except Exception as e:
-        logger.error(f"Error exporting {entity} CSV: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error exporting {entity}") 
\ No newline at end of file
+        job = export_jobs.submit(body.entity, body.filters, body.format, body.compress)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExportJobLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return _job_out(request, job)
+
+
+@router.get("/jobs/{job_id}", response_model=ExportJobOut)
+async def get_export_job(request: Request, job_id: str):
+    return _job_out(request, _get_job(job_id))
+
+
+@router.get("/jobs/{job_id}/download", name="download_export_job")
+async def download_export_job(job_id: str):
+    """
+    FileResponse atiende las cabeceras Range (descargas reanudables) y usa
+    sendfile cuando el servidor lo soporta, sin copiar el fichero a Python.
+    """
+    job = _get_job(job_id)
+    if job.status is not JobStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Export job {job_id} is {job.status.value}")
+    return FileResponse(job.path, media_type=job.media_type, filename=job.filename)
+
+
+@router.delete("/jobs/{job_id}", status_code=204)
+async def delete_export_job(job_id: str):
+    if not export_jobs.delete(job_id):
+        raise HTTPException(status_code=404, detail=f"Export job {job_id} not found")
+    return Response(status_code=204)
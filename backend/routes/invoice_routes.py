@@ -5,13 +5,15 @@ from typing import List
 from backend.schema.invoice_schema import InvoiceCreate, InvoiceOut, InvoiceUpdate
 from backend.controllers.invoice_controllers import (
     create_invoice_controller,
+    create_invoices_bulk_controller,
     get_all_invoices_controller,
     get_invoices_by_user_controller,
     get_invoice_by_id_controller,
     update_invoice_controller,
     delete_invoice_controller,
 )
-from backend.db.database import get_db
+from backend.db.database import get_db, get_read_db
+from backend.utils.pagination import CursorParams
 from backend.utils.auth_jwt import get_current_user
 from backend.models.enums import UserRole
 
@@ -21,10 +23,15 @@ router = APIRouter()
 async def create_invoice(invoice_data: InvoiceCreate, db: AsyncSession = Depends(get_db)):
     return await create_invoice_controller(invoice_data, db)
 
+@router.post("/bulk", response_model=List[InvoiceOut])
+async def create_invoices_bulk(invoices_data: List[InvoiceCreate], db: AsyncSession = Depends(get_db)):
+    return await create_invoices_bulk_controller(invoices_data, db)
+
 @router.get("/", response_model=List[InvoiceOut])
 async def get_all_invoices(
-    db: AsyncSession = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user),
+    page: CursorParams = Depends()
 ):
     
     from backend.logger.logger import logger
@@ -36,17 +43,17 @@ async def get_all_invoices(
     if user_role in [UserRole.ADMIN, UserRole.EMPLOYEE]:
        
         logger.info("Usuario es Admin/Employee - devolviendo todas las facturas")
-        return await get_all_invoices_controller(db)
+        return page.page(await get_all_invoices_controller(db, limit=page.fetch_limit, after=page.after), "invoice_id")
     else:
       
         user_id = current_user["user_id"]
         logger.info(f"Usuario regular - buscando facturas para user_id: {user_id}")
-        invoices = await get_invoices_by_user_controller(user_id, db)
+        invoices = page.page(await get_invoices_by_user_controller(user_id, db, limit=page.fetch_limit, after=page.after), "invoice_id")
         logger.info(f"Facturas encontradas para usuario {user_id}: {len(invoices)}")
         return invoices
 
 @router.get("/{invoice_id}", response_model=InvoiceOut)
-async def get_invoice_by_id(invoice_id: int, db: AsyncSession = Depends(get_db)):
+async def get_invoice_by_id(invoice_id: int, db: AsyncSession = Depends(get_read_db)):
     invoice = await get_invoice_by_id_controller(invoice_id, db)
     if invoice is None:
         raise HTTPException(status_code=404, detail="Invoice not found")
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from backend.db.database import AsyncSessionLocal
+from backend.db.database import get_db, get_read_db
+from backend.utils.pagination import CursorParams
 from backend.schema.medical_history_schema import (
     MedicalHistoryCreate,
     MedicalHistoryOut,
@@ -8,6 +9,7 @@ from backend.schema.medical_history_schema import (
 )
 from backend.controllers.medical_history_controller import (
     create_medical_history,
+    create_medical_histories_bulk,
     get_all_medical_histories,
     get_medical_histories_by_user,
     get_medical_history_by_id,
@@ -19,37 +21,35 @@ from backend.models.enums import UserRole
 
 router = APIRouter()
 
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
-
 @router.get("/", response_model=list[MedicalHistoryOut])
 async def get_all(
-    db: AsyncSession = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user),
+    page: CursorParams = Depends()
 ):
    
     user_role = UserRole(current_user["role"])
     
     if user_role in [UserRole.ADMIN, UserRole.EMPLOYEE]:
         
-        return await get_all_medical_histories(db)
+        return page.page(await get_all_medical_histories(db, limit=page.fetch_limit, after=page.after), "id")
     else:
    
         user_id = current_user["user_id"]
-        return await get_medical_histories_by_user(db, user_id)
+        return page.page(await get_medical_histories_by_user(db, user_id, limit=page.fetch_limit, after=page.after), "id")
 
 @router.get("/{medical_history_id}", response_model=MedicalHistoryOut)
-async def get_by_id(medical_history_id: int, db: AsyncSession = Depends(get_db)):
+async def get_by_id(medical_history_id: int, db: AsyncSession = Depends(get_read_db)):
     return await get_medical_history_by_id(db, medical_history_id)
 
 @router.post("/", response_model=MedicalHistoryOut)
 async def create(medical_history: MedicalHistoryCreate, db: AsyncSession = Depends(get_db)):
     return await create_medical_history(db, medical_history)
 
+@router.post("/bulk", response_model=list[MedicalHistoryOut])
+async def create_bulk(medical_histories: list[MedicalHistoryCreate], db: AsyncSession = Depends(get_db)):
+    return await create_medical_histories_bulk(db, medical_histories)
+
 @router.put("/{medical_history_id}", response_model=MedicalHistoryOut)
 async def update(medical_history_id: int, updates: MedicalHistoryUpdate, db: AsyncSession = Depends(get_db)):
     return await update_medical_history(db, medical_history_id, updates)
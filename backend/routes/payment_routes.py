@@ -5,12 +5,14 @@ from typing import List
 from backend.schema.payment_schema import PaymentCreate, PaymentOut, PaymentUpdate
 from backend.controllers.payment_controllers import (
     create_payment_controller,
+    create_payments_bulk_controller,
     get_all_payments_controller,
     get_payment_by_id_controller,
     update_payment_controller,
     delete_payment_controller,
 )
-from backend.db.database import get_db
+from backend.db.database import get_db, get_read_db
+from backend.utils.pagination import CursorParams
 
 router = APIRouter()
 
@@ -18,12 +20,16 @@ router = APIRouter()
 async def create_payment(payment_data: PaymentCreate, db: AsyncSession = Depends(get_db)):
     return await create_payment_controller(payment_data, db)
 
+@router.post("/bulk", response_model=List[PaymentOut])
+async def create_payments_bulk(payments_data: List[PaymentCreate], db: AsyncSession = Depends(get_db)):
+    return await create_payments_bulk_controller(payments_data, db)
+
 @router.get("/", response_model=List[PaymentOut])
-async def get_all_payments(db: AsyncSession = Depends(get_db)):
-    return await get_all_payments_controller(db)
+async def get_all_payments(db: AsyncSession = Depends(get_read_db), page: CursorParams = Depends()):
+    return page.page(await get_all_payments_controller(db, limit=page.fetch_limit, after=page.after), "payment_id")
 
 @router.get("/{payment_id}", response_model=PaymentOut)
-async def get_payment_by_id(payment_id: int, db: AsyncSession = Depends(get_db)):
+async def get_payment_by_id(payment_id: int, db: AsyncSession = Depends(get_read_db)):
     payment = await get_payment_by_id_controller(payment_id, db)
     if payment is None:
         raise HTTPException(status_code=404, detail="Payment not found")
@@ -5,13 +5,15 @@ from typing import List
 from backend.schema.pet_schema import PetCreate, PetOut, PetUpdate
 from backend.controllers.pet_controller import (
     create_pet_controller,
+    create_pets_bulk_controller,
     get_all_pets_controller,
     get_pet_by_id_controller,
     get_pets_by_user_controller,
     update_pet_controller,
     delete_pet_controller,
 )
-from backend.db.database import get_db
+from backend.db.database import get_db, get_read_db
+from backend.utils.pagination import CursorParams
 from backend.utils.auth_jwt import get_current_user
 from backend.models.enums import UserRole
 
@@ -25,32 +27,41 @@ async def create_pet(
 ):
     return await create_pet_controller(pet_data, db)
 
-@router.get("/", response_model=List[PetOut])
-async def get_all_pets(
+@router.post("/bulk", response_model=List[PetOut])
+async def create_pets_bulk(
+    pets_data: List[PetCreate],
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
+    return await create_pets_bulk_controller(pets_data, db)
+
+@router.get("/", response_model=List[PetOut])
+async def get_all_pets(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user),
+    page: CursorParams = Depends()
+):
    
     user_role = UserRole(current_user["role"])
     
     if user_role in [UserRole.ADMIN, UserRole.EMPLOYEE]:
         
-        return await get_all_pets_controller(db)
+        return page.page(await get_all_pets_controller(db, limit=page.fetch_limit, after=page.after), "pet_id")
     else:
       
         user_id = current_user["user_id"]
-        return await get_pets_by_user_controller(user_id, db)
+        return page.page(await get_pets_by_user_controller(user_id, db, limit=page.fetch_limit, after=page.after), "pet_id")
 
 @router.get("/{pet_id}", response_model=PetOut)
-async def get_pet_by_id(pet_id: int, db: AsyncSession = Depends(get_db)):
+async def get_pet_by_id(pet_id: int, db: AsyncSession = Depends(get_read_db)):
     pet = await get_pet_by_id_controller(pet_id, db)
     if pet is None:
         raise HTTPException(status_code=404, detail="Pet not found")
     return pet
 
 @router.get("/user/{user_id}", response_model=List[PetOut])
-async def get_pets_by_user(user_id: int, db: AsyncSession = Depends(get_db)):
-    return await get_pets_by_user_controller(user_id, db)
+async def get_pets_by_user(user_id: int, db: AsyncSession = Depends(get_read_db), page: CursorParams = Depends()):
+    return page.page(await get_pets_by_user_controller(user_id, db, limit=page.fetch_limit, after=page.after), "pet_id")
 
 @router.put("/{pet_id}", response_model=PetOut)
 async def update_pet(pet_id: int, pet_data: PetUpdate, db: AsyncSession = Depends(get_db)):
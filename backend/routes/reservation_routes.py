@@ -12,7 +12,8 @@ from backend.controllers.reservation_controller import (
     update_reservation_controller,
     delete_reservation_controller,
 )
-from backend.db.database import get_db
+from backend.db.database import get_db, get_read_db
+from backend.utils.pagination import CursorParams
 from backend.utils.auth_jwt import get_current_user
 from backend.models.enums import UserRole
 
@@ -37,8 +38,9 @@ async def create_reservation(
 
 @router.get("/", response_model=List[ReservationOut])
 async def get_all_reservations(
-    db: AsyncSession = Depends(get_db),
-    current_user: dict = Depends(get_current_user)):
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user),
+    page: CursorParams = Depends()):
     
     from backend.logger.logger import logger
     
@@ -49,29 +51,29 @@ async def get_all_reservations(
     if user_role in [UserRole.ADMIN, UserRole.EMPLOYEE]:
         
         logger.info("Usuario es Admin/Employee - devolviendo todas las reservas")
-        return await get_all_reservations_controller(db)
+        return page.page(await get_all_reservations_controller(db, limit=page.fetch_limit, after=page.after), "reservation_id")
     else:
     
         user_id = current_user["user_id"]
         logger.info(f"Usuario regular - buscando reservas para user_id: {user_id}")
-        reservations = await get_reservations_by_user_controller(user_id, db)
+        reservations = page.page(await get_reservations_by_user_controller(user_id, db, limit=page.fetch_limit, after=page.after), "reservation_id")
         logger.info(f"Reservas encontradas para usuario {user_id}: {len(reservations)}")
         return reservations
 
 @router.get("/{reservation_id}", response_model=ReservationOut)
-async def get_reservation_by_id(reservation_id: int, db: AsyncSession = Depends(get_db)):
+async def get_reservation_by_id(reservation_id: int, db: AsyncSession = Depends(get_read_db)):
     reservation = await get_reservation_by_id_controller(reservation_id, db)
     if reservation is None:
         raise HTTPException(status_code=404, detail="Reservation not found")
     return reservation
 
 @router.get("/user/{user_id}", response_model=List[ReservationOut])
-async def get_reservations_by_user(user_id: int, db: AsyncSession = Depends(get_db)):
-    return await get_reservations_by_user_controller(user_id, db)
+async def get_reservations_by_user(user_id: int, db: AsyncSession = Depends(get_read_db), page: CursorParams = Depends()):
+    return page.page(await get_reservations_by_user_controller(user_id, db, limit=page.fetch_limit, after=page.after), "reservation_id")
 
 @router.get("/service/{service_id}", response_model=List[ReservationOut])
-async def get_reservations_by_service(service_id: int, db: AsyncSession = Depends(get_db)):
-    return await get_reservations_by_service_controller(service_id, db)
+async def get_reservations_by_service(service_id: int, db: AsyncSession = Depends(get_read_db), page: CursorParams = Depends()):
+    return page.page(await get_reservations_by_service_controller(service_id, db, limit=page.fetch_limit, after=page.after), "reservation_id")
 
 @router.put("/{reservation_id}", response_model=ReservationOut)
 async def update_reservation(reservation_id: int, reservation_data: ReservationUpdate, db: AsyncSession = Depends(get_db)):
@@ -11,7 +11,8 @@ from backend.controllers.service_controller import (
     update_service_controller,
     delete_service_controller
 )
-from backend.db.database import get_db
+from backend.db.database import get_db, get_read_db
+from backend.utils.pagination import CursorParams
 from backend.utils.auth_jwt import get_current_user
 from backend.models.enums import UserRole
 
@@ -23,8 +24,9 @@ async def create_service(service_data: ServiceCreate, db: AsyncSession = Depends
 
 @router.get("/", response_model=List[ServiceOut])
 async def get_all_services(
-    db: AsyncSession = Depends(get_db),
-    current_user: dict = Depends(get_current_user)):
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user),
+    page: CursorParams = Depends()):
    
     from backend.logger.logger import logger
     
@@ -35,17 +37,17 @@ async def get_all_services(
     if user_role in [UserRole.ADMIN, UserRole.EMPLOYEE]:
        
         logger.info("Usuario es Admin/Employee - devolviendo todos los servicios")
-        return await get_all_services_controller(db)
+        return page.page(await get_all_services_controller(db, limit=page.fetch_limit, after=page.after), "service_id")
     else:
       
         user_id = current_user["user_id"]
         logger.info(f"Usuario regular - buscando servicios para user_id: {user_id}")
-        services = await get_services_by_user_controller(user_id, db)
+        services = page.page(await get_services_by_user_controller(user_id, db, limit=page.fetch_limit, after=page.after), "service_id")
         logger.info(f"Servicios encontrados para usuario {user_id}: {len(services)}")
         return services
 
 @router.get("/{service_id}", response_model=ServiceOut)
-async def get_service_by_id(service_id: int, db: AsyncSession = Depends(get_db)):
+async def get_service_by_id(service_id: int, db: AsyncSession = Depends(get_read_db)):
     return await get_service_by_id_controller(service_id, db)
 
 @router.put("/{service_id}", response_model=ServiceOut)
@@ -10,7 +10,8 @@ from backend.controllers.user_controllers import (
     update_user_controller,
     delete_user_controller,
 )
-from backend.db.database import get_db
+from backend.db.database import get_db, get_read_db
+from backend.utils.pagination import CursorParams
 
 
 router = APIRouter()
@@ -20,11 +21,11 @@ async def create_user(user_data: UserCreate, db: AsyncSession = Depends(get_db))
     return await create_user_controller(user_data, db)
 
 @router.get("/", response_model=List[UserOut])
-async def get_all_users(db: AsyncSession = Depends(get_db)):
-    return await get_all_users_controller(db)
+async def get_all_users(db: AsyncSession = Depends(get_read_db), page: CursorParams = Depends()):
+    return page.page(await get_all_users_controller(db, limit=page.fetch_limit, after=page.after), "user_id")
 
 @router.get("/{user_id}", response_model=UserOut)
-async def get_user_by_id(user_id: int, db: AsyncSession = Depends(get_db)):
+async def get_user_by_id(user_id: int, db: AsyncSession = Depends(get_read_db)):
     user = await get_user_by_id_controller(user_id, db)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
@@ -44,7 +44,8 @@ class ActivityLogOut(ActivityLogBase):
     }
 
 class PaginatedActivityLogResponse(BaseModel):
-    total: int
+    total: Optional[int] = None
+    total_is_estimate: bool = False
     page: int
     limit: int
     items: List[ActivityLogOut]
@@ -53,6 +54,7 @@ class PaginatedActivityLogResponse(BaseModel):
         "json_schema_extra": {
             "example": {
                 "total": 1,
+                "total_is_estimate": False,
                 "page": 1,
                 "limit": 10,
                 "items": [
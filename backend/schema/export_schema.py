@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+from backend.services.export_compression import Compression
+from backend.services.export_formats import ExportFormat
+
+
+class ExportJobCreate(BaseModel):
+    entity: str
+    filters: Dict[str, Any] = {}
+    format: ExportFormat = ExportFormat.CSV
+    compress: Compression = Compression.NONE
+
+
+class ExportJobOut(BaseModel):
+    job_id: str
+    entity: str
+    filters: Dict[str, Any]
+    format: ExportFormat
+    compress: Compression
+    status: str
+    total_rows: Optional[int] = None
+    rows: int
+    bytes_written: int
+    progress: Optional[float] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    filename: str
+    download_url: Optional[str] = None
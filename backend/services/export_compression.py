@@ -0,0 +1,104 @@
+"""
+Compresión de las exportaciones mientras se envían.
+
+La codificación (Content-Encoding) sale del parámetro compress= o, si no se
+indica, de la cabecera Accept-Encoding. El compresor envuelve al codificador
+del formato, así que cada lote se codifica y se comprime de una vez en el
+pool de export_executor, sin acumular el fichero completo.
+
+zstd es opcional: necesita el paquete zstandard.
+"""
+import enum
+import importlib.util
+import os
+import zlib
+from typing import Dict, Optional
+
+EXPORT_GZIP_LEVEL = int(os.getenv("EXPORT_GZIP_LEVEL", 6))
+EXPORT_ZSTD_LEVEL = int(os.getenv("EXPORT_ZSTD_LEVEL", 3))
+
+
+class Compression(str, enum.Enum):
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
+def is_available(compression: Compression) -> bool:
+    if compression is Compression.ZSTD:
+        return importlib.util.find_spec("zstandard") is not None
+    return True
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """'gzip;q=0.8, zstd' -> {'gzip': 0.8, 'zstd': 1.0}"""
+    encodings = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        encodings[name.strip().lower()] = quality
+    return encodings
+
+
+def negotiate(accept_encoding: Optional[str], compress: Optional[Compression] = None, precompressed: bool = False) -> Compression:
+    """
+    compress= manda sobre Accept-Encoding. Los formatos que ya van comprimidos
+    (Parquet) solo se comprimen si se pide explícitamente.
+    """
+    if compress is not None:
+        return compress
+    if precompressed or not accept_encoding:
+        return Compression.NONE
+    encodings = parse_accept_encoding(accept_encoding)
+    wildcard = encodings.get("*", 0.0)
+    candidates = [
+        (encodings.get(compression.value, wildcard), compression)
+        for compression in (Compression.ZSTD, Compression.GZIP)
+        if is_available(compression)
+    ]
+    quality, best = max(candidates, key=lambda candidate: candidate[0])
+    return best if quality > 0 else Compression.NONE
+
+
+def _compressor(compression: Compression):
+    if compression is Compression.GZIP:
+        return zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    if compression is Compression.ZSTD:
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=EXPORT_ZSTD_LEVEL).compressobj()
+    raise ValueError(f"Compresión no válida: {compression}")
+
+
+class CompressedEncoder:
+    """Envuelve a un codificador y comprime su salida por lotes"""
+    stateless = False
+
+    def __init__(self, encoder, compression: Compression):
+        self.encoder = encoder
+        self.compression = compression
+        self._compressor = _compressor(compression)
+
+    def header(self) -> bytes:
+        return self._compressor.compress(self.encoder.header())
+
+    def encode(self, rows) -> bytes:
+        return self._compressor.compress(self.encoder.encode(rows))
+
+    def close(self) -> bytes:
+        return self._compressor.compress(self.encoder.close()) + self._compressor.flush()
+
+
+def compressed(encoder, compression: Compression):
+    if compression is Compression.NONE:
+        return encoder
+    return CompressedEncoder(encoder, compression)
@@ -0,0 +1,219 @@
+"""
+Columnas y filtros de cada exportación.
+
+Cada exportación es un SELECT de columnas sueltas (no de objetos ORM): las
+filas llegan como tuplas y no pasan por el identity map de la sesión, de
+modo que se pueden leer por lotes sin que la memoria crezca con la tabla.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import Select, select
+
+from backend.models import Employee, Invoice, Payment, Pet, Reservation, Service, User
+
+
+@dataclass(frozen=True)
+class ExportDefinition:
+    name: str
+    columns: Tuple[Tuple[str, Any], ...]
+    filters: Dict[str, Any] = field(default_factory=dict)
+    joins: Optional[Callable[[Select], Select]] = None
+
+    @property
+    def headers(self) -> Tuple[str, ...]:
+        return tuple(header for header, _ in self.columns)
+
+    def query(self, filters: Optional[Dict[str, Any]] = None) -> Select:
+        query = select(*(column.label(header) for header, column in self.columns))
+        if self.joins is not None:
+            query = self.joins(query)
+        for name, value in (filters or {}).items():
+            if name not in self.filters:
+                raise ValueError(f"Filtro no válido para {self.name}: {name}")
+            if value is not None:
+                column = self.filters[name]
+                enum_class = getattr(column.type, "enum_class", None)
+                if enum_class is not None and not isinstance(value, enum_class):
+                    # Los filtros llegan con el valor del enum ("confirmed"), no con su nombre
+                    value = enum_class(value)
+                query = query.where(column == value)
+        # Orden estable por la clave primaria de la primera columna
+        return query.order_by(self.columns[0][1])
+
+
+EXPORTS: Dict[str, ExportDefinition] = {
+    definition.name: definition for definition in (
+        ExportDefinition(
+            "users",
+            (
+                ("user_id", User.user_id),
+                ("first_name", User.first_name),
+                ("last_name", User.last_name),
+                ("email", User.email),
+                ("phone_number", User.phone_number),
+                ("address", User.address),
+                ("role", User.role),
+                ("last_update", User.last_update),
+                ("updated_by", User.updated_by),
+                ("update_date", User.update_date),
+            ),
+            {"user_id": User.user_id, "email": User.email},
+        ),
+        ExportDefinition(
+            "pets",
+            (
+                ("pet_id", Pet.pet_id),
+                ("name", Pet.name),
+                ("species", Pet.species),
+                ("breed", Pet.breed),
+                ("birth_date", Pet.birth_date),
+                ("allergies", Pet.allergies),
+                ("special_needs", Pet.special_needs),
+                ("user_id", Pet.user_id),
+            ),
+            {"pet_id": Pet.pet_id, "user_id": Pet.user_id},
+        ),
+        ExportDefinition(
+            "reservations",
+            (
+                ("reservation_id", Reservation.reservation_id),
+                ("user_id", Reservation.user_id),
+                ("service_id", Reservation.service_id),
+                ("checkin_date", Reservation.checkin_date),
+                ("checkout_date", Reservation.checkout_date),
+                ("status", Reservation.status),
+                ("internal_notes", Reservation.internal_notes),
+                ("created_at", Reservation.created_at),
+            ),
+            {
+                "reservation_id": Reservation.reservation_id,
+                "user_id": Reservation.user_id,
+                "status": Reservation.status,
+            },
+        ),
+        ExportDefinition(
+            "services",
+            (
+                ("service_id", Service.service_id),
+                ("service_type", Service.service_type),
+                ("other_service", Service.other_service),
+                ("lodging", Service.lodging),
+                ("base_price", Service.base_price),
+                ("duration", Service.duration),
+                ("notes", Service.notes),
+                ("created_at", Service.created_at),
+            ),
+            {"service_id": Service.service_id, "service_type": Service.service_type},
+        ),
+        ExportDefinition(
+            "employees",
+            (
+                ("employee_id", Employee.employee_id),
+                ("first_name", Employee.first_name),
+                ("last_name", Employee.last_name),
+                ("specialty", Employee.specialty),
+                ("is_active", Employee.is_active),
+                ("created_at", Employee.created_at),
+                ("updated_at", Employee.updated_at),
+            ),
+            {"employee_id": Employee.employee_id, "specialty": Employee.specialty},
+        ),
+        ExportDefinition(
+            "invoices",
+            (
+                ("invoice_id", Invoice.invoice_id),
+                ("service_id", Invoice.service_id),
+                ("fiscal_number", Invoice.fiscal_number),
+                ("included_services", Invoice.included_services),
+                ("additional_price", Invoice.additional_price),
+                ("discounts", Invoice.discounts),
+                ("vat", Invoice.vat),
+                ("completed", Invoice.completed),
+                ("created_at", Invoice.created_at),
+                ("updated_at", Invoice.updated_at),
+            ),
+            {"invoice_id": Invoice.invoice_id, "service_id": Invoice.service_id},
+        ),
+        ExportDefinition(
+            "payments",
+            (
+                ("payment_id", Payment.payment_id),
+                ("invoice_id", Payment.invoice_id),
+                ("amount", Payment.amount),
+                ("payment_method", Payment.payment_method),
+                ("payment_date", Payment.payment_date),
+                ("payment_status", Payment.payment_status),
+                ("refund_processed", Payment.refund_processed),
+                ("created_at", Payment.created_at),
+                ("updated_at", Payment.updated_at),
+            ),
+            {"payment_id": Payment.payment_id, "invoice_id": Payment.invoice_id},
+        ),
+        ExportDefinition(
+            "users_with_pets",
+            (
+                ("user_id", User.user_id),
+                ("first_name", User.first_name),
+                ("last_name", User.last_name),
+                ("user_email", User.email),
+                ("pet_id", Pet.pet_id),
+                ("pet_name", Pet.name),
+                ("pet_species", Pet.species),
+                ("pet_breed", Pet.breed),
+                ("pet_birth_date", Pet.birth_date),
+            ),
+            {"user_id": User.user_id},
+            lambda query: query.select_from(User).outerjoin(Pet, User.user_id == Pet.user_id),
+        ),
+        ExportDefinition(
+            "reservations_with_details",
+            (
+                ("reservation_id", Reservation.reservation_id),
+                ("user_first_name", User.first_name),
+                ("user_last_name", User.last_name),
+                ("user_email", User.email),
+                ("service_type", Service.service_type),
+                ("base_price", Service.base_price),
+                ("checkin_date", Reservation.checkin_date),
+                ("checkout_date", Reservation.checkout_date),
+                ("status", Reservation.status),
+                ("internal_notes", Reservation.internal_notes),
+            ),
+            {"reservation_id": Reservation.reservation_id, "status": Reservation.status},
+            lambda query: query.select_from(Reservation)
+            .join(User, Reservation.user_id == User.user_id)
+            .join(Service, Reservation.service_id == Service.service_id),
+        ),
+        ExportDefinition(
+            "invoices_with_payments",
+            (
+                ("invoice_id", Invoice.invoice_id),
+                ("fiscal_number", Invoice.fiscal_number),
+                ("service_type", Service.service_type),
+                ("base_price", Service.base_price),
+                ("additional_price", Invoice.additional_price),
+                ("vat", Invoice.vat),
+                ("invoice_completed", Invoice.completed),
+                ("payment_id", Payment.payment_id),
+                ("payment_amount", Payment.amount),
+                ("payment_method", Payment.payment_method),
+                ("payment_status", Payment.payment_status),
+            ),
+            {"invoice_id": Invoice.invoice_id},
+            lambda query: query.select_from(Invoice)
+            .join(Service, Invoice.service_id == Service.service_id)
+            .outerjoin(Payment, Invoice.invoice_id == Payment.invoice_id),
+        ),
+    )
+}
+
+# Entidades simples que admite /export/all/csv
+TABLE_EXPORTS = ("users", "pets", "reservations", "services", "employees", "invoices", "payments")
+
+
+def get_definition(entity: str) -> ExportDefinition:
+    try:
+        return EXPORTS[entity]
+    except KeyError:
+        raise ValueError(f"Entidad no válida: {entity}") from None
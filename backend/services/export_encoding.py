@@ -0,0 +1,142 @@
+"""
+Codificadores de lotes de filas, uno por formato de exportación.
+
+No dependen de la app para poder ejecutarse en un pool de hilos o de
+procesos (se importan en cada proceso hijo). Los codificadores sin estado
+(stateless) se pueden enviar a otro proceso; el de Parquet mantiene el
+ParquetWriter abierto entre lotes y solo puede ir en un hilo.
+"""
+import csv
+import enum
+import io
+import os
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, List, Sequence
+
+import orjson
+
+EXPORT_PARQUET_ROW_GROUP_SIZE = int(os.getenv("EXPORT_PARQUET_ROW_GROUP_SIZE", 50_000))
+
+
+def format_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def encode_csv_rows(rows: Sequence[Sequence[Any]]) -> bytes:
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator="\n")
+    writer.writerows([format_value(value) for value in row] for row in rows)
+    return output.getvalue().encode("utf-8")
+
+
+def _json_default(value: Any) -> Any:
+    # Decimal como texto para no perder precisión, igual que en la caché
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class CSVEncoder:
+    stateless = True
+
+    def __init__(self, headers: Sequence[str]):
+        self.headers = tuple(headers)
+
+    def header(self) -> bytes:
+        return encode_csv_rows([self.headers])
+
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        return encode_csv_rows(rows)
+
+    def close(self) -> bytes:
+        return b""
+
+
+class NDJSONEncoder(CSVEncoder):
+    """Un objeto JSON por línea; orjson codifica fechas y enums de forma nativa"""
+
+    def header(self) -> bytes:
+        return b""
+
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        option = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+        return b"".join(orjson.dumps(dict(zip(self.headers, row)), default=_json_default, option=option) for row in rows)
+
+
+class _ChunkSink:
+    """Fichero de solo escritura cuyo contenido se vacía tras cada row group"""
+
+    def __init__(self):
+        self.closed = False
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ParquetEncoder:
+    """
+    Acumula lotes hasta EXPORT_PARQUET_ROW_GROUP_SIZE filas y escribe cada
+    row group de una vez, por columnas. Los bytes de cada row group se
+    entregan en cuanto se escriben; el footer sale en close().
+    """
+    stateless = False
+
+    def __init__(self, schema, row_group_size: int = EXPORT_PARQUET_ROW_GROUP_SIZE):
+        import pyarrow.parquet as pq
+
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self._pending: List[Sequence[Any]] = []
+        self._sink = _ChunkSink()
+        self._writer = pq.ParquetWriter(self._sink, schema, compression="snappy")
+
+    def header(self) -> bytes:
+        return self._sink.drain()
+
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        self._pending.extend(rows)
+        if len(self._pending) >= self.row_group_size:
+            self._write_row_group()
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        if self._pending:
+            self._write_row_group()
+        self._writer.close()
+        return self._sink.drain()
+
+    def _write_row_group(self) -> None:
+        import pyarrow as pa
+
+        columns = list(zip(*self._pending)) or [() for _ in self.schema]
+        arrays = []
+        for field, values in zip(self.schema, columns):
+            if pa.types.is_string(field.type):
+                values = [value.value if isinstance(value, enum.Enum) else value for value in values]
+            arrays.append(pa.array(values, type=field.type))
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema), row_group_size=len(self._pending))
+        self._pending = []
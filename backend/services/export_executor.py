@@ -0,0 +1,109 @@
+"""
+Pool donde se codifican las exportaciones, fuera del bucle de eventos.
+
+La lectura de la base de datos sigue en el bucle (es I/O); solo el trabajo
+de CPU (formatear y codificar cada lote) va al pool, de modo que una
+exportación grande no congela el resto de peticiones ni los websockets del
+worker. EXPORT_EXECUTOR=process usa procesos en lugar de hilos: evita
+competir por el GIL a cambio de serializar cada lote.
+
+Además se limita a EXPORT_MAX_CONCURRENT el número de exportaciones en
+curso; las siguientes esperan turno antes de abrir su sesión.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from backend.logger.logger import logger
+
+EXPORT_EXECUTOR = os.getenv("EXPORT_EXECUTOR", "thread").lower()
+EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", 2))
+EXPORT_MAX_CONCURRENT = int(os.getenv("EXPORT_MAX_CONCURRENT", 4))
+
+
+class ExportExecutor:
+
+    def __init__(self, kind: str = EXPORT_EXECUTOR, workers: int = EXPORT_WORKERS, max_concurrent: int = EXPORT_MAX_CONCURRENT):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"EXPORT_EXECUTOR no válido: {kind}")
+        self.kind = kind
+        self.workers = workers
+        self.max_concurrent = max_concurrent
+        self.running = 0
+        self.waiting = 0
+        self._executor: Optional[Executor] = None
+        self._threads: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                # spawn: el hijo no hereda el bucle ni las conexiones abiertas del padre
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            else:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="export")
+        return self._executor
+
+    @property
+    def threads(self) -> Executor:
+        """Pool de hilos para los codificadores con estado, que no pueden cambiar de proceso"""
+        if self.kind == "thread":
+            return self.executor
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(self.workers, thread_name_prefix="export")
+        return self._threads
+
+    async def encode(self, encoder, rows: Sequence[Sequence[Any]]) -> bytes:
+        if self.kind == "process" and encoder.stateless:
+            # Las Row de SQLAlchemy arrastran sus metadatos al serializarse
+            return await self._run(self.executor, encoder.encode, [tuple(row) for row in rows])
+        return await self._run(self.threads, encoder.encode, rows)
+
+    async def close(self, encoder) -> bytes:
+        if encoder.stateless:
+            return encoder.close()
+        return await self._run(self.threads, encoder.close)
+
+    async def _run(self, pool: Executor, func: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+
+    @asynccontextmanager
+    async def slot(self, name: str = "export"):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+        if self._slots.locked():
+            logger.info(f"Exportación {name} en espera: {self.running} en curso")
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "max_concurrent": self.max_concurrent,
+            "running": self.running,
+            "waiting": self.waiting,
+        }
+
+    def shutdown(self) -> None:
+        for pool in (self._executor, self._threads):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._threads = None
+
+
+export_executor = ExportExecutor()
@@ -0,0 +1,274 @@
+"""
+Exportaciones en segundo plano.
+
+POST /export/jobs encola la exportación y responde en el acto con el id del
+trabajo; una tarea del proceso escribe el fichero en EXPORT_JOBS_DIR con su
+propia sesión, sin ocupar una petición HTTP mientras dura. El progreso se
+mide en filas sobre el total contado al empezar. El fichero se escribe como
+<id>.part y se renombra al terminar, de modo que solo se sirve completo.
+
+Los trabajos comparten los turnos de export_executor con las exportaciones
+por streaming y se guardan en memoria del proceso: los terminados se borran,
+con su fichero, pasado EXPORT_JOB_TTL (barrido cada EXPORT_JOB_SWEEP_INTERVAL).
+Como el estado no sobrevive a un reinicio, al arrancar se borran los
+ficheros del directorio que no pertenecen a ningún trabajo conocido.
+"""
+import asyncio
+import enum
+import os
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select
+
+from backend.db.database import get_read_sessionmaker, session_scope
+from backend.logger.logger import logger
+from backend.services.csv_export_service import CSVExportService
+from backend.services.export_compression import Compression
+from backend.services.export_definitions import get_definition
+from backend.services.export_executor import export_executor
+from backend.services.export_formats import ExportFormat, get_format
+
+EXPORT_JOBS_DIR = os.getenv("EXPORT_JOBS_DIR", os.path.join(tempfile.gettempdir(), "petland_exports"))
+EXPORT_JOB_TTL = int(os.getenv("EXPORT_JOB_TTL", 24 * 3600))
+EXPORT_JOB_SWEEP_INTERVAL = int(os.getenv("EXPORT_JOB_SWEEP_INTERVAL", 300))
+EXPORT_MAX_JOBS = int(os.getenv("EXPORT_MAX_JOBS", 20))
+
+COMPRESSED_EXTENSIONS = {Compression.GZIP: "gz", Compression.ZSTD: "zst"}
+COMPRESSED_MEDIA_TYPES = {Compression.GZIP: "application/gzip", Compression.ZSTD: "application/zstd"}
+
+
+class ExportJobLimitError(RuntimeError):
+    """Se ha alcanzado EXPORT_MAX_JOBS trabajos en cola o guardados"""
+
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class ExportJob:
+    entity: str
+    filters: Dict[str, Any]
+    export_format: ExportFormat
+    compression: Compression
+    directory: str
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: JobStatus = JobStatus.QUEUED
+    total_rows: Optional[int] = None
+    rows: int = 0
+    bytes_written: int = 0
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=_now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[float] = None
+
+    @property
+    def filename(self) -> str:
+        name = f"{self.entity}.{get_format(self.export_format).extension}"
+        if self.compression in COMPRESSED_EXTENSIONS:
+            name += f".{COMPRESSED_EXTENSIONS[self.compression]}"
+        return name
+
+    @property
+    def media_type(self) -> str:
+        return COMPRESSED_MEDIA_TYPES.get(self.compression, get_format(self.export_format).media_type)
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, f"{self.job_id}.{self.filename}")
+
+    @property
+    def progress(self) -> Optional[float]:
+        if self.status is JobStatus.COMPLETED:
+            return 1.0
+        if not self.total_rows:
+            return None
+        return round(min(self.rows / self.total_rows, 1.0), 4)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.COMPLETED, JobStatus.FAILED)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "entity": self.entity,
+            "filters": self.filters,
+            "format": self.export_format,
+            "compress": self.compression,
+            "status": self.status.value,
+            "total_rows": self.total_rows,
+            "rows": self.rows,
+            "bytes_written": self.bytes_written,
+            "progress": self.progress,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "filename": self.filename,
+        }
+
+
+class ExportJobManager:
+
+    def __init__(self, directory: str = EXPORT_JOBS_DIR, ttl: int = EXPORT_JOB_TTL, max_jobs: int = EXPORT_MAX_JOBS):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self.jobs: Dict[str, ExportJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def submit(
+        self,
+        entity: str,
+        filters: Optional[Dict[str, Any]] = None,
+        export_format: ExportFormat = ExportFormat.CSV,
+        compression: Compression = Compression.NONE,
+    ) -> ExportJob:
+        """
+        Valida la petición y lanza el trabajo; ValueError si no es válida y
+        ExportJobLimitError si ya hay max_jobs trabajos (en curso o con fichero).
+        """
+        filters = filters or {}
+        get_definition(entity).query(filters)
+        self.sweep()
+        if len(self.jobs) >= self.max_jobs:
+            raise ExportJobLimitError(f"Límite de {self.max_jobs} exportaciones alcanzado; borra alguna o espera a que caduque")
+        os.makedirs(self.directory, exist_ok=True)
+        job = ExportJob(entity, filters, ExportFormat(export_format), Compression(compression), self.directory)
+        self.jobs[job.job_id] = job
+        self._tasks[job.job_id] = asyncio.create_task(self._run(job))
+        logger.info(f"Export job {job.job_id} queued: {entity} ({job.filename})")
+        return job
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        return self.jobs.get(job_id)
+
+    async def wait(self, job_id: str) -> ExportJob:
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.shield(task)
+        return self.jobs[job_id]
+
+    async def _run(self, job: ExportJob) -> None:
+        partial = f"{job.path}.part"
+        try:
+            async with export_executor.slot(f"job {job.job_id}"):
+                job.status = JobStatus.RUNNING
+                job.started_at = _now()
+                async with session_scope(await get_read_sessionmaker()) as db:
+                    job.total_rows = await self._count(db, job)
+                    with open(partial, "wb") as output:
+                        async for chunk in CSVExportService.stream(
+                            db, job.entity, job.filters, job.export_format.value,
+                            compression=job.compression, on_rows=lambda rows: self._advance(job, rows),
+                        ):
+                            await asyncio.to_thread(output.write, chunk)
+                            job.bytes_written += len(chunk)
+                os.replace(partial, job.path)
+            job.status = JobStatus.COMPLETED
+            logger.info(f"Export job {job.job_id} completed: {job.rows} rows, {job.bytes_written} bytes")
+        except asyncio.CancelledError:
+            self._fail(job, "cancelled", partial)
+            raise
+        except Exception as e:
+            logger.error(f"Export job {job.job_id} failed: {str(e)}")
+            self._fail(job, str(e), partial)
+        finally:
+            job.finished_at = _now()
+            job.expires_at = time.monotonic() + self.ttl
+            self._tasks.pop(job.job_id, None)
+
+    @staticmethod
+    async def _count(db, job: ExportJob) -> int:
+        query = get_definition(job.entity).query(job.filters).order_by(None)
+        return (await db.execute(select(func.count()).select_from(query.subquery()))).scalar_one()
+
+    @staticmethod
+    def _advance(job: ExportJob, rows: int) -> None:
+        job.rows += rows
+
+    @staticmethod
+    def _fail(job: ExportJob, error: str, partial: str) -> None:
+        job.status = JobStatus.FAILED
+        job.error = error
+        if os.path.exists(partial):
+            os.remove(partial)
+
+    def delete(self, job_id: str) -> bool:
+        job = self.jobs.pop(job_id, None)
+        if job is None:
+            return False
+        task = self._tasks.pop(job_id, None)
+        if task is not None:
+            task.cancel()
+        if os.path.exists(job.path):
+            os.remove(job.path)
+        return True
+
+    def sweep(self) -> List[str]:
+        """Borra los trabajos terminados que han caducado"""
+        now = time.monotonic()
+        expired = [job.job_id for job in self.jobs.values() if job.finished and job.expires_at <= now]
+        for job_id in expired:
+            self.delete(job_id)
+        if expired:
+            logger.debug(f"Export jobs: {len(expired)} trabajos caducados eliminados")
+        return expired
+
+    def remove_orphans(self) -> List[str]:
+        """Borra los ficheros (y .part) del directorio que ningún trabajo referencia"""
+        if not os.path.isdir(self.directory):
+            return []
+        known = set()
+        for job in self.jobs.values():
+            known.update((job.path, f"{job.path}.part"))
+        removed = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.path not in known:
+                os.remove(entry.path)
+                removed.append(entry.name)
+        if removed:
+            logger.info(f"Export jobs: {len(removed)} ficheros huérfanos eliminados de {self.directory}")
+        return removed
+
+    def start_sweeper(self, interval: int = EXPORT_JOB_SWEEP_INTERVAL) -> asyncio.Task:
+        if self._sweeper is None or self._sweeper.done():
+            self.remove_orphans()
+            self._sweeper = asyncio.create_task(self._sweep_loop(interval))
+        return self._sweeper
+
+    def stop_sweeper(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+
+    async def _sweep_loop(self, interval: int) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.sweep()
+            except OSError as e:
+                logger.error(f"Export jobs: error en el barrido: {str(e)}")
+
+    def stop(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+
+export_jobs = ExportJobManager()
@@ -4,10 +4,144 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
 from backend.main import app  
 
 @pytest.fixture(scope="module")
 def client():
     with TestClient(app) as c:
-        yield c
\ No newline at end of file
+        yield c
+
+@pytest.fixture
+def assert_max_queries():
+    """Falla el test si el bloque ejecuta más sentencias SQL de las esperadas"""
+    from contextlib import contextmanager
+    from backend.db.query_stats import count_queries
+
+    @contextmanager
+    def _assert_max_queries(max_queries):
+        with count_queries() as stats:
+            yield stats
+        if stats.count > max_queries:
+            statements = "\n".join(f"{n}x {sql}" for sql, n in stats.statements.items())
+            pytest.fail(f"Expected at most {max_queries} queries, got {stats.count}:\n{statements}")
+
+    return _assert_max_queries
+
+
+class InMemoryRedis:
+    """Subconjunto de redis.asyncio que usa CacheService"""
+
+    def __init__(self):
+        self.data = {}
+        self.published = []
+
+    async def get(self, key):
+        value = self.data.get(key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def mget(self, keys):
+        return [await self.get(key) for key in keys]
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(k, None) is not None for k in keys)
+
+    def pipeline(self, transaction=True):
+        return _InMemoryPipeline(self)
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+    async def scan_iter(self, match=None, count=None):
+        import fnmatch
+        for key in list(self.data):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+    async def unlink(self, *keys):
+        return sum(self.data.pop(k, None) is not None for k in keys)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 1
+
+    async def keys(self, pattern):
+        raise AssertionError("KEYS must not be used")
+
+
+class _InMemoryPipeline:
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def setex(self, key, ttl, value):
+        self.commands.append((key, value))
+        return self
+
+    async def execute(self):
+        for key, value in self.commands:
+            self.redis.data[key] = value
+        self.commands = []
+
+
+@pytest.fixture
+def cache_backend(monkeypatch):
+    """CacheService sobre un Redis en memoria, instalado en los decoradores"""
+    from backend.utils import cache_decorators, row_cache
+    from backend.utils.cache import CacheService
+    from backend.utils.tiered_cache import LocalCache
+
+    service = CacheService()
+    service.redis = InMemoryRedis()
+    monkeypatch.setattr(cache_decorators, "cache_service", service)
+    monkeypatch.setattr(row_cache, "cache_service", service)
+    monkeypatch.setattr(cache_decorators, "local_cache", LocalCache())
+    return service
+
+
+@pytest_asyncio.fixture
+async def export_sessions(tmp_path):
+    """sessionmaker sobre un SQLite temporal con 2 usuarios y 5 mascotas"""
+    from datetime import date
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from backend.models import Base, Pet, User
+    from backend.models.enums import PetTypeEnum
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'export.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        for user_id in (1, 2):
+            session.add(User(
+                user_id=user_id, first_name=f"User{user_id}", last_name="Test", phone_number=600000000 + user_id,
+                email=f"user{user_id}@petland.test", address="Calle 1, 2º", updated_by="test",
+                update_date=date(2024, 1, 1), hashed_password="x",
+            ))
+        for pet_id in range(1, 6):
+            session.add(Pet(
+                pet_id=pet_id, name=f"Pet{pet_id}", species=PetTypeEnum.FELINO, breed="Común",
+                birth_date=date(2020, 1, pet_id), user_id=1,
+            ))
+        await session.commit()
+    yield factory
+    await engine.dispose()
@@ -0,0 +1,114 @@
+import pytest
+import pytest_asyncio
+from datetime import date
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.main import app
+from backend.db import bulk
+from backend.db.database import get_db
+from backend.models import ActivityLog, Base, Employee, Pet, User
+from backend.models.enums import ActivityTypeEnum, EmployeeSpecialtyEnum, PetTypeEnum
+
+
+@pytest_asyncio.fixture
+async def sessions(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'bulk.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as session:
+        session.add(User(
+            user_id=1, first_name="Ana", last_name="López", phone_number=600000001,
+            email="ana@petland.test", address="Calle 1", updated_by="test",
+            update_date=date.today(), hashed_password="x",
+        ))
+        session.add(Pet(pet_id=1, name="Luna", species=PetTypeEnum.CANINO, breed="Mestizo", birth_date=date(2020, 1, 1), user_id=1))
+        session.add(Employee(employee_id=1, first_name="Eva", last_name="Ruiz", specialty=list(EmployeeSpecialtyEnum)[0]))
+        await session.commit()
+    yield sessions
+    await engine.dispose()
+
+
+@pytest.fixture
+def client(sessions):
+    async def override():
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.clear()
+
+
+def activity(pet_id=1, employee_id=1, n=1):
+    return {
+        "pet_id": pet_id,
+        "employee_id": employee_id,
+        "activity_type": list(ActivityTypeEnum)[0].value,
+        "description": f"Actividad {n}",
+        "start_time": "2025-07-20T08:30:00Z",
+    }
+
+
+async def count_activities(sessions):
+    async with sessions() as session:
+        return (await session.execute(select(func.count()).select_from(ActivityLog))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_uses_two_statements(client, sessions, assert_max_queries):
+    with assert_max_queries(2):
+        response = client.post("/activitylogs/bulk", json=[activity(n=i) for i in range(5)])
+    assert response.status_code == 200
+    body = response.json()
+    assert [a["description"] for a in body] == [f"Actividad {i}" for i in range(5)]
+    assert len({a["activity_id"] for a in body}) == 5
+    assert await count_activities(sessions) == 5
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_missing_foreign_keys(client, sessions):
+    response = client.post("/activitylogs/bulk", json=[activity(), activity(pet_id=7), activity(employee_id=9)])
+    assert response.status_code == 404
+    assert "pet_id not found: [7]" in response.json()["error"]
+    assert "employee_id not found: [9]" in response.json()["error"]
+    assert await count_activities(sessions) == 0
+
+
+def test_bulk_create_rejects_empty_and_oversized_batches(client, monkeypatch):
+    assert client.post("/activitylogs/bulk", json=[]).status_code == 400
+    monkeypatch.setattr(bulk, "BULK_MAX_ITEMS", 2)
+    assert client.post("/activitylogs/bulk", json=[activity(n=i) for i in range(3)]).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_hides_database_errors(sessions, monkeypatch):
+    from pydantic import BaseModel
+
+    from backend.exceptions.custom_exceptions import BadRequestException
+
+    class EmployeeIn(BaseModel):
+        employee_id: int
+        first_name: str
+        last_name: str
+        specialty: EmployeeSpecialtyEnum
+
+    duplicate = EmployeeIn(employee_id=1, first_name="Eva", last_name="Ruiz", specialty=list(EmployeeSpecialtyEnum)[0])
+    async with sessions() as session:
+        with pytest.raises(BadRequestException) as exc_info:
+            await bulk.bulk_insert(session, Employee, [duplicate])
+    assert exc_info.value.status_code == 400
+    assert "constraint" in exc_info.value.detail
+    assert "UNIQUE" not in exc_info.value.detail and "INSERT" not in exc_info.value.detail
+
+    async with sessions() as session:
+        async def broken(*args, **kwargs):
+            raise RuntimeError("connection lost")
+
+        monkeypatch.setattr(session, "execute", broken)
+        with pytest.raises(RuntimeError):
+            await bulk.bulk_insert(session, Employee, [duplicate])
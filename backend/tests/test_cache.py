@@ -89,7 +89,7 @@ class TestCacheDecorators:
     @pytest.mark.asyncio
     async def test_invalidate_cache_decorator(self):
         with patch('backend.utils.cache_decorators.cache_service') as mock_cache:
-            mock_cache.delete_pattern.return_value = True
+            mock_cache.bump_generation.return_value = True
             
             @invalidate_cache("users")
             async def test_function():
@@ -97,7 +97,7 @@ class TestCacheDecorators:
             
             result = await test_function()
             
-            mock_cache.delete_pattern.assert_called_once_with("users:*")
+            mock_cache.bump_generation.assert_called_once_with("users")
             assert result == {"success": True}
 
 class TestCacheIntegration:
@@ -0,0 +1,64 @@
+import pytest
+
+from backend.utils.cache_decorators import cache_response, invalidate_cache
+
+
+@pytest.fixture
+def service(cache_backend):
+    return cache_backend
+
+
+@pytest.mark.asyncio
+async def test_invalidation_is_a_generation_bump(service):
+    calls = []
+
+    @cache_response("items:all", ttl=60)
+    async def list_items(limit=None):
+        calls.append(limit)
+        return [len(calls)]
+
+    @invalidate_cache("items")
+    async def create_item():
+        return True
+
+    assert await list_items(limit=10) == [1]
+    assert await list_items(limit=10) == [1]
+    assert "items:g0:all:limit=10" in service.redis.data
+
+    await create_item()
+    assert service.redis.data["cache_generation:items"] == "1"
+    assert await list_items(limit=10) == [2]
+    assert "items:g1:all:limit=10" in service.redis.data
+    assert calls == [10, 10]
+
+
+@pytest.mark.asyncio
+async def test_delete_pattern_scans_instead_of_keys(service):
+    await service.set("a:1", 1)
+    await service.set("a:2", 2)
+    await service.set("b:1", 3)
+    assert await service.delete_pattern("a:*") is True
+    assert set(service.redis.data) == {"b:1"}
+
+
+@pytest.mark.asyncio
+async def test_simple_cache_delete_unlinks_in_batches(service, monkeypatch):
+    from backend.utils import simple_cache
+
+    monkeypatch.setattr(simple_cache, "SCAN_BATCH_SIZE", 2)
+    redis = service.redis
+    redis.data.update({f"a:{i}": "1" for i in range(5)}, **{"b:1": "1"})
+    batches = []
+    unlink = redis.unlink
+
+    async def recording_unlink(*keys):
+        batches.append(len(keys))
+        return await unlink(*keys)
+
+    monkeypatch.setattr(redis, "unlink", recording_unlink)
+    cache = simple_cache.SimpleCache()
+    cache.redis_client = redis
+
+    assert await cache.delete("a:*") is True
+    assert batches == [2, 2, 1]
+    assert set(redis.data) == {"b:1"}
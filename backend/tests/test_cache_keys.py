@@ -0,0 +1,43 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.utils.cache_keys import UncacheableArgument, build_key
+
+
+async def get_pet(pet_id: int, db: AsyncSession, include_owner: bool = False):
+    return None
+
+
+async def search(filters: dict, limit: int = 10):
+    return None
+
+
+def test_positional_and_keyword_arguments_share_key():
+    db = AsyncMock()
+    by_position = build_key("pets:by_id", get_pet, (1, db), {})
+    by_name = build_key("pets:by_id", get_pet, (), {"pet_id": 1, "db": db})
+    assert by_position == by_name == "pets:by_id:include_owner=false,pet_id=1"
+
+
+def test_distinct_arguments_get_distinct_keys():
+    db = AsyncMock()
+    assert build_key("pets:by_id", get_pet, (1, db), {}) != build_key("pets:by_id", get_pet, (2, db), {})
+    # Un id en texto no debe coincidir con el mismo id numérico
+    assert build_key("pets:by_id", get_pet, ("1", db), {}) != build_key("pets:by_id", get_pet, (1, db), {})
+
+
+def test_complex_arguments_hash_stably():
+    first = build_key("search", search, ({"b": 2, "a": [1, 2]},), {})
+    second = build_key("search", search, ({"a": [1, 2], "b": 2},), {})
+    assert first == second
+    assert first == "search:h" + first.split(":h")[1]
+    assert len(first.split(":h")[1]) == 32
+
+
+def test_key_params_whitelist_and_uncacheable_argument():
+    db = AsyncMock()
+    assert build_key("pets:by_id", get_pet, (1, db), {"include_owner": True}, key_params=["pet_id"]) == "pets:by_id:pet_id=1"
+    with pytest.raises(UncacheableArgument):
+        build_key("search", search, ({"when": object()},), {})
@@ -0,0 +1,57 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.utils.auth_jwt import get_current_user
+from backend.utils.cache_metrics import CacheMetrics, cache_metrics, prefix_of
+
+
+def test_prefix_ignores_generation_and_arguments():
+    assert prefix_of("pets:g3:all:limit=10") == "pets:all"
+    assert prefix_of("pets:g4:all") == "pets:all"
+    assert prefix_of("pets:g0:by_id:h" + "a" * 32) == "pets:by_id"
+    assert prefix_of("row:pet:7") == "row:pet"
+    assert prefix_of("users:g1:pet_id=3") == "users"
+
+
+@pytest.mark.asyncio
+async def test_redis_operations_are_counted(cache_backend, monkeypatch):
+    metrics = CacheMetrics(track_hot_keys=True)
+    monkeypatch.setattr("backend.utils.cache.cache_metrics", metrics)
+
+    await cache_backend.get("pets:g0:all")
+    await cache_backend.set("pets:g0:all", [1, 2])
+    await cache_backend.get("pets:g0:all")
+    await cache_backend.get_many(["row:pet:1", "row:pet:2"])
+
+    backends = metrics.snapshot()["backends"]["redis"]
+    assert backends["pets:all"]["hits"] == 1
+    assert backends["pets:all"]["misses"] == 1
+    assert backends["pets:all"]["sets"] == 1
+    assert backends["pets:all"]["bytes_written"] == len(b"[1,2]")
+    assert backends["pets:all"]["calls"] == 3
+    assert backends["row:pet"]["misses"] == 2
+    assert metrics.hot_keys(1) == [{"key": "redis:pets:g0:all", "lookups": 2}]
+
+    cache_backend.redis = None
+    await cache_backend.get("pets:g0:all")
+    assert metrics.snapshot()["backends"]["redis"]["pets:all"]["bypassed"] == 1
+
+
+def test_stats_endpoint_is_admin_only():
+    with TestClient(app) as client:
+        app.dependency_overrides[get_current_user] = lambda: {"user_id": 1, "email": "u@petland.test", "role": "user"}
+        assert client.get("/admin/cache/stats").status_code == 403
+
+        app.dependency_overrides[get_current_user] = lambda: {"user_id": 1, "email": "a@petland.test", "role": "admin"}
+        try:
+            assert client.put("/admin/cache/stats/hot-keys", params={"enabled": True}).json() == {"hot_keys_tracking": True}
+            cache_metrics.record("memory", "services:all", hit=True)
+            body = client.get("/admin/cache/stats", params={"top": 5}).json()
+            assert body["backends"]["memory"]["services:all"]["hits"] >= 1
+            assert {"key": "memory:services:all", "lookups": 1} in body["hot_keys"]
+            assert "circuit_open" in body["redis"]
+            assert client.delete("/admin/cache/stats").status_code == 200
+        finally:
+            cache_metrics.track_hot_keys = False
+            app.dependency_overrides.clear()
@@ -0,0 +1,88 @@
+import pytest
+import pytest_asyncio
+from datetime import date
+from decimal import Decimal
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.controllers.pet_controller import (
+    get_all_pets_controller,
+    get_pet_by_id_controller,
+    update_pet_controller,
+)
+from backend.db.query_stats import count_queries
+from backend.utils.cache_decorators import cache_response
+from sqlalchemy import select
+
+from backend.models import Base, Pet, User
+from backend.models.enums import PetTypeEnum
+from backend.schema.pet_schema import PetOut, PetUpdate
+from backend.utils.cache_serializer import dumps, loads
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'cache.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as session:
+        session.add(User(
+            user_id=1, first_name="Ana", last_name="López", phone_number=600000001,
+            email="ana@petland.test", address="Calle 1", updated_by="test",
+            update_date=date.today(), hashed_password="x",
+        ))
+        session.add_all([
+            Pet(pet_id=1, name="Luna", species=PetTypeEnum.CANINO, breed="Mestizo", birth_date=date(2020, 1, 1), user_id=1),
+            Pet(pet_id=2, name="Sol", species=PetTypeEnum.FELINO, breed="Siamés", birth_date=date(2021, 1, 1), user_id=1),
+        ])
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+def test_plain_values_roundtrip():
+    assert loads(dumps({"total": Decimal("10.50"), "ids": [1, 2]})) == {"total": "10.50", "ids": [1, 2]}
+
+
+@pytest.mark.asyncio
+async def test_orm_result_is_cached_as_schema(db, cache_backend):
+    first = await get_pet_by_id_controller(1, db)
+    with count_queries() as stats:
+        second = await get_pet_by_id_controller(1, db)
+
+    assert stats.count == 0
+    assert isinstance(second, PetOut)
+    assert second.name == first.name == "Luna"
+
+
+@pytest.mark.asyncio
+async def test_positional_arguments_get_their_own_key(db, cache_backend):
+    assert (await get_pet_by_id_controller(1, db)).name == "Luna"
+    assert (await get_pet_by_id_controller(2, db)).name == "Sol"
+
+
+@pytest.mark.asyncio
+async def test_list_hit_and_invalidation(db, cache_backend):
+    await get_all_pets_controller(db, limit=10)
+    with count_queries() as stats:
+        cached = await get_all_pets_controller(db, limit=10)
+    assert stats.count == 0
+    assert [p.name for p in cached] == ["Luna", "Sol"]
+
+    await update_pet_controller(1, PetUpdate(name="Nube"), db)
+    refreshed = await get_all_pets_controller(db, limit=10)
+    assert [p.name for p in refreshed] == ["Nube", "Sol"]
+
+
+@pytest.mark.asyncio
+async def test_miss_and_hit_return_the_same_schema_type(db, cache_backend):
+    @cache_response("schema_pets:all", ttl=60, schema=PetOut)
+    async def list_pets(db: AsyncSession):
+        return (await db.execute(select(Pet).order_by(Pet.pet_id))).scalars().all()
+
+    miss = await list_pets(db)
+    hit = await list_pets(db)
+    for result in (miss, hit):
+        assert all(isinstance(p, PetOut) for p in result)
+        assert [p.name for p in result] == ["Luna", "Sol"]
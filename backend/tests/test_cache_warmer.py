@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.utils import cache as cache_module
+from backend.utils import cache_warmer as warmer_module
+from backend.utils.cache_decorators import cache_response
+from backend.utils.cache_metrics import CacheMetrics
+from backend.utils.cache_warmer import CacheWarmer
+
+
+@pytest.fixture
+def loader(cache_backend, monkeypatch):
+    metrics = CacheMetrics()
+    monkeypatch.setattr(cache_module, "cache_metrics", metrics)
+    monkeypatch.setattr(warmer_module, "cache_metrics", metrics)
+    monkeypatch.setattr(warmer_module, "cache_service", cache_backend)
+    calls = []
+
+    @cache_response("items:all", ttl=100)
+    async def list_items(db: AsyncSession, limit=None, after=None):
+        calls.append(limit)
+        return [len(calls)]
+
+    list_items.calls = calls
+    return list_items
+
+
+def _expire_lock(cache_backend):
+    # Simula que el cerrojo de la ronda anterior ha caducado
+    cache_backend.redis.data.pop("lock:warm:items:all", None)
+
+
+@pytest.mark.asyncio
+async def test_startup_warms_the_key_requests_use(loader, cache_backend):
+    warmer = CacheWarmer(keys=["items:all", "other:all"])
+    warmer.register(loader, limit=101, after=None)
+    await warmer.run_due(force=True)
+
+    assert loader.calls == [101]
+    # Misma clave que la primera página pedida por una ruta: acierto directo
+    assert await loader(None, limit=101, after=None) == [1]
+    assert loader.calls == [101]
+
+
+@pytest.mark.asyncio
+async def test_only_popular_keys_are_refreshed_ahead(loader, cache_backend):
+    warmer = CacheWarmer(keys=["items:all"])
+    warmer.register(loader, limit=101, after=None)
+    target = warmer.targets["items:all"]
+    await warmer.run_due(force=True)
+
+    _expire_lock(cache_backend)
+    target.next_run = 0
+    await warmer.run_due()
+    assert len(loader.calls) == 1  # nadie la ha consultado
+
+    await loader(None, limit=101, after=None)
+    _expire_lock(cache_backend)
+    target.next_run = 0
+    await warmer.run_due()
+    assert len(loader.calls) == 2
+    assert target.next_run > 0
+
+
+@pytest.mark.asyncio
+async def test_lock_keeps_other_workers_from_refreshing(loader, cache_backend):
+    first, second = CacheWarmer(keys=["items:all"]), CacheWarmer(keys=["items:all"])
+    for warmer in (first, second):
+        warmer.register(loader, limit=101, after=None)
+        await warmer.run_due(force=True)
+    assert len(loader.calls) == 1
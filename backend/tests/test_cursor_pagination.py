@@ -0,0 +1,110 @@
+import base64
+import json
+
+import pytest
+import pytest_asyncio
+from datetime import date
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.main import app
+from backend.db.database import get_read_db
+from backend.db.statements import list_by
+from backend.models import Base, Employee, Pet, User
+from backend.models.enums import EmployeeSpecialtyEnum, PetTypeEnum
+from backend.utils.pagination import (
+    PAGINATION_DEFAULT_LIMIT,
+    PAGINATION_MAX_LIMIT,
+    decode_cursor,
+    encode_cursor,
+    first_page_params,
+)
+
+
+@pytest_asyncio.fixture
+async def sessions(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'cursor.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as session:
+        session.add_all([
+            Employee(employee_id=i, first_name=f"Empleado {i}", last_name="Test", specialty=list(EmployeeSpecialtyEnum)[0])
+            for i in range(1, 6)
+        ])
+        session.add(User(
+            user_id=1, first_name="Ana", last_name="López", phone_number=600000001,
+            email="ana@petland.test", address="Calle 1", updated_by="test",
+            update_date=date.today(), hashed_password="x",
+        ))
+        session.add_all([
+            Pet(pet_id=i, name=f"Pet {i}", species=PetTypeEnum.CANINO, breed="Mestizo", birth_date=date(2020, 1, 1), user_id=1)
+            for i in range(1, 6)
+        ])
+        await session.commit()
+    yield sessions
+    await engine.dispose()
+
+
+@pytest.fixture
+def client(sessions):
+    async def override():
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_read_db] = override
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.clear()
+
+
+def test_cursor_roundtrip():
+    assert decode_cursor(encode_cursor(42)) == 42
+
+
+def test_walks_every_page_once(client):
+    seen = []
+    response = client.get("/employees/", params={"limit": 2})
+    while True:
+        assert response.status_code == 200
+        seen += [e["employee_id"] for e in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        assert 'rel="next"' in response.headers["Link"]
+        response = client.get("/employees/", params={"limit": 2, "after": cursor})
+    assert seen == [1, 2, 3, 4, 5]
+
+
+def test_without_limit_the_default_page_size_applies(client):
+    response = client.get("/employees/")
+    assert response.status_code == 200
+    assert [e["employee_id"] for e in response.json()] == [1, 2, 3, 4, 5]
+    assert "X-Next-Cursor" not in response.headers
+
+    limit = next(p for p in app.openapi()["paths"]["/employees/"]["get"]["parameters"] if p["name"] == "limit")
+    assert limit["schema"]["default"] == PAGINATION_DEFAULT_LIMIT
+    assert first_page_params() == {"limit": PAGINATION_DEFAULT_LIMIT + 1, "after": None}
+    assert client.get("/employees/", params={"limit": PAGINATION_MAX_LIMIT + 1}).status_code == 422
+
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get("/employees/", params={"after": "not-a-cursor!"})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("value", [{"a": 1}, [1], True, 1.5, "3"])
+def test_cursor_of_the_wrong_type_is_rejected(client, value):
+    cursor = base64.urlsafe_b64encode(json.dumps({"after": value}).encode()).decode()
+    response = client.get("/employees/", params={"limit": 2, "after": cursor})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_by_pages_on_primary_key(sessions):
+    async with sessions() as db:
+        first = await list_by(db, Pet, "user_id", 1, limit=2)
+        rest = await list_by(db, Pet, "user_id", 1, limit=10, after=first[-1].pet_id)
+    assert [p.pet_id for p in first] == [1, 2]
+    assert [p.pet_id for p in rest] == [3, 4, 5]
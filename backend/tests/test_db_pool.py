@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.db.pool_stats import InstrumentedAsyncQueuePool, PoolStats, describe_pool
+from backend.db.database import engine_options
+
+
+def test_pool_stats_snapshot():
+    stats = PoolStats(slow_checkout_ms=50)
+    stats.record_checkout(0.010)
+    stats.record_checkout(0.100)
+    stats.record_timeout(0.200)
+
+    snapshot = stats.snapshot()
+    assert snapshot["checkouts"] == 2
+    assert snapshot["timeouts"] == 1
+    assert snapshot["slow_checkouts"] == 1
+    assert snapshot["max_wait_ms"] == 200.0
+
+
+def test_engine_options_for_postgres():
+    options = engine_options("postgresql+asyncpg://user:pw@localhost/petland")
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert options["echo"] is False
+    assert "pool_size" in options and "max_overflow" in options
+
+
+def test_engine_options_for_sqlite():
+    options = engine_options("sqlite+aiosqlite:///./test.db")
+    assert "poolclass" not in options
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_counts_checkouts_and_timeouts(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            status = describe_pool(engine.pool)
+            assert status["checkedout"] == 1
+
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+
+        status = describe_pool(engine.pool)
+        assert status["checkouts"] == 1
+        assert status["timeouts"] == 1
+        assert status["checkedout"] == 0
+    finally:
+        await engine.dispose()
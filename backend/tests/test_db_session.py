@@ -0,0 +1,58 @@
+import pytest
+import pytest_asyncio
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.db import database
+from backend.db.pool_stats import InstrumentedAsyncQueuePool
+
+
+@pytest_asyncio.fixture
+async def instrumented_sessions(monkeypatch, tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'session.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+    )
+    sessions = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(database, "AsyncSessionLocal", sessions)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_unused_session_does_not_check_out(instrumented_sessions):
+    dependency = database.get_db()
+    session = await dependency.__anext__()
+    assert isinstance(session, AsyncSession)
+    await dependency.aclose()
+
+    assert instrumented_sessions.pool.stats.checkouts == 0
+
+
+@pytest.mark.asyncio
+async def test_first_statement_checks_out_and_close_returns_it(instrumented_sessions):
+    dependency = database.get_db()
+    session = await dependency.__anext__()
+    await session.execute(text("SELECT 1"))
+    assert instrumented_sessions.pool.checkedout() == 1
+    await dependency.aclose()
+
+    assert instrumented_sessions.pool.stats.checkouts == 1
+    assert instrumented_sessions.pool.checkedout() == 0
+
+
+def test_nested_dependencies_share_one_session(instrumented_sessions):
+    app = FastAPI()
+
+    async def nested(db: AsyncSession = Depends(database.get_db)):
+        return db
+
+    @app.get("/")
+    async def endpoint(db: AsyncSession = Depends(database.get_db), other=Depends(nested)):
+        return {"same": db is other}
+
+    with TestClient(app) as client:
+        assert client.get("/").json() == {"same": True}
@@ -0,0 +1,48 @@
+import gzip
+import zlib
+
+from backend.services.export_compression import (
+    CompressedEncoder,
+    Compression,
+    is_available,
+    negotiate,
+    parse_accept_encoding,
+)
+from backend.services.export_encoding import CSVEncoder
+
+
+def test_accept_encoding_is_parsed_with_qualities():
+    assert parse_accept_encoding("gzip;q=0.5, br, zstd;q=0") == {"gzip": 0.5, "br": 1.0, "zstd": 0.0}
+    assert parse_accept_encoding("") == {}
+
+
+def test_negotiation_prefers_explicit_parameter_and_skips_parquet():
+    assert negotiate("gzip, deflate", None) is Compression.GZIP
+    assert negotiate("identity", None) is Compression.NONE
+    assert negotiate(None, None) is Compression.NONE
+    assert negotiate("gzip;q=0", None) is Compression.NONE
+    assert negotiate("gzip", Compression.NONE) is Compression.NONE
+    assert negotiate(None, Compression.GZIP) is Compression.GZIP
+    assert negotiate("gzip", None, precompressed=True) is Compression.NONE
+    expected = Compression.ZSTD if is_available(Compression.ZSTD) else Compression.GZIP
+    assert negotiate("gzip, zstd", None) is expected
+
+
+def test_gzip_output_is_produced_batch_by_batch():
+    encoder = CompressedEncoder(CSVEncoder(["id", "name"]), Compression.GZIP)
+    chunks = [encoder.header()]
+    for start in range(0, 20000, 1000):
+        chunks.append(encoder.encode([(i, f"name-{i}") for i in range(start, start + 1000)]))
+    chunks.append(encoder.close())
+
+    # El compresor entrega datos antes del final: no se guarda el fichero entero
+    assert sum(1 for chunk in chunks[:-1] if chunk) > 1
+    content = gzip.decompress(b"".join(chunks)).decode()
+    lines = content.splitlines()
+    assert lines[0] == "id,name"
+    assert lines[-1] == "19999,name-19999"
+    assert len(lines) == 20001
+
+    # Lo recibido antes del cierre ya se puede descomprimir
+    partial = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(b"".join(chunks[:-1]))
+    assert partial.startswith(b"id,name\n0,name-0\n")
@@ -0,0 +1,51 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.services.export_encoding import CSVEncoder
+from backend.services.export_executor import ExportExecutor
+
+
+class ThreadNameEncoder(CSVEncoder):
+
+    def encode(self, rows):
+        return threading.current_thread().name.encode()
+
+
+@pytest.mark.asyncio
+async def test_encoding_runs_off_the_event_loop():
+    executor = ExportExecutor("thread", workers=1)
+    try:
+        assert (await executor.encode(ThreadNameEncoder(["id"]), [(1,)])).startswith(b"export")
+        assert await executor.encode(CSVEncoder(["id", "name", "notes"]), [(1, "a,b", None)]) == b'1,"a,b",\n'
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_slots_limit_concurrent_exports():
+    executor = ExportExecutor("thread", workers=1, max_concurrent=2)
+    release = asyncio.Event()
+    peak = 0
+
+    async def export():
+        nonlocal peak
+        async with executor.slot():
+            peak = max(peak, executor.running)
+            await release.wait()
+
+    tasks = [asyncio.create_task(export()) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert executor.stats()["running"] == 2
+    assert executor.stats()["waiting"] == 1
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert peak == 2
+    assert executor.running == 0
+
+
+def test_unknown_executor_kind_is_rejected():
+    with pytest.raises(ValueError):
+        ExportExecutor("fibers")
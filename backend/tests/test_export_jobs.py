@@ -0,0 +1,111 @@
+import asyncio
+import gzip
+import os
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routes import export_routes
+from backend.services import export_jobs as export_jobs_module
+from backend.services.export_compression import Compression
+from backend.services.export_jobs import ExportJobManager, JobStatus
+
+
+@pytest.fixture
+def jobs(export_sessions, tmp_path, monkeypatch):
+    async def read_sessionmaker(request=None):
+        return export_sessions
+
+    monkeypatch.setattr(export_jobs_module, "get_read_sessionmaker", read_sessionmaker)
+    return ExportJobManager(directory=str(tmp_path / "jobs"), ttl=60)
+
+
+@pytest.mark.asyncio
+async def test_job_writes_file_and_reports_progress(jobs):
+    job = jobs.submit("pets", {"user_id": 1}, compression=Compression.GZIP)
+    assert job.status is JobStatus.QUEUED
+
+    job = await jobs.wait(job.job_id)
+    assert job.status is JobStatus.COMPLETED, job.error
+    assert (job.total_rows, job.rows, job.progress) == (5, 5, 1.0)
+    assert job.filename == "pets.csv.gz"
+    with open(job.path, "rb") as f:
+        assert len(gzip.decompress(f.read()).splitlines()) == 5 + 1
+
+    with pytest.raises(ValueError):
+        jobs.submit("pets", {"owner": 1})
+
+
+@pytest.mark.asyncio
+async def test_expired_jobs_are_removed_with_their_file(jobs):
+    job = await jobs.wait(jobs.submit("users").job_id)
+    job.expires_at = time.monotonic() - 1
+
+    assert jobs.sweep() == [job.job_id]
+    assert jobs.get(job.job_id) is None
+    with pytest.raises(FileNotFoundError):
+        open(job.path, "rb")
+
+
+@pytest.mark.asyncio
+async def test_sweeper_removes_orphans_at_start_and_expired_jobs_later(jobs):
+    job = await jobs.wait(jobs.submit("pets").job_id)
+    orphans = [os.path.join(jobs.directory, name) for name in ("old.users.csv", "old.pets.csv.part")]
+    for path in orphans:
+        open(path, "wb").close()
+
+    jobs.start_sweeper(interval=0.01)
+    try:
+        assert not any(os.path.exists(path) for path in orphans)
+        assert os.path.exists(job.path)
+
+        job.expires_at = time.monotonic() - 1
+        for _ in range(100):
+            if jobs.get(job.job_id) is None:
+                break
+            await asyncio.sleep(0.01)
+        assert jobs.get(job.job_id) is None
+        assert not os.path.exists(job.path)
+    finally:
+        jobs.stop_sweeper()
+
+
+def test_job_routes_support_range_downloads(jobs, monkeypatch):
+    monkeypatch.setattr(export_routes, "export_jobs", jobs)
+    app = FastAPI()
+    app.include_router(export_routes.router, prefix="/export")
+
+    with TestClient(app) as client:
+        response = client.post("/export/jobs", json={"entity": "users_with_pets", "filters": {"user_id": 1}})
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        for _ in range(100):
+            status = client.get(f"/export/jobs/{job_id}").json()
+            if status["status"] not in ("queued", "running"):
+                break
+            time.sleep(0.01)
+        assert status["status"] == "completed", status
+        assert status["rows"] == 5
+
+        full = client.get(status["download_url"])
+        assert full.status_code == 200
+        assert full.headers["accept-ranges"] == "bytes"
+        assert "users_with_pets.csv" in full.headers["content-disposition"]
+
+        partial = client.get(status["download_url"], headers={"Range": "bytes=10-"})
+        assert partial.status_code == 206
+        assert partial.content == full.content[10:]
+
+        assert client.post("/export/jobs", json={"entity": "hashed_passwords"}).status_code == 400
+        assert client.get("/export/jobs/missing").status_code == 404
+        assert client.delete(f"/export/jobs/{job_id}").status_code == 204
+        assert client.get(status["download_url"]).status_code == 404
+
+        jobs.max_jobs = 1
+        assert client.post("/export/jobs", json={"entity": "pets"}).status_code == 202
+        limited = client.post("/export/jobs", json={"entity": "pets"})
+        assert limited.status_code == 429
+        assert "1" in limited.json()["detail"]
@@ -0,0 +1,99 @@
+import csv
+import io
+from dataclasses import replace
+from datetime import date
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routes import export_routes
+from backend.services.csv_export_service import CSVExportService
+from backend.services.export_formats import FORMATS, ExportFormat
+
+
+@pytest.mark.asyncio
+async def test_stream_csv_yields_header_then_one_chunk_per_batch(export_sessions):
+    async with export_sessions() as db:
+        chunks = [chunk async for chunk in CSVExportService.stream_csv(db, "pets", batch_size=2)]
+
+    assert chunks[0] == b"pet_id,name,species,breed,birth_date,allergies,special_needs,user_id\n"
+    assert len(chunks) == 1 + 3
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+    assert [row["pet_id"] for row in rows] == ["1", "2", "3", "4", "5"]
+    assert rows[0]["species"] == "Felino"
+    assert rows[0]["birth_date"] == "2020-01-01"
+    assert rows[0]["allergies"] == ""
+
+
+@pytest.mark.asyncio
+async def test_stream_csv_applies_filters_and_outer_joins(export_sessions):
+    async with export_sessions() as db:
+        content = b"".join([chunk async for chunk in CSVExportService.stream_csv(db, "users_with_pets", {"user_id": 2})])
+
+    rows = list(csv.DictReader(io.StringIO(content.decode())))
+    assert len(rows) == 1
+    assert rows[0]["user_email"] == "user2@petland.test"
+    assert rows[0]["pet_id"] == ""
+
+    with pytest.raises(ValueError):
+        async with export_sessions() as db:
+            [chunk async for chunk in CSVExportService.stream_csv(db, "users", {"age": 3})]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_and_parquet_share_the_csv_columns(export_sessions):
+    async with export_sessions() as db:
+        ndjson = b"".join([chunk async for chunk in CSVExportService.stream(db, "pets", {"user_id": 1}, "ndjson", batch_size=2)])
+    lines = [orjson.loads(line) for line in ndjson.splitlines()]
+    assert len(lines) == 5
+    assert lines[0] == {
+        "pet_id": 1, "name": "Pet1", "species": "Felino", "breed": "Común", "birth_date": "2020-01-01",
+        "allergies": None, "special_needs": None, "user_id": 1,
+    }
+
+    pq = pytest.importorskip("pyarrow.parquet")
+    async with export_sessions() as db:
+        content = b"".join([chunk async for chunk in CSVExportService.stream(db, "pets", None, "parquet", batch_size=2)])
+    table = pq.read_table(io.BytesIO(content))
+    assert table.column_names == list(lines[0])
+    assert table.column("pet_id").to_pylist() == [1, 2, 3, 4, 5]
+    assert table.column("birth_date").to_pylist()[0] == date(2020, 1, 1)
+    assert str(table.schema.field("pet_id").type) == "int64"
+
+
+def test_export_route_streams_with_its_own_session(export_sessions, monkeypatch):
+    async def read_sessionmaker(request=None):
+        return export_sessions
+
+    monkeypatch.setattr(export_routes, "get_read_sessionmaker", read_sessionmaker)
+    app = FastAPI()
+    app.include_router(export_routes.router, prefix="/export")
+
+    with TestClient(app) as client:
+        response = client.get("/export/users/csv", params={"email": "user1@petland.test"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        lines = response.text.splitlines()
+        assert lines[0].startswith("user_id,first_name,last_name,email")
+        assert lines[1].startswith("1,User1,Test,user1@petland.test,600000001,\"Calle 1, 2º\"")
+        assert len(lines) == 2
+
+        response = client.get("/export/users-with-pets/csv", params={"format": "ndjson"})
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "users_with_pets.ndjson" in response.headers["content-disposition"]
+        assert len(response.text.splitlines()) == 5 + 1
+
+        response = client.get("/export/pets/csv", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert len(response.text.splitlines()) == 5 + 1
+        response = client.get("/export/pets/csv", params={"compress": "none"}, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+        assert client.get("/export/pets/csv", params={"format": "xlsx"}).status_code == 422
+        monkeypatch.setitem(FORMATS, ExportFormat.PARQUET, replace(FORMATS[ExportFormat.PARQUET], requires="not_installed"))
+        assert client.get("/export/pets/csv", params={"format": "parquet"}).status_code == 501
+        assert client.get("/export/all/csv", params={"entity": "hashed_passwords"}).status_code == 400
+        assert client.get("/export/reservations/csv", params={"status": "unknown"}).status_code == 400
@@ -0,0 +1,67 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.dialects import sqlite
+
+from backend.models import Base, Invoice, MedicalHistory, Pet, Reservation, ActivityLog
+from backend.db.statements import select_by
+
+MIGRATION = Path(__file__).resolve().parents[2] / "alembic" / "versions" / "c4e2a9d17f30_add_foreign_key_and_filter_indexes.py"
+
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location("index_migration", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def query_plan(engine, statement):
+    sql = str(statement.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        return " | ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+
+def test_migration_matches_model_indexes():
+    migration = {(table, name, tuple(cols)) for name, table, cols in load_migration().INDEXES}
+    declared = {
+        (table.name, index.name, tuple(c.name for c in index.columns))
+        for table in Base.metadata.tables.values()
+        for index in table.indexes
+        if not any(c.primary_key for c in index.columns)
+    }
+    assert migration == declared
+
+
+@pytest.mark.parametrize("statement, index", [
+    (select_by(Reservation, "user_id").params(value=1), "ix_Reservation_user_id_service_id"),
+    (select_by(Reservation, "service_id").params(value=1), "ix_Reservation_service_id"),
+    (select_by(Pet, "user_id").params(value=1), "ix_Pet_user_id"),
+    (select(MedicalHistory).where(MedicalHistory.pet_id.in_([1, 2])), "ix_Medical_history_pet_id"),
+    (select(ActivityLog).where(ActivityLog.employee_id == 1), "ix_ActivityLog_employee_id_start_time"),
+    (select(Reservation).where(Reservation.status == "pending"), "ix_Reservation_status"),
+])
+def test_hot_queries_use_index(engine, statement, index):
+    assert index in query_plan(engine, statement)
+
+
+def test_invoices_by_user_join_uses_indexes(engine):
+    statement = (
+        select(Invoice)
+        .join(Reservation, Invoice.service_id == Reservation.service_id)
+        .where(Reservation.user_id == 1)
+        .distinct()
+    )
+    plan = query_plan(engine, statement)
+    assert "COVERING INDEX ix_Reservation_user_id_service_id" in plan
+    assert "ix_Invoice_service_id" in plan
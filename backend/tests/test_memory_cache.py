@@ -0,0 +1,123 @@
+import pytest
+
+from backend.utils import memory_cache as memory_cache_module
+from backend.utils.memory_cache import (
+    MemoryCache,
+    invalidate_memory_cache,
+    lru_cache_response,
+    memory_cache_response,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(memory_cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_per_entry_ttl_and_sweep(clock):
+    cache = MemoryCache()
+    cache.set("a", 1, ttl=10)
+    cache.set("b", 2, ttl=100)
+
+    clock[0] += 50
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.set("c", 3, ttl=10)
+    clock[0] += 20
+    assert cache.sweep() == 1
+    assert len(cache) == 1
+    assert cache.stats()["expirations"] == 2
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    small = MemoryCache(max_bytes=20)
+    small.set("x", "0123456789", size=12)
+    small.set("y", "0123456789", size=12)
+    assert small.get("x") is None
+    assert small.stats()["bytes"] <= 20
+    small.set("z", "x" * 100, size=102)   # nunca cabe
+    assert small.get("z") is None
+    assert small.stats()["evictions"] == 1
+
+    # Sin tamaño conocido solo cuenta para max_entries
+    small.set("w", "x" * 100)
+    assert small.get("w") == "x" * 100
+    assert small.stats()["bytes"] == 12
+
+
+@pytest.mark.asyncio
+async def test_invalidation_is_per_prefix(monkeypatch):
+    cache = MemoryCache()
+    monkeypatch.setattr(memory_cache_module, "memory_cache", cache)
+    calls = []
+
+    @memory_cache_response("pets:all")
+    async def list_pets(limit=None):
+        calls.append("pets")
+        return ["pet"]
+
+    @memory_cache_response("services:all")
+    async def list_services():
+        calls.append("services")
+        return ["service"]
+
+    @invalidate_memory_cache("pets")
+    async def create_pet():
+        return True
+
+    await list_pets()
+    await list_services()
+    await create_pet()
+    await list_pets()
+    await list_services()
+    assert calls == ["pets", "services", "pets"]
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lru_cache_response_caches_results_not_coroutines():
+    calls = []
+
+    @lru_cache_response(maxsize=2)
+    async def square(n):
+        calls.append(n)
+        return n * n
+
+    assert await square(3) == 9
+    assert await square(3) == 9
+    assert await square(n=3) == 9
+    assert calls == [3]
+
+
+@pytest.mark.asyncio
+async def test_decorators_bound_results_by_bytes(monkeypatch):
+    cache = MemoryCache(max_bytes=30)
+    monkeypatch.setattr(memory_cache_module, "memory_cache", cache)
+
+    @memory_cache_response("names:all")
+    async def names(n):
+        return ["x" * 10] * n
+
+    await names(1)          # 14 bytes serializado
+    await names(2)          # 27 bytes: expulsa la anterior
+    assert cache.stats()["bytes"] == 27
+    assert cache.stats()["evictions"] == 1
+
+    @lru_cache_response(maxsize=10)
+    async def blob(n):
+        return "x" * n
+
+    blob.cache.max_bytes = 50
+    await blob(100)         # no cabe
+    assert len(blob.cache) == 0
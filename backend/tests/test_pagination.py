@@ -0,0 +1,70 @@
+import pytest
+import pytest_asyncio
+from datetime import date, datetime, timezone
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.models import ActivityLog, Base, Employee, Pet, User
+from backend.models.enums import ActivityTypeEnum, EmployeeSpecialtyEnum, PetTypeEnum
+from backend.db.query_stats import count_queries
+from backend.utils.pagination import paginate
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pagination.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as session:
+        session.add(User(
+            user_id=1, first_name="Ana", last_name="López", phone_number=600000001,
+            email="ana@petland.test", address="Calle 1", updated_by="test",
+            update_date=date.today(), hashed_password="x",
+        ))
+        session.add(Pet(pet_id=1, name="Luna", species=PetTypeEnum.CANINO, breed="Mestizo", birth_date=date(2020, 1, 1), user_id=1))
+        session.add(Employee(employee_id=1, first_name="Eva", last_name="Ruiz", specialty=list(EmployeeSpecialtyEnum)[0]))
+        session.add_all([
+            ActivityLog(
+                activity_id=i, employee_id=1, pet_id=1, activity_type=list(ActivityTypeEnum)[0],
+                description=f"Actividad {i}", start_time=datetime(2025, 7, 1, tzinfo=timezone.utc),
+            )
+            for i in range(1, 26)
+        ])
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_exact_count_in_one_round_trip(db):
+    with count_queries() as stats:
+        page = await paginate(select(ActivityLog), db, page=2, limit=10)
+    assert stats.count == 1
+    assert page["total"] == 25
+    assert [a.activity_id for a in page["items"]] == list(range(11, 21))
+
+
+@pytest.mark.asyncio
+async def test_exact_count_past_last_page(db):
+    page = await paginate(select(ActivityLog), db, page=5, limit=10)
+    assert page["items"] == []
+    assert page["total"] == 25
+
+
+@pytest.mark.asyncio
+async def test_count_none_skips_total(db):
+    with count_queries() as stats:
+        page = await paginate(select(ActivityLog), db, page=1, limit=10, count="none")
+    assert stats.count == 1
+    assert page["total"] is None
+    assert len(page["items"]) == 10
+
+
+@pytest.mark.asyncio
+async def test_estimate_falls_back_to_count_without_planner(db):
+    query = select(ActivityLog).where(ActivityLog.activity_id > 20)
+    page = await paginate(query, db, count="estimate")
+    assert page["total"] == 5
+    assert page["total_is_estimate"] is False
@@ -68,13 +68,9 @@ async def test_create_pet_controller_user_not_found():
 
 @pytest.mark.asyncio
 async def test_get_all_pets_controller():
-    mock_pet1 = MagicMock()
-    mock_pet1.name = "Firulais"
-    mock_pet1.species = PetTypeEnum.CANINO
-    
-    mock_pet2 = MagicMock()
-    mock_pet2.name = "Mittens"
-    mock_pet2.species = PetTypeEnum.FELINO
+    # Pet reales: el resultado se valida contra PetOut
+    mock_pet1 = Pet(pet_id=1, name="Firulais", species=PetTypeEnum.CANINO, breed="Labrador", birth_date=date(2020, 5, 20), user_id=1)
+    mock_pet2 = Pet(pet_id=2, name="Mittens", species=PetTypeEnum.FELINO, breed="Siamés", birth_date=date(2021, 3, 2), user_id=2)
     
     mock_result = MagicMock()
     mock_result.scalars.return_value.all.return_value = [mock_pet1, mock_pet2]
@@ -126,13 +122,8 @@ async def test_get_pet_by_id_controller_not_found():
 
 @pytest.mark.asyncio
 async def test_get_pets_by_user_controller():
-    mock_pet1 = MagicMock()
-    mock_pet1.name = "Firulais"
-    mock_pet1.user_id = 1
-    
-    mock_pet2 = MagicMock()
-    mock_pet2.name = "Buddy"
-    mock_pet2.user_id = 1
+    mock_pet1 = Pet(pet_id=1, name="Firulais", species=PetTypeEnum.CANINO, breed="Labrador", birth_date=date(2020, 5, 20), user_id=1)
+    mock_pet2 = Pet(pet_id=3, name="Buddy", species=PetTypeEnum.CANINO, breed="Beagle", birth_date=date(2019, 8, 1), user_id=1)
     
     mock_result = MagicMock()
     mock_result.scalars.return_value.all.return_value = [mock_pet1, mock_pet2]
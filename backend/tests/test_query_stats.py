@@ -0,0 +1,74 @@
+import pytest
+import pytest_asyncio
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.db.query_stats import QueryStats, count_queries, query_budget, query_stats_middleware
+
+
+@pytest_asyncio.fixture
+async def sessions(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'queries.db'}")
+    yield sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+def make_app(sessions, queries):
+    app = FastAPI()
+    app.middleware("http")(query_stats_middleware)
+
+    async def get_session():
+        async with sessions() as session:
+            yield session
+
+    @app.get("/items")
+    @query_budget(2)
+    async def items(db: AsyncSession = Depends(get_session)):
+        for _ in range(queries):
+            await db.execute(text("SELECT 1"))
+        return {"ok": True}
+
+    return app
+
+
+def test_repeated_statements_are_flagged():
+    stats = QueryStats()
+    for _ in range(5):
+        stats.record("SELECT * FROM Pet WHERE user_id = ?", 0.001)
+    stats.record("SELECT 1", 0.001)
+    assert stats.count == 6
+    assert stats.repeated(5) == {"SELECT * FROM Pet WHERE user_id = ?": 5}
+
+
+def test_response_reports_query_count(sessions):
+    with TestClient(make_app(sessions, 3)) as client:
+        response = client.get("/items")
+    assert response.headers["X-DB-Queries"] == "3"
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+
+
+def test_over_budget_route_logs_warning(sessions, caplog):
+    with TestClient(make_app(sessions, 3)) as client:
+        client.get("/items")
+    assert any("budget 2" in r.getMessage() for r in caplog.records)
+
+
+@pytest.mark.asyncio
+async def test_count_queries_collects_session_statements(sessions):
+    with count_queries() as stats:
+        async with sessions() as session:
+            await session.execute(text("SELECT 1"))
+            await session.execute(text("SELECT 2"))
+    assert stats.count == 2
+
+
+def test_assert_max_queries_fails_over_limit(sessions, assert_max_queries):
+    with TestClient(make_app(sessions, 2)) as client:
+        with assert_max_queries(2):
+            client.get("/items")
+        with pytest.raises(pytest.fail.Exception):
+            with assert_max_queries(1):
+                client.get("/items")
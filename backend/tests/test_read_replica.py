@@ -0,0 +1,68 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from backend.db import database
+from backend.db.replica import ReplicaLagMonitor
+
+
+def make_request(headers=None):
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers})
+
+
+class FixedLagMonitor(ReplicaLagMonitor):
+    def __init__(self, engine, lag, max_lag=5):
+        super().__init__(engine, max_lag=max_lag, check_interval=60)
+        self._lag = lag
+
+    async def _measure(self):
+        if isinstance(self._lag, Exception):
+            raise self._lag
+        return self._lag
+
+
+@pytest_asyncio.fixture
+async def replica(monkeypatch, tmp_path):
+    replica_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    replica_sessions = sessionmaker(bind=replica_engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(database, "AsyncReadSessionLocal", replica_sessions)
+    monkeypatch.setattr(database, "replica_monitor", ReplicaLagMonitor(replica_engine, 5, 5))
+    yield replica_engine, replica_sessions
+    await replica_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reads_use_primary_without_replica(monkeypatch):
+    monkeypatch.setattr(database, "AsyncReadSessionLocal", None)
+    assert await database.get_read_sessionmaker(make_request()) is database.AsyncSessionLocal
+
+
+@pytest.mark.asyncio
+async def test_reads_use_healthy_replica(replica):
+    _, replica_sessions = replica
+    assert await database.get_read_sessionmaker(make_request()) is replica_sessions
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes_header_forces_primary(replica):
+    request = make_request({database.READ_YOUR_WRITES_HEADER: "true"})
+    assert await database.get_read_sessionmaker(request) is database.AsyncSessionLocal
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_falls_back_to_primary(replica, monkeypatch):
+    replica_engine, _ = replica
+    monkeypatch.setattr(database, "replica_monitor", FixedLagMonitor(replica_engine, lag=30))
+    assert await database.get_read_sessionmaker(make_request()) is database.AsyncSessionLocal
+
+
+@pytest.mark.asyncio
+async def test_unreachable_replica_falls_back_to_primary(replica, monkeypatch):
+    replica_engine, _ = replica
+    monitor = FixedLagMonitor(replica_engine, lag=ConnectionError("down"))
+    monkeypatch.setattr(database, "replica_monitor", monitor)
+    assert await database.get_read_sessionmaker(make_request()) is database.AsyncSessionLocal
+    assert monitor.lag is None
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+import redis.asyncio as redis
+
+from backend.utils import redis_client
+from backend.utils.cache import CacheService
+from backend.utils.redis_client import CircuitBreaker, create_redis
+
+
+class FlakyRedis:
+    def __init__(self):
+        self.calls = 0
+        self.down = True
+
+    async def get(self, key):
+        self.calls += 1
+        if self.down:
+            raise redis.ConnectionError("Connection refused")
+        return None
+
+    async def ping(self):
+        if self.down:
+            raise redis.ConnectionError("Connection refused")
+        return True
+
+
+def test_client_uses_configured_pool(monkeypatch):
+    monkeypatch.setattr(redis_client, "REDIS_URL", "redis://cache.internal:6380/2")
+    client = create_redis()
+    pool = client.connection_pool
+    assert pool.max_connections == redis_client.REDIS_MAX_CONNECTIONS
+    assert pool.connection_kwargs["host"] == "cache.internal"
+    assert pool.connection_kwargs["port"] == 6380
+    assert pool.connection_kwargs["socket_timeout"] == redis_client.REDIS_SOCKET_TIMEOUT
+    assert pool.connection_kwargs["socket_connect_timeout"] == redis_client.REDIS_CONNECT_TIMEOUT
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_skips_redis_until_probe_succeeds():
+    service = CacheService()
+    service.redis = FlakyRedis()
+    service.breaker = CircuitBreaker("test", service._ping, failure_threshold=2, backoff=0.01)
+
+    assert await service.get("a") is None
+    assert await service.get("a") is None
+    assert service.breaker.is_open
+    assert await service.get("a") is None
+    assert service.redis.calls == 2
+
+    service.redis.down = False
+    for _ in range(100):
+        if not service.breaker.is_open:
+            break
+        await asyncio.sleep(0.01)
+    assert service.available
+    await service.get("a")
+    assert service.redis.calls == 3
+    service.breaker.close()
+
+
+@pytest.mark.asyncio
+async def test_non_connection_errors_do_not_trip():
+    breaker = CircuitBreaker("test", lambda: None, failure_threshold=1)
+    breaker.record_failure(ValueError("bad payload"))
+    assert breaker.allow()
@@ -0,0 +1,150 @@
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.controllers.pet_controller import (
+    delete_pet_controller,
+    get_all_pets_controller,
+    get_pet_by_id_controller,
+    update_pet_controller,
+)
+from backend.models import Base, Pet, User
+from backend.models.enums import PetTypeEnum
+from backend.schema.pet_schema import PetOut, PetUpdate
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'rows.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as session:
+        session.add(User(
+            user_id=1, first_name="Ana", last_name="López", phone_number=600000001,
+            email="ana@petland.test", address="Calle 1", updated_by="test",
+            update_date=date.today(), hashed_password="x",
+        ))
+        for pet_id, name in enumerate(["Luna", "Toby", "Nala"], start=1):
+            session.add(Pet(pet_id=pet_id, name=name, species=PetTypeEnum.CANINO, breed="Mestizo", birth_date=date(2020, 1, 1), user_id=1))
+        await session.commit()
+    async with sessions() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_update_refreshes_only_its_row(db, cache_backend, assert_max_queries):
+    pets = await get_all_pets_controller(db)
+    assert [p.name for p in pets] == ["Luna", "Toby", "Nala"]
+    assert {"row:pet:1", "row:pet:2", "row:pet:3"} <= set(cache_backend.redis.data)
+
+    await update_pet_controller(2, PetUpdate(name="Toby II"), db)
+
+    # pets:all se invalida, pero se reconstruye con la lista de ids y un MGET
+    with assert_max_queries(0):
+        pets = await get_all_pets_controller(db)
+    assert [p.name for p in pets] == ["Luna", "Toby II", "Nala"]
+    assert all(isinstance(p, PetOut) for p in pets)
+
+
+@pytest.mark.asyncio
+async def test_missing_rows_load_in_one_query(db, cache_backend, assert_max_queries):
+    await get_all_pets_controller(db)
+    del cache_backend.redis.data["row:pet:1"]
+    del cache_backend.redis.data["row:pet:3"]
+
+    with assert_max_queries(1):
+        pet = await get_pet_by_id_controller(1, db)
+    assert pet.name == "Luna"
+
+    # Lista de ids nueva + una sola consulta IN para la fila que aún falta
+    with assert_max_queries(2) as stats:
+        pets = await get_all_pets_controller(db, limit=10)
+    assert [p.name for p in pets] == ["Luna", "Toby", "Nala"]
+    assert sum("IN" in sql for sql in stats.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_delete_drops_row_and_id_lists(db, cache_backend):
+    await get_all_pets_controller(db)
+    await delete_pet_controller(1, db)
+
+    assert "row:pet:1" not in cache_backend.redis.data
+    assert [p.name for p in await get_all_pets_controller(db)] == ["Toby", "Nala"]
+
+
+@pytest.mark.asyncio
+async def test_register_and_reservations_invalidate_id_lists(db, cache_backend, monkeypatch):
+    from datetime import datetime, time
+    from decimal import Decimal
+
+    from backend.controllers import auth_controller
+    from backend.controllers.auth_controller import register_user
+    from backend.controllers.reservation_controller import create_reservation_controller, delete_reservation_controller
+    from backend.controllers.user_controllers import get_all_users_controller
+    from backend.models import Service
+    from backend.models.enums import ServiceTypeEnum
+    from backend.schema.auth_schema import RegisterRequest
+    from backend.schema.reservation_schema import ReservationCreate
+    from backend.utils import simple_cache
+
+    db.add(Service(service_id=1, lodging=False, service_type=ServiceTypeEnum.COMIDA, base_price=Decimal("10"), duration=time(1)))
+    await db.commit()
+
+    async def list_key(namespace):
+        return await cache_backend.versioned_key(f"{namespace}:all")
+
+    monkeypatch.setattr(auth_controller, "get_user_permissions", lambda role: [])
+    monkeypatch.setattr(simple_cache.cache, "redis_client", cache_backend.redis)
+    assert len(await get_all_users_controller(db)) == 1
+    users = await list_key("user_ids")
+    await register_user(RegisterRequest(
+        email="bea@petland.test", password="secreto", first_name="Bea", last_name="Ruiz",
+        phone_number=600000002, address="Calle 2",
+    ), db)
+    assert await list_key("user_ids") != users
+    assert len(await get_all_users_controller(db)) == 2
+
+    services = await list_key("service_ids")
+    reservation = await create_reservation_controller(ReservationCreate(
+        user_id=1, service_type=ServiceTypeEnum.COMIDA,
+        checkin_date=datetime(2026, 1, 1), checkout_date=datetime(2026, 1, 2),
+    ), db)
+    assert await list_key("service_ids") != services
+
+    services = await list_key("service_ids")
+    await delete_reservation_controller(reservation.reservation_id, db)
+    assert await list_key("service_ids") != services
+
+
+@pytest.mark.asyncio
+async def test_services_by_user_response_follows_reservations(db, cache_backend):
+    from datetime import datetime, time
+    from decimal import Decimal
+
+    from backend.controllers.reservation_controller import create_reservation_controller, delete_reservation_controller
+    from backend.controllers.service_controller import get_services_by_user_controller
+    from backend.models import Service
+    from backend.models.enums import ServiceTypeEnum
+    from backend.schema.reservation_schema import ReservationCreate
+    from backend.utils import cache_decorators
+
+    cache_decorators.local_cache.enabled = True
+    db.add(Service(service_id=1, lodging=False, service_type=ServiceTypeEnum.COMIDA, base_price=Decimal("10"), duration=time(1)))
+    await db.commit()
+
+    assert await get_services_by_user_controller(1, db) == []
+    assert await get_services_by_user_controller(1, db) == []   # L1
+
+    reservation = await create_reservation_controller(ReservationCreate(
+        user_id=1, service_type=ServiceTypeEnum.COMIDA,
+        checkin_date=datetime(2026, 1, 1), checkout_date=datetime(2026, 1, 2),
+    ), db)
+    assert [s.service_id for s in await get_services_by_user_controller(1, db)] == [1]
+
+    await delete_reservation_controller(reservation.reservation_id, db)
+    assert await get_services_by_user_controller(1, db) == []
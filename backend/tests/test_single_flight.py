@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from backend.utils import cache as cache_module
+from backend.utils.cache_decorators import cache_response
+from backend.utils.single_flight import SingleFlight, flights
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load(cache_backend):
+    calls = []
+
+    @cache_response("items:all", ttl=60)
+    async def list_items():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [len(calls)]
+
+    results = await asyncio.gather(*(list_items() for _ in range(5)))
+    assert results == [[1]] * 5
+    assert calls == [1]
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_while_refreshing(cache_backend, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    calls = []
+
+    @cache_response("items:all", ttl=60, stale_ttl=30)
+    async def list_items():
+        calls.append(1)
+        return [len(calls)]
+
+    assert await list_items() == [1]
+    now[0] += 70  # caducado, dentro del margen
+    assert await list_items() == [1]
+    assert await list_items() == [1]
+    await asyncio.sleep(0)
+    while flights.in_flight("items:g0:all"):
+        await asyncio.sleep(0.001)
+    assert calls == [1, 1]
+    assert await list_items() == [2]
+
+
+@pytest.mark.asyncio
+async def test_failed_load_reaches_every_waiter_and_is_forgotten():
+    group = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise ValueError("db down")
+
+    results = await asyncio.gather(*(group.do("k", boom) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+    assert not group.in_flight("k")
+
+
+@pytest.mark.asyncio
+async def test_shared_miss_runs_with_its_own_session(cache_backend, export_sessions):
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from backend.models import Pet
+    from backend.schema.pet_schema import PetOut
+
+    used = []
+
+    @cache_response("own_pets:all", ttl=60, schema=PetOut)
+    async def list_pets(db: AsyncSession):
+        used.append(db)
+        await asyncio.sleep(0.01)
+        return (await db.execute(select(Pet).order_by(Pet.pet_id))).scalars().all()
+
+    request_sessions = [export_sessions() for _ in range(3)]
+    results = await asyncio.gather(*(list_pets(db) for db in request_sessions))
+    for db in request_sessions:
+        await db.close()
+
+    assert len(used) == 1 and used[0] not in request_sessions
+    assert all(isinstance(pet, PetOut) for result in results for pet in result)
+    assert [pet.pet_id for pet in results[2]] == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_fill_after_invalidation_reads_the_primary(cache_backend, export_sessions, tmp_path, monkeypatch):
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from backend.db import database
+    from backend.models import Base, Pet
+
+    # Réplica con el esquema pero sin las filas: aún no ha recibido las escrituras
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    async with replica.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    monkeypatch.setattr(database, "engine", export_sessions.kw["bind"])
+    monkeypatch.setattr(database, "read_engine", replica)
+    engines = []
+
+    @cache_response("lag_pets:all", ttl=60)
+    async def count_pets(db: AsyncSession):
+        engines.append(db.bind)
+        return len((await db.execute(select(Pet.pet_id))).scalars().all())
+
+    async def call(bind):
+        async with AsyncSession(bind=bind) as db:
+            return await count_pets(db)
+
+    assert await call(replica) == 0                      # la petición eligió la réplica
+    await cache_backend.bump_generation("lag_pets")
+    assert await call(replica) == 5                      # recién invalidado: primario
+    await cache_backend.bump_generation("lag_pets")
+    assert await call(database.engine) == 5              # X-Read-Your-Writes: primario
+    assert engines == [replica, database.engine, database.engine]
+    await replica.dispose()
+
+
+@pytest.mark.asyncio
+async def test_simple_cache_miss_runs_with_its_own_session(cache_backend, export_sessions, monkeypatch):
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from backend.models import User
+    from backend.utils import simple_cache
+
+    monkeypatch.setattr(simple_cache.cache, "redis_client", cache_backend.redis)
+    used = []
+
+    @simple_cache.cache_response("own_users:all", ttl=60)
+    async def list_emails(db: AsyncSession):
+        used.append(db)
+        await asyncio.sleep(0.01)
+        return (await db.execute(select(User.email).order_by(User.user_id))).scalars().all()
+
+    request_sessions = [export_sessions() for _ in range(3)]
+    results = await asyncio.gather(*(list_emails(db) for db in request_sessions))
+    for db in request_sessions:
+        await db.close()
+
+    assert len(used) == 1 and used[0] not in request_sessions
+    assert results == [["user1@petland.test", "user2@petland.test"]] * 3
@@ -0,0 +1,71 @@
+import pytest
+import pytest_asyncio
+from datetime import date
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.models import Base, Pet, User
+from backend.models.enums import PetTypeEnum
+from sqlalchemy import select
+
+from backend.db.statements import exists_by_pk, get_by_pk, list_by, projection, select_by
+from backend.schema.pet_schema import PetOut
+from backend.schema.user_schema import UserOut
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'statements.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as session:
+        session.add(User(
+            user_id=1, first_name="Ana", last_name="López", phone_number=600000001,
+            email="ana@petland.test", address="Calle 1", updated_by="test",
+            update_date=date.today(), hashed_password="x",
+        ))
+        session.add_all([
+            Pet(pet_id=1, name="Luna", species=PetTypeEnum.CANINO, breed="Mestizo", birth_date=date(2020, 1, 1), user_id=1),
+            Pet(pet_id=2, name="Sol", species=PetTypeEnum.FELINO, breed="Siamés", birth_date=date(2021, 1, 1), user_id=1),
+        ])
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+def test_statements_are_built_once():
+    assert select_by(Pet, "pet_id") is select_by(Pet, "pet_id")
+
+
+@pytest.mark.asyncio
+async def test_get_by_pk(db):
+    pet = await get_by_pk(db, Pet, 2)
+    assert pet.name == "Sol"
+    assert await get_by_pk(db, Pet, 99) is None
+
+
+@pytest.mark.asyncio
+async def test_exists_by_pk(db):
+    assert await exists_by_pk(db, User, 1) is True
+    assert await exists_by_pk(db, User, 2) is False
+
+
+@pytest.mark.asyncio
+async def test_list_by_foreign_key(db):
+    pets = await list_by(db, Pet, "user_id", 1)
+    assert sorted(p.pet_id for p in pets) == [1, 2]
+
+
+def test_projection_only_selects_response_columns():
+    sql = str(select(projection(User, UserOut)))
+    assert "hashed_password" not in sql
+    assert "email" in sql
+
+
+@pytest.mark.asyncio
+async def test_list_by_projection_returns_dicts(db):
+    pets = await list_by(db, Pet, "user_id", 1, schema=PetOut)
+    assert all(isinstance(p, dict) for p in pets)
+    assert set(pets[0]) == set(PetOut.model_fields)
+    assert PetOut.model_validate(pets[0]).user_id == 1
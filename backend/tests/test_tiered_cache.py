@@ -0,0 +1,69 @@
+import pytest
+
+from backend.utils import cache_decorators
+from backend.utils.cache import INVALIDATION_CHANNEL
+from backend.utils.cache_decorators import cache_response, invalidate_cache
+from backend.utils.tiered_cache import LocalCache, handle_invalidation
+
+
+@pytest.fixture
+def l1(cache_backend):
+    cache_decorators.local_cache.enabled = True
+    return cache_decorators.local_cache
+
+
+def _catalog(calls):
+    @cache_response("catalog:all", ttl=60, local_ttl=30)
+    async def list_catalog(limit=None):
+        calls.append(limit)
+        return [{"id": len(calls)}]
+
+    return list_catalog
+
+
+@pytest.mark.asyncio
+async def test_l1_hit_skips_redis(cache_backend, l1):
+    calls = []
+    list_catalog = _catalog(calls)
+
+    assert await list_catalog(limit=5) == [{"id": 1}]
+    cache_backend.redis = None  # un acierto en L1 no debe tocar Redis
+    assert await list_catalog(limit=5) == [{"id": 1}]
+    assert calls == [5]
+
+
+@pytest.mark.asyncio
+async def test_invalidation_is_published_and_clears_l1(cache_backend, l1):
+    calls = []
+    list_catalog = _catalog(calls)
+
+    @invalidate_cache("catalog")
+    async def create_item():
+        return True
+
+    await list_catalog()
+    await create_item()
+    assert cache_backend.redis.published == [(INVALIDATION_CHANNEL, "catalog")]
+    assert len(l1) == 0
+    assert await list_catalog() == [{"id": 2}]
+
+
+def test_remote_message_and_lru_bound(monkeypatch):
+    cache = LocalCache(max_entries=2)
+    cache.enabled = True
+    monkeypatch.setattr("backend.utils.tiered_cache.local_cache", cache)
+
+    for key in ("a:1", "a:2", "b:1"):
+        cache.set(key, key, ttl=30, epoch=cache.epoch(key))
+    assert cache.get("a:1") is None  # expulsada por LRU
+    assert cache.get("a:2") == "a:2"
+
+    handle_invalidation({"type": "message", "data": b"a"})
+    assert cache.get("a:2") is None
+    assert cache.get("b:1") == "b:1"
+
+    # Un valor leído antes de la invalidación no entra en L1
+    stale_epoch = cache.epoch("b:1")
+    cache.invalidate("b")
+    cache.set("b:1", "old", ttl=30, epoch=stale_epoch)
+    assert cache.get("b:1") is None
@@ -1,9 +1,9 @@
 from typing import List, Optional
 from fastapi import HTTPException, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 
 from backend.db.database import get_db
+from backend.db.statements import get_by_pk
 from backend.models.user_models import User
 from backend.models.enums import UserRole, Permission, ROLE_PERMISSIONS
 from backend.utils.auth_jwt import get_current_user
@@ -131,8 +131,7 @@ async def can_access_pet_resource(
         return True
 
     from backend.models.pet_models import Pet
-    result = await db.execute(select(Pet).where(Pet.pet_id == target_pet_id))
-    pet = result.scalar_one_or_none()
+    pet = await get_by_pk(db, Pet, target_pet_id)
     
     if not pet:
         return False
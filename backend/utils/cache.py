@@ -1,32 +1,78 @@
-import json
+import os
 import pickle
-from typing import Any, Optional, Union
+import time
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
 import redis.asyncio as redis
 from fastapi import Depends
+from pydantic import BaseModel
 from backend.logger.logger import logger
+from backend.utils.cache_metrics import cache_metrics
+from backend.utils.cache_serializer import dumps, loads
+from backend.utils.redis_client import CircuitBreaker, create_redis
+
+SCAN_BATCH_SIZE = 500
+STALE_MARKER = "~"
+INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache_invalidation")
+# Cuánto se recuerda el instante de la última invalidación de un espacio de nombres
+INVALIDATION_MARK_TTL = 300
+
+
+def namespace_of(prefix: str) -> str:
+    """'pets:by_user' -> 'pets'"""
+    return prefix.split(":", 1)[0]
+
+
+def generation_key(namespace: str) -> str:
+    return f"cache_generation:{namespace}"
+
+
+def invalidated_at_key(namespace: str) -> str:
+    return f"cache_invalidated_at:{namespace}"
+
+
+def wrap_stale(payload: bytes, fresh_until: float) -> bytes:
+    return f"{STALE_MARKER}{fresh_until:.3f}|".encode() + payload
+
+
+def unwrap_stale(raw: Union[str, bytes]) -> Tuple[Union[str, bytes], Optional[float]]:
+    """Separa el instante de caducidad blanda; '~' nunca empieza un JSON"""
+    marker = STALE_MARKER if isinstance(raw, str) else STALE_MARKER.encode()
+    separator = "|" if isinstance(raw, str) else b"|"
+    if not raw.startswith(marker):
+        return raw, None
+    header, payload = raw[1:].split(separator, 1)
+    return payload, float(header)
+
 
 class CacheService:
     def __init__(self):
         self.redis: Optional[redis.Redis] = None
         self.default_ttl = 300  
+        self.breaker = CircuitBreaker("cache", self._ping)
+
+    @property
+    def available(self) -> bool:
+        """Hay cliente y el circuito está cerrado"""
+        return self.redis is not None and self.breaker.allow()
+
+    async def _ping(self):
+        await self.redis.ping()
     
     async def connect(self):
       
+        if self.redis is None:
+            self.redis = create_redis()
         try:
-            if self.redis is None:
-                self.redis = redis.from_url(
-                    "redis://localhost:6379",
-                    encoding="utf-8",
-                    decode_responses=True
-                )
             await self.redis.ping()
+            self.breaker.record_success()
             logger.info("Conectado a Redis exitosamente")
         except Exception as e:
             logger.warning(f"No se pudo conectar a Redis: {e}")
-            self.redis = None
+            self.breaker.trip(e)
     
     async def disconnect(self):
        
+        self.breaker.close()
         if self.redis:
             try:
                 await self.redis.aclose()
@@ -35,37 +81,116 @@ class CacheService:
             finally:
                 self.redis = None
     
-    async def get(self, key: str) -> Optional[Any]:
+    async def get(self, key: str, schema: Optional[Type[BaseModel]] = None) -> Optional[Any]:
       
-        if not self.redis:
+        entry = await self.get_entry(key, schema)
+        return entry[0] if entry else None
+
+    async def get_entry(self, key: str, schema: Optional[Type[BaseModel]] = None) -> Optional[Tuple[Any, bool, int]]:
+        """
+        (valor, fresco, bytes leídos). Un valor guardado con stale_ttl deja de
+        estar fresco al pasar su ttl.
+        """
+        if not self.available:
+            cache_metrics.record("redis", key, bypassed=True)
             return None
         
+        started = time.perf_counter()
         try:
             value = await self.redis.get(key)
-            if value:
-                return json.loads(value)
-            return None
+            self.breaker.record_success()
+            cache_metrics.record("redis", key, hit=bool(value), elapsed=time.perf_counter() - started, size=len(value or ""))
+            if not value:
+                return None
+            raw, fresh_until = unwrap_stale(value)
+            return loads(raw, schema), fresh_until is None or fresh_until > time.time(), len(raw)
         except Exception as e:
+            self.breaker.record_failure(e)
+            cache_metrics.record("redis", key, error=True, elapsed=time.perf_counter() - started)
             logger.error(f"Error obteniendo caché para key {key}: {e}")
             return None
     
-    async def set(self, key: str, value: Any, ttl: int = None) -> bool:
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: int = None,
+        schema: Optional[Type[BaseModel]] = None,
+        stale_ttl: int = 0,
+    ) -> bool:
        
-        if not self.redis:
+        if not self.available:
+            cache_metrics.record("redis", key, bypassed=True)
             return False
         
+        started = time.perf_counter()
         try:
             ttl = ttl or self.default_ttl
-            await self.redis.setex(key, ttl, json.dumps(value))
+            payload = dumps(value, schema)
+            if stale_ttl:
+                # La clave vive ttl + stale_ttl; pasado ttl se sirve como obsoleta
+                payload = wrap_stale(payload, time.time() + ttl)
+            await self.redis.setex(key, ttl + stale_ttl, payload)
+            self.breaker.record_success()
+            cache_metrics.record("redis", key, written=True, elapsed=time.perf_counter() - started, size=len(payload))
             logger.debug(f"Caché establecido para key: {key}, TTL: {ttl}s")
             return True
         except Exception as e:
+            self.breaker.record_failure(e)
+            cache_metrics.record("redis", key, written=False, elapsed=time.perf_counter() - started)
             logger.error(f"Error estableciendo caché para key {key}: {e}")
             return False
     
+    async def get_many(self, keys: List[str], schema: Optional[Type[BaseModel]] = None) -> List[Optional[Any]]:
+        """Un único MGET; None en las posiciones sin valor"""
+        if not keys or not self.available:
+            for key in keys:
+                cache_metrics.record("redis", key, bypassed=True)
+            return [None] * len(keys)
+
+        started = time.perf_counter()
+        try:
+            values = await self.redis.mget(keys)
+            self.breaker.record_success()
+        except Exception as e:
+            self.breaker.record_failure(e)
+            cache_metrics.record("redis", keys[0], error=True, elapsed=time.perf_counter() - started)
+            logger.error(f"Error en MGET de {len(keys)} claves: {e}")
+            return [None] * len(keys)
+        # Una sola llamada: la latencia se anota una vez, los aciertos por clave
+        cache_metrics.record("redis", keys[0], elapsed=time.perf_counter() - started)
+        for key, value in zip(keys, values):
+            cache_metrics.record("redis", key, hit=bool(value), size=len(value or ""))
+        return [loads(unwrap_stale(value)[0], schema) if value else None for value in values]
+
+    async def set_many(self, values: Dict[str, Any], ttl: int = None, schema: Optional[Type[BaseModel]] = None) -> bool:
+        """Varios SETEX en una sola ida y vuelta (pipeline sin transacción)"""
+        if not values or not self.available:
+            return False
+
+        started = time.perf_counter()
+        try:
+            ttl = ttl or self.default_ttl
+            payloads = {key: dumps(value, schema) for key, value in values.items()}
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, payload in payloads.items():
+                    pipe.setex(key, ttl, payload)
+                await pipe.execute()
+            self.breaker.record_success()
+            cache_metrics.record("redis", next(iter(values)), elapsed=time.perf_counter() - started)
+            for key, payload in payloads.items():
+                cache_metrics.record("redis", key, written=True, size=len(payload))
+            return True
+        except Exception as e:
+            self.breaker.record_failure(e)
+            for key in values:
+                cache_metrics.record("redis", key, written=False)
+            logger.error(f"Error estableciendo {len(values)} claves de caché: {e}")
+            return False
+
     async def delete(self, key: str) -> bool:
  
-        if not self.redis:
+        if not self.available:
             return False
         
         try:
@@ -73,23 +198,88 @@ class CacheService:
             logger.debug(f"Caché eliminado para key: {key}")
             return True
         except Exception as e:
+            self.breaker.record_failure(e)
             logger.error(f"Error eliminando caché para key {key}: {e}")
             return False
     
     async def delete_pattern(self, pattern: str) -> bool:
-      
-        if not self.redis:
+        """Borrado explícito por patrón con SCAN; la invalidación normal usa bump_generation"""
+        if not self.available:
             return False
         
         try:
-            keys = await self.redis.keys(pattern)
-            if keys:
-                await self.redis.delete(*keys)
-                logger.debug(f"Eliminadas {len(keys)} claves con patrón: {pattern}")
+            deleted = 0
+            batch = []
+            async for key in self.redis.scan_iter(match=pattern, count=SCAN_BATCH_SIZE):
+                batch.append(key)
+                if len(batch) >= SCAN_BATCH_SIZE:
+                    deleted += await self.redis.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += await self.redis.unlink(*batch)
+            logger.debug(f"Eliminadas {deleted} claves con patrón: {pattern}")
             return True
         except Exception as e:
+            self.breaker.record_failure(e)
             logger.error(f"Error eliminando caché con patrón {pattern}: {e}")
             return False
+
+    async def get_generation(self, namespace: str) -> int:
+        if not self.available:
+            return 0
+        try:
+            return int(await self.redis.get(generation_key(namespace)) or 0)
+        except Exception as e:
+            self.breaker.record_failure(e)
+            logger.error(f"Error leyendo generación de caché {namespace}: {e}")
+            return 0
+
+    async def invalidated_at(self, namespace: str) -> Optional[float]:
+        """Instante (time.time) de la última invalidación, si es reciente"""
+        if not self.available:
+            return None
+        try:
+            value = await self.redis.get(invalidated_at_key(namespace_of(namespace)))
+            return float(value) if value else None
+        except Exception as e:
+            self.breaker.record_failure(e)
+            logger.error(f"Error leyendo invalidación de caché {namespace}: {e}")
+            return None
+
+    async def bump_generation(self, namespace: str) -> bool:
+        """
+        Invalida todo el espacio de nombres con un INCR; las claves viejas caducan por TTL.
+        Se publica en el canal de invalidación para que los workers vacíen su L1.
+        """
+        if not self.available:
+            return False
+        try:
+            namespace = namespace_of(namespace)
+            generation = await self.redis.incr(generation_key(namespace))
+            await self.redis.set(invalidated_at_key(namespace), f"{time.time():.3f}", ex=INVALIDATION_MARK_TTL)
+            await self.redis.publish(INVALIDATION_CHANNEL, namespace)
+            logger.debug(f"Generación de caché {namespace} -> {generation}")
+            return True
+        except Exception as e:
+            self.breaker.record_failure(e)
+            logger.error(f"Error invalidando caché {namespace}: {e}")
+            return False
+
+    async def acquire_lock(self, name: str, ttl: int) -> bool:
+        """SET NX con caducidad: solo un worker obtiene el cerrojo hasta que expire"""
+        if not self.available:
+            return False
+        try:
+            return bool(await self.redis.set(f"lock:{name}", "1", nx=True, ex=ttl))
+        except Exception as e:
+            self.breaker.record_failure(e)
+            logger.error(f"Error adquiriendo cerrojo {name}: {e}")
+            return False
+
+    async def versioned_key(self, prefix: str, **kwargs) -> str:
+        namespace = namespace_of(prefix)
+        generation = await self.get_generation(namespace)
+        return self.generate_key(f"{namespace}:g{generation}{prefix[len(namespace):]}", **kwargs)
     
     def generate_key(self, prefix: str, **kwargs) -> str:
        
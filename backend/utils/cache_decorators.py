@@ -1,33 +1,105 @@
 from functools import wraps
-from typing import Callable, Any, Optional
+from typing import Awaitable, Callable, Any, Optional, Type
+from pydantic import BaseModel
 from backend.utils.cache import cache_service
+from backend.utils.cache_keys import UncacheableArgument, build_key
+from backend.utils.cache_serializer import dumps, loads, validate
+from backend.utils.single_flight import call_with_own_session, flights
+from backend.utils.tiered_cache import local_cache
 from backend.logger.logger import logger
 
-def cache_response(prefix: str, ttl: int = 300, key_params: Optional[list] = None):
-   
+def cache_response(
+    prefix: str,
+    ttl: int = 300,
+    key_params: Optional[list] = None,
+    schema: Optional[Type[BaseModel]] = None,
+    local_ttl: Optional[int] = None,
+    stale_ttl: int = 0,
+):
+    """
+    Cachea el resultado del controlador. Con schema, el resultado se guarda
+    como su schema de respuesta y se devuelven instancias del schema tanto en
+    un acierto como en un fallo.
+    Con local_ttl se consulta antes la caché L1 del proceso (ver tiered_cache).
+
+    Los fallos concurrentes de una misma clave esperan a una sola carga, que
+    abre su propia sesión y devuelve valores serializables. Con
+    stale_ttl, durante ese margen tras caducar se sirve el valor anterior
+    mientras una única tarea lo refresca en segundo plano.
+    """
     def decorator(func: Callable) -> Callable:
+        async def load(base_key: str, cache_key: str, epoch: Optional[int], call: Callable[[], Awaitable[Any]]) -> Any:
+            result = await call()
+            if result is not None:
+                # Los que esperan a la carga reciben el mismo tipo que en un acierto,
+                # nunca objetos ORM ligados a la sesión de otra petición
+                result = validate(result, schema) if schema is not None else loads(dumps(result))
+            await cache_service.set(cache_key, result, ttl, schema=schema, stale_ttl=stale_ttl)
+            if local_ttl and local_cache.enabled:
+                # L1 guarda la forma serializada, nunca objetos ORM ligados a la sesión
+                payload = dumps(result, schema)
+                local_cache.set(base_key, loads(payload, schema), min(local_ttl, ttl), epoch, size=len(payload))
+            return result
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
           
-            cache_key = cache_service.generate_key(prefix, **kwargs)
-            
-          
-            cached_result = await cache_service.get(cache_key)
-            if cached_result is not None:
-                logger.debug(f"Cache hit para: {cache_key}")
+            try:
+                base_key = build_key(prefix, func, args, kwargs, key_params)
+            except UncacheableArgument as e:
+                logger.warning(f"Sin caché para {prefix}: {e}")
+                return await func(*args, **kwargs)
+
+            epoch = None
+            if local_ttl:
+                cached_result = local_cache.get(base_key)
+                if cached_result is not None:
+                    logger.debug(f"L1 hit para: {base_key}")
+                    return cached_result
+                epoch = local_cache.epoch(base_key)
+
+            cache_key = await cache_service.versioned_key(base_key)
+
+            entry = await cache_service.get_entry(cache_key, schema=schema)
+            if entry is not None:
+                cached_result, fresh, size = entry
+                if fresh:
+                    logger.debug(f"Cache hit para: {cache_key}")
+                    if local_ttl:
+                        local_cache.set(base_key, cached_result, min(local_ttl, ttl), epoch, size=size)
+                elif not flights.in_flight(cache_key):
+                    logger.debug(f"Cache obsoleto para: {cache_key}, refrescando en segundo plano")
+                    flights.spawn(cache_key, lambda: load(base_key, cache_key, epoch, lambda: call_with_own_session(func, args, kwargs)))
                 return cached_result
             
        
             logger.debug(f"Cache miss para: {cache_key}")
-            result = await func(*args, **kwargs)
-            
-           
-            await cache_service.set(cache_key, result, ttl)
-            
-            return result
+            invalidated_at = await cache_service.invalidated_at(base_key)
+            # La carga compartida sobrevive a la petición que la lanzó (shield): usa su propia sesión
+            return await flights.do(
+                cache_key,
+                lambda: load(base_key, cache_key, epoch, lambda: call_with_own_session(func, args, kwargs, invalidated_at)),
+            )
+
+        async def refresh(*args, **kwargs):
+            """Recalcula y guarda el valor sin consultar la caché (precarga)"""
+            base_key = build_key(prefix, func, args, kwargs, key_params)
+            cache_key = await cache_service.versioned_key(base_key)
+            epoch = local_cache.epoch(base_key)
+            return await flights.do(cache_key, lambda: load(base_key, cache_key, epoch, lambda: func(*args, **kwargs)))
+
+        wrapper.refresh = refresh
+        wrapper.cache_prefix = prefix
+        wrapper.cache_ttl = ttl
         return wrapper
     return decorator
 
+async def invalidate_namespace(prefix: str) -> None:
+    """Sube la generación del espacio de nombres en Redis y vacía su L1"""
+    await cache_service.bump_generation(prefix)
+    local_cache.invalidate(prefix)
+    logger.debug(f"Caché invalidado para prefijo: {prefix}")
+
 def invalidate_cache(prefix: str, pattern: Optional[str] = None):
    
     def decorator(func: Callable) -> Callable:
@@ -39,10 +111,10 @@ def invalidate_cache(prefix: str, pattern: Optional[str] = None):
         
             if pattern:
                 await cache_service.delete_pattern(pattern)
+                local_cache.invalidate(prefix)
+                logger.debug(f"Caché invalidado para prefijo: {prefix}")
             else:
-                await cache_service.delete_pattern(f"{prefix}:*")
-            
-            logger.debug(f"Caché invalidado para prefijo: {prefix}")
+                await invalidate_namespace(prefix)
             return result
         return wrapper
     return decorator
@@ -54,7 +126,11 @@ def cache_with_conditional_invalidation(prefix: str, ttl: int = 300):
         async def wrapper(*args, **kwargs):
             
             if func.__name__.startswith('get_'):
-                cache_key = cache_service.generate_key(prefix, **kwargs)
+                try:
+                    cache_key = await cache_service.versioned_key(build_key(prefix, func, args, kwargs))
+                except UncacheableArgument as e:
+                    logger.warning(f"Sin caché para {prefix}: {e}")
+                    return await func(*args, **kwargs)
                 cached_result = await cache_service.get(cache_key)
                 if cached_result is not None:
                     logger.debug(f"Cache hit para: {cache_key}")
@@ -67,8 +143,7 @@ def cache_with_conditional_invalidation(prefix: str, ttl: int = 300):
             else:
                 result = await func(*args, **kwargs)
                 # Invalidar caché relacionado
-                await cache_service.delete_pattern(f"{prefix}:*")
-                logger.debug(f"Caché invalidado para prefijo: {prefix}")
+                await invalidate_namespace(prefix)
                 return result
                 
         return wrapper
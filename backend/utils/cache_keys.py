@@ -0,0 +1,96 @@
+"""
+Claves de caché a partir de la firma de la función cacheada.
+
+Los argumentos se enlazan con inspect.signature, así que pet_id cuenta igual
+se pase por posición o por nombre. Se descartan las dependencias que no
+identifican el resultado (sesiones de base de datos, Request, ...). Los
+argumentos simples quedan legibles (pets:by_id:pet_id=1); el resto se resume
+con blake2b sobre una codificación canónica, estable entre procesos a
+diferencia de hash().
+"""
+import hashlib
+import inspect
+import re
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import orjson
+from fastapi import BackgroundTasks, Request, Response, WebSocket
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.utils.cache_serializer import json_default
+
+EXCLUDED_TYPES = (AsyncSession, Session, Request, Response, WebSocket, BackgroundTasks)
+
+MAX_READABLE_LENGTH = 64
+# Solo cadenas que no puedan confundirse con un número, null o true/false
+_SAFE_STRING = re.compile(r"^[A-Za-z][\w.@-]{0,31}$")
+_JSON_LITERALS = {"null", "true", "false"}
+
+
+class UncacheableArgument(TypeError):
+    pass
+
+
+@lru_cache(maxsize=None)
+def _key_parameters(func: Callable) -> Tuple[inspect.Signature, frozenset]:
+    signature = inspect.signature(func)
+    excluded = frozenset(
+        name for name, param in signature.parameters.items()
+        if isinstance(param.annotation, type) and issubclass(param.annotation, EXCLUDED_TYPES)
+    )
+    return signature, excluded
+
+
+def signature_of(func: Callable) -> inspect.Signature:
+    return _key_parameters(func)[0]
+
+
+def key_arguments(func: Callable, args: tuple, kwargs: dict, key_params: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Argumentos que identifican el resultado, por nombre y con sus valores por defecto"""
+    signature, excluded = _key_parameters(func)
+    bound = signature.bind_partial(*args, **kwargs)
+    bound.apply_defaults()
+    wanted = set(key_params) if key_params else None
+    return {
+        name: value for name, value in bound.arguments.items()
+        if name not in excluded
+        and not isinstance(value, EXCLUDED_TYPES)
+        and (wanted is None or name in wanted)
+    }
+
+
+def _readable(value: Any) -> Optional[str]:
+    if isinstance(value, Enum):
+        value = value.value
+    if value is None or isinstance(value, (bool, int)):
+        return orjson.dumps(value).decode()
+    if isinstance(value, str) and _SAFE_STRING.match(value) and value not in _JSON_LITERALS:
+        return value
+    return None
+
+
+def build_key(prefix: str, func: Callable, args: tuple, kwargs: dict, key_params: Optional[Iterable[str]] = None) -> str:
+    arguments = key_arguments(func, args, kwargs, key_params)
+    if not arguments:
+        return prefix
+
+    parts = {name: _readable(value) for name, value in arguments.items()}
+    if all(part is not None for part in parts.values()):
+        readable = ",".join(f"{name}={part}" for name, part in sorted(parts.items()))
+        if len(readable) <= MAX_READABLE_LENGTH:
+            return f"{prefix}:{readable}"
+
+    try:
+        payload = orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=_canonical)
+    except TypeError as e:
+        raise UncacheableArgument(str(e))
+    return f"{prefix}:h{hashlib.blake2b(payload, digest_size=16).hexdigest()}"
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    return json_default(value)
@@ -0,0 +1,140 @@
+"""
+Contadores de las cachés (Redis, SimpleCache, MemoryCache y L1) agrupados
+por backend y prefijo de clave: aciertos, fallos, escrituras, escrituras
+fallidas, latencia y tamaño de los valores.
+
+El prefijo se obtiene quitando de la clave la generación y los argumentos,
+de modo que pets:g3:all:limit=10 y pets:g4:all:limit=20 cuentan juntos
+como pets:all. El seguimiento de claves concretas (hot keys) es opcional
+porque guarda una entrada por clave.
+"""
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+CACHE_METRICS_ENABLED = os.getenv("CACHE_METRICS_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+CACHE_HOT_KEYS = os.getenv("CACHE_HOT_KEYS", "false").lower() in ("1", "true", "yes", "on")
+CACHE_HOT_KEYS_MAX = int(os.getenv("CACHE_HOT_KEYS_MAX", 10000))
+
+_GENERATION = re.compile(r"^g\d+$")
+_ARGUMENT = re.compile(r"=|^h[0-9a-f]{32}$|^\d+$")
+
+
+def prefix_of(key: str) -> str:
+    """'pets:g3:all:limit=10' -> 'pets:all', 'row:pet:7' -> 'row:pet'"""
+    parts = [part for part in key.split(":") if not _GENERATION.match(part)]
+    prefix = parts[:1]
+    if len(parts) > 1 and not _ARGUMENT.search(parts[1]):
+        prefix.append(parts[1])
+    return ":".join(prefix)
+
+
+@dataclass
+class PrefixStats:
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    set_failures: int = 0
+    errors: int = 0
+    bypassed: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        lookups = self.hits + self.misses
+        data["hit_ratio"] = round(self.hits / lookups, 4) if lookups else None
+        data["avg_ms"] = round(self.total_ms / self.calls, 3) if self.calls else None
+        data["total_ms"] = round(self.total_ms, 3)
+        data["max_ms"] = round(self.max_ms, 3)
+        return data
+
+
+class CacheMetrics:
+
+    def __init__(self, enabled: bool = CACHE_METRICS_ENABLED, track_hot_keys: bool = CACHE_HOT_KEYS):
+        self.enabled = enabled
+        self.track_hot_keys = track_hot_keys
+        self.started_at = time.time()
+        self._stats: Dict[str, Dict[str, PrefixStats]] = defaultdict(lambda: defaultdict(PrefixStats))
+        self._hot_keys: Counter = Counter()
+
+    def record(
+        self,
+        backend: str,
+        key: str,
+        hit: Optional[bool] = None,
+        elapsed: Optional[float] = None,
+        size: int = 0,
+        written: Optional[bool] = None,
+        error: bool = False,
+        bypassed: bool = False,
+    ) -> None:
+        """hit para lecturas, written para escrituras; elapsed en segundos"""
+        if not self.enabled:
+            return
+        stats = self._stats[backend][prefix_of(key)]
+        if hit is not None:
+            if hit:
+                stats.hits += 1
+                stats.bytes_read += size
+            else:
+                stats.misses += 1
+            if self.track_hot_keys:
+                self._count_key(f"{backend}:{key}")
+        if written is not None:
+            if written:
+                stats.sets += 1
+                stats.bytes_written += size
+            else:
+                stats.set_failures += 1
+        if error:
+            stats.errors += 1
+        if bypassed:
+            # Redis no disponible (sin conexión o circuito abierto)
+            stats.bypassed += 1
+        if elapsed is not None:
+            elapsed_ms = elapsed * 1000
+            stats.calls += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+
+    def lookups(self, prefix: str) -> int:
+        """Consultas (aciertos + fallos) de un prefijo sumando todos los backends"""
+        return sum(
+            prefixes[prefix].hits + prefixes[prefix].misses
+            for prefixes in self._stats.values() if prefix in prefixes
+        )
+
+    def _count_key(self, key: str) -> None:
+        self._hot_keys[key] += 1
+        if len(self._hot_keys) > CACHE_HOT_KEYS_MAX:
+            # Se conservan las más consultadas; las frías se descartan
+            self._hot_keys = Counter(dict(self._hot_keys.most_common(CACHE_HOT_KEYS_MAX // 2)))
+
+    def hot_keys(self, limit: int = 20) -> List[Dict[str, Any]]:
+        return [{"key": key, "lookups": count} for key, count in self._hot_keys.most_common(limit)]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "since": self.started_at,
+            "backends": {
+                backend: {prefix: stats.as_dict() for prefix, stats in sorted(prefixes.items())}
+                for backend, prefixes in self._stats.items()
+            },
+        }
+
+    def reset(self) -> None:
+        self._stats.clear()
+        self._hot_keys.clear()
+        self.started_at = time.time()
+
+
+cache_metrics = CacheMetrics()
@@ -0,0 +1,46 @@
+"""
+Serialización de los valores guardados en caché.
+
+Con schema, el resultado del controlador (objetos ORM o dicts) se valida
+contra el schema de respuesta y se codifica con el serializador de pydantic;
+en un acierto se devuelven instancias del schema, listas para que FastAPI
+las envíe sin volver a tocar el ORM. Sin schema se usa orjson.
+"""
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, List, Optional, Type, Union
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Type[BaseModel], many: bool) -> TypeAdapter:
+    return TypeAdapter(List[schema] if many else schema)
+
+
+def json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not cacheable: {type(value).__name__}")
+
+
+def validate(value: Any, schema: Type[BaseModel]) -> Any:
+    """Objeto ORM, dict o lista de ellos -> instancia(s) del schema"""
+    return _adapter(schema, isinstance(value, (list, tuple))).validate_python(value, from_attributes=True)
+
+
+def dumps(value: Any, schema: Optional[Type[BaseModel]] = None) -> bytes:
+    if schema is None:
+        return orjson.dumps(value, default=json_default)
+    adapter = _adapter(schema, isinstance(value, (list, tuple)))
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+
+def loads(raw: Union[str, bytes], schema: Optional[Type[BaseModel]] = None) -> Any:
+    if schema is None:
+        return orjson.loads(raw)
+    many = raw.lstrip()[:1] in ("[", b"[")
+    return _adapter(schema, many).validate_json(raw)
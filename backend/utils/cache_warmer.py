@@ -0,0 +1,106 @@
+"""
+Precarga (refresh-ahead) de las claves más consultadas.
+
+Al arrancar se cargan las claves configuradas en CACHE_WARM_KEYS. Después
+cada una se recalcula cuando ha consumido CACHE_WARM_REFRESH_AT de su TTL,
+siempre que haya tenido al menos CACHE_WARM_MIN_LOOKUPS consultas desde la
+recarga anterior (según cache_metrics); las claves frías se dejan caducar.
+Un cerrojo en Redis evita que varios workers recarguen la misma clave.
+"""
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from backend.db.database import get_read_sessionmaker, session_scope
+from backend.logger.logger import logger
+from backend.utils.cache import cache_service
+from backend.utils.cache_metrics import cache_metrics
+
+CACHE_WARM_KEYS = [key.strip() for key in os.getenv("CACHE_WARM_KEYS", "services:all,users:all,pets:all").split(",") if key.strip()]
+CACHE_WARM_REFRESH_AT = float(os.getenv("CACHE_WARM_REFRESH_AT", 0.8))
+CACHE_WARM_MIN_LOOKUPS = int(os.getenv("CACHE_WARM_MIN_LOOKUPS", 1))
+
+
+@dataclass
+class WarmTarget:
+    loader: Callable
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    next_run: float = 0.0
+    seen_lookups: int = 0
+    refreshes: int = 0
+
+    @property
+    def prefix(self) -> str:
+        return self.loader.cache_prefix
+
+    @property
+    def interval(self) -> float:
+        return self.loader.cache_ttl * CACHE_WARM_REFRESH_AT
+
+
+class CacheWarmer:
+
+    def __init__(self, keys=CACHE_WARM_KEYS):
+        self.keys = set(keys)
+        self.targets: Dict[str, WarmTarget] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, loader: Callable, **kwargs) -> None:
+        """loader: controlador con @cache_response; kwargs: argumentos de la clave a precargar"""
+        if loader.cache_prefix in self.keys:
+            self.targets[loader.cache_prefix] = WarmTarget(loader, kwargs)
+
+    def is_popular(self, target: WarmTarget) -> bool:
+        lookups = cache_metrics.lookups(target.prefix)
+        recent = lookups - target.seen_lookups
+        target.seen_lookups = lookups
+        # Sin métricas no hay forma de saberlo: se recarga siempre
+        return not cache_metrics.enabled or recent >= CACHE_WARM_MIN_LOOKUPS
+
+    async def warm(self, target: WarmTarget, force: bool = False) -> bool:
+        if not force and not self.is_popular(target):
+            logger.debug(f"Precarga omitida para {target.prefix}: sin consultas recientes")
+            return False
+        if not await cache_service.acquire_lock(f"warm:{target.prefix}", max(1, int(target.interval / 2))):
+            return False
+        try:
+            async with session_scope(await get_read_sessionmaker()) as db:
+                await target.loader.refresh(db, **target.kwargs)
+        except Exception as e:
+            logger.warning(f"Error precargando {target.prefix}: {e}")
+            return False
+        target.refreshes += 1
+        logger.info(f"Caché precargada: {target.prefix}")
+        return True
+
+    async def run_due(self, force: bool = False) -> float:
+        """Recarga los objetivos vencidos; devuelve los segundos hasta el siguiente"""
+        now = time.monotonic()
+        for target in self.targets.values():
+            if force or target.next_run <= now:
+                await self.warm(target, force=force)
+                target.next_run = now + target.interval
+        if not self.targets:
+            return CACHE_WARM_REFRESH_AT * 60
+        return max(0.0, min(target.next_run for target in self.targets.values()) - time.monotonic())
+
+    async def _run(self) -> None:
+        delay = await self.run_due(force=True)
+        while True:
+            await asyncio.sleep(delay)
+            delay = await self.run_due()
+
+    def start(self) -> Optional[asyncio.Task]:
+        if self.targets and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+cache_warmer = CacheWarmer()
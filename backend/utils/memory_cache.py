@@ -1,84 +1,213 @@
-from functools import lru_cache, wraps
-from typing import Any, Callable, Optional
+import asyncio
+import os
 import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
 from backend.logger.logger import logger
+from backend.utils.cache_keys import UncacheableArgument, build_key
+from backend.utils.cache_metrics import cache_metrics
+from backend.utils.cache_serializer import dumps
+
+CACHE_MEMORY_MAX_ENTRIES = int(os.getenv("CACHE_MEMORY_MAX_ENTRIES", 1000))
+CACHE_MEMORY_MAX_BYTES = int(os.getenv("CACHE_MEMORY_MAX_BYTES", 64 * 1024 * 1024))
+CACHE_MEMORY_SWEEP_INTERVAL = int(os.getenv("CACHE_MEMORY_SWEEP_INTERVAL", 60))
+
+
+def serialized_size(value: Any) -> Optional[int]:
+    """Bytes del valor serializado (una sola vez, al guardarlo); None si no se puede"""
+    try:
+        return len(dumps(value))
+    except TypeError:
+        return None
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    size: int
+
 
 class MemoryCache:
-   
-    
-    def __init__(self):
-        self._cache = {}
-        self._timestamps = {}
-    
+    """
+    Caché en memoria del proceso con expulsión LRU, TTL por entrada y límite
+    de entradas y de bytes. Las entradas caducadas se retiran al leerlas y
+    en un barrido periódico (start_sweeper).
+
+    El tamaño no se mide aquí: llega en set(size=), del valor ya serializado
+    (L1) o de una serialización al guardar (memory_cache_response y
+    lru_cache_response). max_bytes solo cuenta esas entradas; las que no se
+    pueden serializar quedan limitadas únicamente por max_entries.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MEMORY_MAX_ENTRIES,
+        max_bytes: int = CACHE_MEMORY_MAX_BYTES,
+        default_ttl: int = 300,
+        name: str = "memory",
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._cache: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._sweeper: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
     def get(self, key: str) -> Optional[Any]:
-    
+        entry = self._cache.get(key)
+        if entry is None:
+            self.misses += 1
+            cache_metrics.record(self.name, key, hit=False)
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            cache_metrics.record(self.name, key, hit=False)
+            return None
+        self._cache.move_to_end(key)
+        self.hits += 1
+        cache_metrics.record(self.name, key, hit=True, size=entry.size)
+        logger.debug(f"Memory cache hit para: {key}")
+        return entry.value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, size: Optional[int] = None) -> None:
+        """Establecer valor en caché; size es lo que ocupa serializado, si se conoce"""
+        ttl = ttl or self.default_ttl
+        size = size or 0
+        if size > self.max_bytes:
+            cache_metrics.record(self.name, key, written=False)
+            logger.debug(f"Memory cache: {key} ({size} bytes) supera el límite, no se guarda")
+            return
+
         if key in self._cache:
-          
-            if time.time() - self._timestamps[key] < 300:  # 5 minutos TTL
-                logger.debug(f"Memory cache hit para: {key}")
-                return self._cache[key]
-            else:
-               
-                del self._cache[key]
-                del self._timestamps[key]
-        return None
-    
-    def set(self, key: str, value: Any, ttl: int = 300) -> None:
-        """Establecer valor en caché"""
-        self._cache[key] = value
-        self._timestamps[key] = time.time()
+            self._remove(key)
+        self._cache[key] = _Entry(value, time.monotonic() + ttl, size)
+        self._bytes += size
+        cache_metrics.record(self.name, key, written=True, size=size)
+        while len(self._cache) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._cache))
+            self._remove(oldest)
+            self.evictions += 1
         logger.debug(f"Memory cache set para: {key}, TTL: {ttl}s")
-    
+
     def delete(self, key: str) -> None:
         """Eliminar valor del caché"""
         if key in self._cache:
-            del self._cache[key]
-            del self._timestamps[key]
+            self._remove(key)
             logger.debug(f"Memory cache eliminado para: {key}")
-    
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Elimina la clave prefix y todas las que empiezan por 'prefix:'"""
+        keys = [k for k in self._cache if k == prefix or k.startswith(f"{prefix}:")]
+        for key in keys:
+            self._remove(key)
+        logger.debug(f"Memory cache: {len(keys)} claves eliminadas para prefijo {prefix}")
+        return len(keys)
+
     def clear(self) -> None:
         """Limpiar todo el caché"""
         self._cache.clear()
-        self._timestamps.clear()
+        self._bytes = 0
         logger.info("Memory cache limpiado")
 
+    def sweep(self) -> int:
+        """Retira las entradas caducadas"""
+        now = time.monotonic()
+        expired = [k for k, entry in self._cache.items() if entry.expires_at <= now]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def start_sweeper(self, interval: int = CACHE_MEMORY_SWEEP_INTERVAL) -> asyncio.Task:
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_loop(interval))
+        return self._sweeper
+
+    def stop_sweeper(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+
+    async def _sweep_loop(self, interval: int) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            removed = self.sweep()
+            if removed:
+                logger.debug(f"Memory cache: {removed} entradas caducadas retiradas")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._cache),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "name": self.name,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._cache.pop(key)
+        self._bytes -= entry.size
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
 
 memory_cache = MemoryCache()
 
 def memory_cache_response(prefix: str, ttl: int = 300):
-   
+
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, **kwargs):
-           
-            cache_key = f"{prefix}:{hash(str(kwargs))}"
-            
-     
+
+            try:
+                cache_key = build_key(prefix, func, args, kwargs)
+            except UncacheableArgument:
+                return await func(*args, **kwargs)
+
+
             cached_result = memory_cache.get(cache_key)
             if cached_result is not None:
                 return cached_result
-            
-       
+
+
             logger.debug(f"Memory cache miss para: {cache_key}")
             result = await func(*args, **kwargs)
-            
-            
-            memory_cache.set(cache_key, result, ttl)
-            
+
+
+            memory_cache.set(cache_key, result, ttl, size=serialized_size(result))
+
             return result
         return wrapper
     return decorator
 
 def invalidate_memory_cache(prefix: str):
-   
+
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, **kwargs):
-        
+
             result = await func(*args, **kwargs)
-            
-         
-            memory_cache.clear()
+
+
+            memory_cache.delete_prefix(prefix)
             logger.debug(f"Memory cache invalidado para prefijo: {prefix}")
             return result
         return wrapper
@@ -86,16 +215,29 @@ def invalidate_memory_cache(prefix: str):
 
 
 def lru_cache_response(maxsize: int = 128, ttl: int = 300):
-  
+    """
+    Caché LRU propia de la función. functools.lru_cache no sirve para
+    funciones async: guardaría la corrutina, que solo se puede esperar una vez.
+    """
     def decorator(func: Callable) -> Callable:
-    
-        cached_func = lru_cache(maxsize=maxsize)(func)
-        
+        prefix = f"{func.__module__}.{func.__qualname__}"
+        cache = MemoryCache(max_entries=maxsize, default_ttl=ttl, name="lru")
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
-           
-            cache_key = (args, tuple(sorted(kwargs.items())))
-            return await cached_func(*cache_key)
-        
+            try:
+                cache_key = build_key(prefix, func, args, kwargs)
+            except UncacheableArgument:
+                return await func(*args, **kwargs)
+
+            cached_result = cache.get(cache_key)
+            if cached_result is not None:
+                return cached_result
+
+            result = await func(*args, **kwargs)
+            cache.set(cache_key, result, ttl, size=serialized_size(result))
+            return result
+
+        wrapper.cache = cache
         return wrapper
-    return decorator 
\ No newline at end of file
+    return decorator
@@ -1,24 +1,172 @@
-from sqlalchemy import Select
+import base64
+import binascii
+import json
+import os
+from typing import Any, Literal, Optional, Sequence
+
+from fastapi import Query, Request, Response
+from sqlalchemy import Select, func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Any
+
+from backend.exceptions.custom_exceptions import BadRequestException
+from backend.logger.logger import logger
+
+# Con count="estimate" se usa la estimación del planner y solo se cuenta de
+# verdad cuando la estimación queda por debajo de este umbral
+PAGINATION_EXACT_COUNT_THRESHOLD = int(os.getenv("PAGINATION_EXACT_COUNT_THRESHOLD", 10000))
+
+CountMode = Literal["exact", "estimate", "none"]
+
+PAGINATION_DEFAULT_LIMIT = int(os.getenv("PAGINATION_DEFAULT_LIMIT", 100))
+PAGINATION_MAX_LIMIT = int(os.getenv("PAGINATION_MAX_LIMIT", 500))
+
+
+async def count_rows(query: Select, db: AsyncSession) -> int:
+    """COUNT(*) sobre la consulta filtrada, sin hidratar filas"""
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    return (await db.execute(count_query)).scalar_one()
+
+
+async def estimate_rows(query: Select, db: AsyncSession) -> Optional[int]:
+    """Filas estimadas por el planner de Postgres; None si no hay estimación"""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+    try:
+        sql = query.order_by(None).compile(bind, compile_kwargs={"literal_binds": True})
+        result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.warning(f"Could not estimate row count, falling back to COUNT(*): {e}")
+        return None
+
 
 async def paginate(
     query: Select,
     db: AsyncSession,
     page: int = 1,
-    limit: int = 10
+    limit: int = 10,
+    count: CountMode = "exact"
 ) -> dict[str, Any]:
     offset = (page - 1) * limit
+    total = None
+    estimated = False
 
-    total_result = await db.execute(query)
-    total_items = len(total_result.scalars().all())
-
-    paginated_result = await db.execute(query.offset(offset).limit(limit))
-    items = paginated_result.scalars().all()
+    if count == "exact":
+        # El total viaja en la misma ida y vuelta como función de ventana
+        windowed = query.add_columns(func.count().over().label("_total")).offset(offset).limit(limit)
+        rows = (await db.execute(windowed)).all()
+        items = [row[0] for row in rows]
+        if rows:
+            total = rows[0]._total
+        elif page > 1:
+            # Página fuera de rango: no hay filas de las que leer el total
+            total = await count_rows(query, db)
+        else:
+            total = 0
+    else:
+        result = await db.execute(query.offset(offset).limit(limit))
+        items = result.scalars().all()
+        if count == "estimate":
+            total = await estimate_rows(query, db)
+            estimated = total is not None and total >= PAGINATION_EXACT_COUNT_THRESHOLD
+            if not estimated:
+                total = await count_rows(query, db)
 
     return {
-        "total": total_items,
+        "total": total,
+        "total_is_estimate": estimated,
         "page": page,
         "limit": limit,
         "items": items
-    }
\ No newline at end of file
+    }
+
+
+def encode_cursor(value: Any) -> str:
+    raw = json.dumps({"after": value}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _valid_cursor_value(value: Any) -> bool:
+    # bool es subclase de int pero no es una clave válida
+    return isinstance(value, (int, str)) and not isinstance(value, bool)
+
+
+def decode_cursor(cursor: str) -> Any:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value = json.loads(raw)["after"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise BadRequestException("Invalid pagination cursor")
+    if not _valid_cursor_value(value):
+        raise BadRequestException("Invalid pagination cursor")
+    return value
+
+
+def _check_cursor(column, after: Any) -> None:
+    """El valor del cursor tiene que ser del tipo de la columna; si no, la BD falla con un 500"""
+    try:
+        expected = column.type.python_type
+    except (AttributeError, NotImplementedError):
+        expected = None
+    if not _valid_cursor_value(after) or (expected in (int, str) and not isinstance(after, expected)):
+        raise BadRequestException("Invalid pagination cursor")
+
+
+def keyset(query: Select, column, limit: Optional[int] = None, after: Any = None) -> Select:
+    """Ordena por una columna única y devuelve las filas posteriores al cursor"""
+    query = query.order_by(column)
+    if after is not None:
+        _check_cursor(column, after)
+        query = query.where(column > after)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def first_page_params() -> dict:
+    """Argumentos con los que las rutas piden la primera página por defecto (ver CursorParams)"""
+    return {"limit": PAGINATION_DEFAULT_LIMIT + 1, "after": None}
+
+
+class CursorParams:
+    """
+    Dependencia para la paginación por cursor (?limit=&after=) de los listados.
+    El cuerpo sigue siendo la lista; el cursor de la página siguiente se
+    devuelve en las cabeceras X-Next-Cursor y Link. Sin limit se aplica
+    PAGINATION_DEFAULT_LIMIT y nunca más de PAGINATION_MAX_LIMIT, de modo que
+    el tamaño de la respuesta no crece con la tabla.
+    """
+
+    def __init__(
+        self,
+        request: Request,
+        response: Response,
+        limit: int = Query(PAGINATION_DEFAULT_LIMIT, ge=1, le=PAGINATION_MAX_LIMIT, description="Tamaño de página"),
+        after: Optional[str] = Query(None, description="Cursor opaco devuelto en X-Next-Cursor"),
+    ):
+        self.request = request
+        self.response = response
+        self.limit = limit
+        self.after = decode_cursor(after) if after else None
+
+    @property
+    def fetch_limit(self) -> int:
+        # Una fila de más indica si existe página siguiente
+        return self.limit + 1
+
+    def page(self, items: Sequence[Any], key: str) -> list:
+        items = list(items)
+        if len(items) <= self.limit:
+            return items
+
+        items = items[:self.limit]
+        last = items[-1]
+        cursor = encode_cursor(last[key] if isinstance(last, dict) else getattr(last, key))
+        next_url = self.request.url.include_query_params(after=cursor, limit=self.limit)
+        self.response.headers["X-Next-Cursor"] = cursor
+        self.response.headers["Link"] = f'<{next_url}>; rel="next"'
+        return items
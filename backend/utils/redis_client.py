@@ -0,0 +1,115 @@
+"""
+Conexión a Redis compartida por las cachés.
+
+El cliente usa un pool acotado con timeouts de conexión y de comando, de modo
+que un Redis lento no bloquea las peticiones más de REDIS_SOCKET_TIMEOUT.
+Tras REDIS_FAILURE_THRESHOLD fallos seguidos el CircuitBreaker se abre: las
+cachés dejan de llamar a Redis y una tarea de fondo comprueba con PING,
+con espera exponencial, cuándo vuelve a estar disponible.
+"""
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Optional
+
+import redis.asyncio as redis
+
+from backend.logger.logger import logger
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 0.5))
+REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", 0.5))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))
+REDIS_FAILURE_THRESHOLD = int(os.getenv("REDIS_FAILURE_THRESHOLD", 3))
+REDIS_RETRY_BACKOFF = float(os.getenv("REDIS_RETRY_BACKOFF", 1))
+REDIS_RETRY_BACKOFF_MAX = float(os.getenv("REDIS_RETRY_BACKOFF_MAX", 30))
+
+# Errores que indican que Redis no está disponible; el resto (p.ej. de
+# serialización) no abren el circuito
+CONNECTION_ERRORS = (redis.ConnectionError, redis.TimeoutError, ConnectionError, TimeoutError, OSError)
+
+
+def create_redis(decode_responses: bool = True) -> redis.Redis:
+    """Cliente con pool propio; no conecta hasta el primer comando"""
+    return redis.from_url(
+        REDIS_URL,
+        encoding="utf-8",
+        decode_responses=decode_responses,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+        health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+    )
+
+
+class CircuitBreaker:
+
+    def __init__(
+        self,
+        name: str,
+        probe: Callable[[], Awaitable],
+        failure_threshold: int = REDIS_FAILURE_THRESHOLD,
+        backoff: float = REDIS_RETRY_BACKOFF,
+        max_backoff: float = REDIS_RETRY_BACKOFF_MAX,
+    ):
+        self.name = name
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        return not self.is_open
+
+    def record_success(self) -> None:
+        self.failures = 0
+
+    def record_failure(self, error: Exception) -> None:
+        if not isinstance(error, CONNECTION_ERRORS):
+            return
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.trip(error)
+
+    def trip(self, error: Exception) -> None:
+        """Abre el circuito y lanza la reconexión en segundo plano"""
+        if self.is_open:
+            return
+        self.opened_at = time.monotonic()
+        logger.warning(f"Circuito {self.name} abierto, se omite Redis hasta que responda: {error}")
+        try:
+            self._probe_task = asyncio.get_running_loop().create_task(self._reconnect())
+        except RuntimeError:
+            # Sin bucle en marcha no hay quien reintente: se deja cerrado
+            self.opened_at = None
+
+    async def _reconnect(self) -> None:
+        delay = self.backoff
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self.probe()
+            except Exception as e:
+                logger.debug(f"Circuito {self.name}: Redis sigue sin responder ({e})")
+                delay = min(delay * 2, self.max_backoff)
+                continue
+            logger.info(f"Circuito {self.name} cerrado tras {time.monotonic() - self.opened_at:.1f}s")
+            self.opened_at = None
+            self.failures = 0
+            self._probe_task = None
+            return
+
+    def close(self) -> None:
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+        self.opened_at = None
+        self.failures = 0
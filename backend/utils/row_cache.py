@@ -0,0 +1,96 @@
+"""
+Caché por fila: una clave row:<entidad>:<pk> por registro, guardada como su
+schema de respuesta.
+
+Los listados leen de la base de datos (o de una lista de ids cacheada) solo
+los ids y después cargan las filas con un único MGET; las que faltan se
+piden en una sola consulta IN y se guardan con un pipeline. Una escritura
+refresca únicamente la fila afectada; las listas de ids solo se invalidan
+cuando cambia qué filas pertenecen a ellas (altas, bajas, cambio de dueño).
+
+Sin Redis disponible se vuelve a la consulta directa de siempre.
+"""
+import os
+from typing import Any, List, Optional, Sequence, Type
+
+from pydantic import BaseModel
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.statements import get_by_pk, primary_key_name, projection
+from backend.logger.logger import logger
+from backend.utils.cache import cache_service
+from backend.utils.cache_serializer import validate
+
+ROW_CACHE_TTL = int(os.getenv("ROW_CACHE_TTL", 900))
+
+
+class RowCache:
+
+    def __init__(self, model, schema: Type[BaseModel], ttl: int = ROW_CACHE_TTL):
+        self.model = model
+        self.schema = schema
+        self.ttl = ttl
+        self.name = model.__name__.lower()
+        self.pk = primary_key_name(model)
+        self.ids_namespace = f"{self.name}_ids"
+
+    def key(self, pk: Any) -> str:
+        return f"row:{self.name}:{pk}"
+
+    async def get(self, db: AsyncSession, pk: Any) -> Optional[Any]:
+        if not cache_service.available:
+            return await get_by_pk(db, self.model, pk)
+        rows = await self.get_many(db, [pk])
+        return rows[0] if rows else None
+
+    async def get_many(self, db: AsyncSession, ids: Sequence[Any]) -> List[Any]:
+        """Filas en el orden de ids; las que ya no existen se omiten"""
+        if not ids:
+            return []
+        cached = await cache_service.get_many([self.key(pk) for pk in ids], self.schema)
+        missing = [pk for pk, row in zip(ids, cached) if row is None]
+        if missing:
+            loaded = {getattr(row, self.pk): row for row in await self._load(db, missing)}
+            await cache_service.set_many({self.key(pk): row for pk, row in loaded.items()}, self.ttl, self.schema)
+            cached = [row if row is not None else loaded.get(pk) for pk, row in zip(ids, cached)]
+            logger.debug(f"Row cache {self.name}: {len(ids) - len(missing)} hits, {len(missing)} misses")
+        return [row for row in cached if row is not None]
+
+    async def list(self, db: AsyncSession, ids_query: Select, name: str, **params) -> List[Any]:
+        """
+        Listado a partir de una consulta que selecciona solo la clave primaria.
+        La lista de ids se cachea en su propio espacio de nombres.
+        """
+        if not cache_service.available:
+            result = await db.execute(ids_query.with_only_columns(projection(self.model, self.schema)))
+            return result.scalars().all()
+
+        key = await cache_service.versioned_key(f"{self.ids_namespace}:{name}", **params)
+        ids = await cache_service.get(key)
+        if ids is None:
+            ids = (await db.execute(ids_query)).scalars().all()
+            await cache_service.set(key, ids, self.ttl)
+        return await self.get_many(db, ids)
+
+    async def store(self, *objs: Any) -> None:
+        """Refresca las filas tras una escritura"""
+        if not objs or not cache_service.available:
+            return
+        try:
+            rows = {self.key(getattr(obj, self.pk)): obj for obj in objs}
+        except Exception as e:
+            logger.warning(f"Row cache {self.name}: no se pudo refrescar: {e}")
+            return
+        await cache_service.set_many(rows, self.ttl, self.schema)
+
+    async def forget(self, pk: Any) -> None:
+        await cache_service.delete(self.key(pk))
+
+    async def invalidate_lists(self) -> None:
+        await cache_service.bump_generation(self.ids_namespace)
+
+    async def _load(self, db: AsyncSession, ids: Sequence[Any]) -> List[BaseModel]:
+        pk = getattr(self.model, self.pk)
+        result = await db.execute(select(projection(self.model, self.schema)).where(pk.in_(ids)))
+        return validate(result.scalars().all(), self.schema)
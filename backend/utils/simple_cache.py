@@ -3,11 +3,16 @@ Caché simplificado para FastAPI
 """
 import json
 import asyncio
+import time
 from typing import Any, Optional, Callable
-import redis.asyncio as redis
 from functools import wraps
 from datetime import datetime
 from backend.logger.logger import logger
+from backend.utils.cache import INVALIDATION_MARK_TTL, SCAN_BATCH_SIZE, generation_key, invalidated_at_key, namespace_of
+from backend.utils.cache_keys import UncacheableArgument, build_key
+from backend.utils.cache_metrics import cache_metrics
+from backend.utils.redis_client import CircuitBreaker, create_redis
+from backend.utils.single_flight import call_with_own_session, flights
 
 class SimpleCache:
  
@@ -15,36 +20,45 @@ class SimpleCache:
     def __init__(self):
         self.redis_client = None
         self.default_ttl = 300
+        self.breaker = CircuitBreaker("simple_cache", self._ping)
+
+    async def _ping(self):
+        await self.redis_client.ping()
     
     async def get_redis(self):
-    
+        """Cliente de Redis, o None mientras el circuito está abierto"""
         if self.redis_client is None:
+            self.redis_client = create_redis()
             try:
-                self.redis_client = redis.from_url(
-                    "redis://localhost:6379",
-                    decode_responses=True
-                )
                 await self.redis_client.ping()
                 logger.info(" Redis conectado")
             except Exception as e:
                 logger.warning(f" No se pudo conectar a Redis: {e}")
-                return None
+                self.breaker.trip(e)
+        if not self.breaker.allow():
+            return None
         return self.redis_client
     
     async def get(self, key: str) -> Optional[Any]:
        
         client = await self.get_redis()
         if not client:
+            cache_metrics.record("simple", key, bypassed=True)
             return None
         
+        started = time.perf_counter()
         try:
             value = await client.get(key)
+            self.breaker.record_success()
+            cache_metrics.record("simple", key, hit=bool(value), elapsed=time.perf_counter() - started, size=len(value or ""))
             if value:
                 logger.debug(f"Cache HIT: {key}")
                 return json.loads(value)
             logger.debug(f"Cache MISS: {key}")
             return None
         except Exception as e:
+            self.breaker.record_failure(e)
+            cache_metrics.record("simple", key, error=True, elapsed=time.perf_counter() - started)
             logger.error(f"Error obteniendo caché {key}: {e}")
             return None
     
@@ -52,8 +66,10 @@ class SimpleCache:
         """Establecer valor en caché"""
         client = await self.get_redis()
         if not client:
+            cache_metrics.record("simple", key, bypassed=True)
             return False
         
+        started = time.perf_counter()
         try:
             ttl = ttl or self.default_ttl
         
@@ -87,10 +103,14 @@ class SimpleCache:
             else:
                 serializable_value = value
             
-            await client.setex(key, ttl, json.dumps(serializable_value))
+            payload = json.dumps(serializable_value, default=str)
+            await client.setex(key, ttl, payload)
+            cache_metrics.record("simple", key, written=True, elapsed=time.perf_counter() - started, size=len(payload))
             logger.debug(f"💾 Cache SET: {key} (TTL: {ttl}s)")
             return True
         except Exception as e:
+            self.breaker.record_failure(e)
+            cache_metrics.record("simple", key, written=False, elapsed=time.perf_counter() - started)
             logger.error(f"Error estableciendo caché {key}: {e}")
             return False
     
@@ -101,15 +121,59 @@ class SimpleCache:
             return False
         
         try:
-            keys = await client.keys(pattern)
-            if keys:
-                await client.delete(*keys)
-                logger.debug(f"🗑️ Cache DELETE: {len(keys)} claves con patrón {pattern}")
+            deleted = 0
+            batch = []
+            async for key in client.scan_iter(match=pattern, count=SCAN_BATCH_SIZE):
+                batch.append(key)
+                if len(batch) >= SCAN_BATCH_SIZE:
+                    deleted += await client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += await client.unlink(*batch)
+            if deleted:
+                logger.debug(f"🗑️ Cache DELETE: {deleted} claves con patrón {pattern}")
             return True
         except Exception as e:
+            self.breaker.record_failure(e)
             logger.error(f"Error eliminando caché {pattern}: {e}")
             return False
 
+    async def get_generation(self, namespace: str) -> int:
+        client = await self.get_redis()
+        if not client:
+            return 0
+        try:
+            return int(await client.get(generation_key(namespace)) or 0)
+        except Exception as e:
+            self.breaker.record_failure(e)
+            logger.error(f"Error leyendo generación de caché {namespace}: {e}")
+            return 0
+
+    async def invalidated_at(self, namespace: str) -> Optional[float]:
+        client = await self.get_redis()
+        if not client:
+            return None
+        try:
+            value = await client.get(invalidated_at_key(namespace_of(namespace)))
+            return float(value) if value else None
+        except Exception as e:
+            self.breaker.record_failure(e)
+            logger.error(f"Error leyendo invalidación de caché {namespace}: {e}")
+            return None
+
+    async def bump_generation(self, namespace: str) -> bool:
+        client = await self.get_redis()
+        if not client:
+            return False
+        try:
+            await client.incr(generation_key(namespace_of(namespace)))
+            await client.set(invalidated_at_key(namespace_of(namespace)), f"{time.time():.3f}", ex=INVALIDATION_MARK_TTL)
+            return True
+        except Exception as e:
+            self.breaker.record_failure(e)
+            logger.error(f"Error invalidando caché {namespace}: {e}")
+            return False
+
 cache = SimpleCache()
 
 def cache_response(prefix: str, ttl: int = 300):
@@ -118,7 +182,12 @@ def cache_response(prefix: str, ttl: int = 300):
         @wraps(func)
         async def wrapper(*args, **kwargs):
            
-            cache_key = f"{prefix}:{hash(str(args) + str(sorted(kwargs.items())))}"
+            try:
+                key = build_key(prefix, func, args, kwargs)
+            except UncacheableArgument as e:
+                logger.warning(f"Sin caché para {prefix}: {e}")
+                return await func(*args, **kwargs)
+            cache_key = await versioned(key)
             
            
             cached_result = await cache.get(cache_key)
@@ -126,13 +195,34 @@ def cache_response(prefix: str, ttl: int = 300):
                 return cached_result
             
             
-            result = await func(*args, **kwargs)
+            invalidated_at = await cache.invalidated_at(key)
+            # La carga compartida sobrevive a la petición que la lanzó (shield): usa su propia sesión
+            return await flights.do(
+                cache_key, lambda: load(cache_key, lambda: call_with_own_session(func, args, kwargs, invalidated_at))
+            )
+
+        async def load(cache_key: str, call: Callable):
+            result = await call()
             await cache.set(cache_key, result, ttl)
-            
             return result
+
+        async def refresh(*args, **kwargs):
+            """Recalcula y guarda el valor sin consultar la caché (precarga)"""
+            cache_key = await versioned(build_key(prefix, func, args, kwargs))
+            return await flights.do(cache_key, lambda: load(cache_key, lambda: func(*args, **kwargs)))
+
+        wrapper.refresh = refresh
+        wrapper.cache_prefix = prefix
+        wrapper.cache_ttl = ttl
         return wrapper
     return decorator
 
+
+async def versioned(key: str) -> str:
+    namespace = namespace_of(key)
+    generation = await cache.get_generation(namespace)
+    return f"{namespace}:g{generation}{key[len(namespace):]}"
+
 def invalidate_cache(prefix: str):
     
     def decorator(func: Callable) -> Callable:
@@ -141,7 +231,7 @@ def invalidate_cache(prefix: str):
            
             result = await func(*args, **kwargs)
            
-            await cache.delete(f"{prefix}:*")
+            await cache.bump_generation(prefix)
             
             return result
         return wrapper
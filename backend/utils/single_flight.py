@@ -0,0 +1,79 @@
+"""
+Agrupa las cargas concurrentes de una misma clave de caché.
+
+Cuando una clave popular caduca, todas las peticiones que fallan a la vez
+esperan a una única carga en vuelo en lugar de lanzar cada una la misma
+consulta. El agrupamiento es por proceso: con N workers hay como mucho N
+cargas simultáneas por clave.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.logger.logger import logger
+from backend.utils.cache_keys import signature_of
+
+
+class SingleFlight:
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    def _start(self, key: str, load: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(load())
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._finished(key, f))
+        return future
+
+    def _finished(self, key: str, future: asyncio.Future) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning(f"Carga de caché fallida para {key}: {future.exception()}")
+
+    async def do(self, key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Ejecuta load() o espera a la carga ya en vuelo para la clave"""
+        # shield: si la petición que lanzó la carga se cancela, las demás siguen esperando
+        return await asyncio.shield(self._start(key, load))
+
+    def spawn(self, key: str, load: Callable[[], Awaitable[Any]]) -> None:
+        """Lanza load() en segundo plano salvo que ya haya una carga para la clave"""
+        self._start(key, load)
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._calls
+
+
+flights = SingleFlight()
+
+
+async def call_with_own_session(func: Callable, args: tuple, kwargs: dict, invalidated_at: Optional[float] = None) -> Any:
+    """
+    Repite la llamada sustituyendo las sesiones de la petición por una propia.
+    Una carga compartida o en segundo plano no puede usar la sesión de la
+    petición: se cierra al terminar la respuesta y no admite uso concurrente.
+
+    La sesión nueva va al mismo motor que la de la petición, así que respeta
+    su elección de réplica o primario (X-Read-Your-Writes). Si el espacio de
+    nombres se invalidó hace menos de DB_REPLICA_MAX_LAG se lee del primario:
+    la réplica podría no tener aún la escritura y ese valor quedaría cacheado
+    con la generación nueva durante todo el TTL.
+    """
+    from backend.db.database import DB_REPLICA_MAX_LAG, engine, read_engine, session_scope
+
+    bound = signature_of(func).bind_partial(*args, **kwargs)
+    sessions = [name for name, value in bound.arguments.items() if isinstance(value, AsyncSession)]
+    if not sessions:
+        return await func(*args, **kwargs)
+
+    bind = bound.arguments[sessions[0]].bind
+    if bind is read_engine and invalidated_at is not None and time.time() - invalidated_at < DB_REPLICA_MAX_LAG:
+        bind = engine
+    async with session_scope(lambda: AsyncSession(bind=bind, expire_on_commit=False)) as session:
+        for name in sessions:
+            bound.arguments[name] = session
+        return await func(*bound.args, **bound.kwargs)
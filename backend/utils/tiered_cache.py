@@ -0,0 +1,100 @@
+"""
+Caché en dos niveles: L1 en memoria del proceso (MemoryCache) delante de
+Redis (L2).
+
+Un acierto en L1 no sale del proceso. Cada invalidación sube la generación en
+Redis y se publica en INVALIDATION_CHANNEL; todos los workers escuchan el
+canal y descartan sus entradas L1 del espacio de nombres. L1 solo se usa
+mientras la suscripción está activa: sin ella un worker no se enteraría de
+las escrituras de los demás.
+"""
+import asyncio
+import os
+from typing import Any, Dict, Optional
+
+from backend.logger.logger import logger
+from backend.utils.cache import INVALIDATION_CHANNEL, namespace_of
+from backend.utils.memory_cache import MemoryCache
+
+CACHE_L1_MAX_ENTRIES = int(os.getenv("CACHE_L1_MAX_ENTRIES", 1024))
+CACHE_L1_MAX_BYTES = int(os.getenv("CACHE_L1_MAX_BYTES", 32 * 1024 * 1024))
+RECONNECT_DELAY = 5
+
+
+class LocalCache(MemoryCache):
+    """MemoryCache con invalidación por espacio de nombres que solo responde mientras está activa"""
+
+    def __init__(self, max_entries: int = CACHE_L1_MAX_ENTRIES, max_bytes: int = CACHE_L1_MAX_BYTES):
+        super().__init__(max_entries=max_entries, max_bytes=max_bytes, name="l1")
+        self.enabled = False
+        # Contador por espacio de nombres: evita guardar en L1 un valor leído
+        # de Redis antes de una invalidación que llegó mientras tanto
+        self._epochs: Dict[str, int] = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        return super().get(key)
+
+    def epoch(self, key: str) -> int:
+        return self._epochs.get(namespace_of(key), 0)
+
+    def set(self, key: str, value: Any, ttl: int, epoch: int, size: Optional[int] = None) -> None:
+        if not self.enabled or self.epoch(key) != epoch:
+            return
+        super().set(key, value, ttl, size)
+
+    def invalidate(self, namespace: str) -> None:
+        namespace = namespace_of(namespace)
+        self._epochs[namespace] = self._epochs.get(namespace, 0) + 1
+        self.delete_prefix(namespace)
+
+    def clear(self) -> None:
+        for namespace in {namespace_of(k) for k in self._cache}:
+            self._epochs[namespace] = self._epochs.get(namespace, 0) + 1
+        super().clear()
+
+
+local_cache = LocalCache()
+
+
+def handle_invalidation(message: dict) -> None:
+    if message.get("type") != "message":
+        return
+    namespace = message["data"]
+    if isinstance(namespace, bytes):
+        namespace = namespace.decode()
+    local_cache.invalidate(namespace)
+    logger.debug(f"L1 invalidado para: {namespace}")
+
+
+async def listen_for_invalidations(cache_service) -> None:
+    """Tarea de fondo: mantiene la suscripción y activa L1 mientras dura"""
+    while True:
+        pubsub = None
+        try:
+            if not cache_service.available:
+                # Circuito abierto: el breaker se encarga de reconectar
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+            pubsub = cache_service.redis.pubsub()
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            local_cache.enabled = True
+            logger.info(f"Caché L1 activa, escuchando {INVALIDATION_CHANNEL}")
+            async for message in pubsub.listen():
+                handle_invalidation(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Suscripción de invalidación perdida: {e}")
+            cache_service.breaker.record_failure(e)
+        finally:
+            # Sin suscripción se pueden perder invalidaciones: L1 fuera hasta reconectar
+            local_cache.enabled = False
+            local_cache.clear()
+            if pubsub is not None:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+        await asyncio.sleep(RECONNECT_DELAY)
@@ -0,0 +1,93 @@
+"""
+Microbenchmark: coste de CPU por búsqueda por clave primaria construyendo
+el SELECT en cada llamada (como hacían los controladores) frente a las
+sentencias pre-construidas de backend/db/statements.py.
+
+Uso:
+    python scripts/bench_statements.py [iteraciones]
+"""
+
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from backend.models import Base, Pet, User
+from backend.models.enums import PetTypeEnum
+from backend.db.statements import select_by, select_pk_by
+
+ROWS = 200
+
+
+def setup_engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        for i in range(1, ROWS + 1):
+            session.add(User(
+                user_id=i, first_name="Test", last_name="User", phone_number=600000000 + i,
+                email=f"user{i}@petland.test", address="Calle 1", updated_by="bench",
+                update_date=date.today(), hashed_password="x",
+            ))
+            session.add(Pet(
+                pet_id=i, name=f"Pet {i}", species=PetTypeEnum.CANINO, breed="Mestizo",
+                birth_date=date(2020, 1, 1), user_id=i,
+            ))
+        session.commit()
+    return engine
+
+
+def cpu_per_call(fn, iterations):
+    fn(1)
+    start = time.process_time()
+    for i in range(iterations):
+        fn(i % ROWS + 1)
+    return (time.process_time() - start) / iterations * 1_000_000
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    engine = setup_engine()
+    session = Session(engine)
+
+    pet_by_id = select_by(Pet, "pet_id")
+    user_exists = select_pk_by(User, "user_id")
+
+    cases = [
+        (
+            "statement build + cache key",
+            lambda i: select(Pet).where(Pet.pet_id == i)._generate_cache_key(),
+            lambda i: pet_by_id._generate_cache_key(),
+        ),
+        (
+            "get pet by id",
+            lambda i: session.execute(select(Pet).where(Pet.pet_id == i)).scalar_one_or_none(),
+            lambda i: session.execute(pet_by_id, {"value": i}).scalar_one_or_none(),
+        ),
+        (
+            "user existence check",
+            lambda i: session.execute(select(User).where(User.user_id == i)).scalar_one_or_none() is not None,
+            lambda i: session.execute(user_exists, {"value": i}).scalar_one_or_none() is not None,
+        ),
+    ]
+
+    print(f"{iterations} iteraciones, CPU por llamada (µs)")
+    print(f"{'caso':32} {'ad hoc':>10} {'pre-built':>10} {'ahorro':>10}")
+    for name, ad_hoc, prebuilt in cases:
+        session.expunge_all()
+        before = cpu_per_call(ad_hoc, iterations)
+        session.expunge_all()
+        after = cpu_per_call(prebuilt, iterations)
+        print(f"{name:32} {before:10.1f} {after:10.1f} {before - after:10.1f}")
+
+    session.close()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()